@@ -3,6 +3,9 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+HTTP is served by Django; WebSocket connections are routed here by path,
+since Django's own ASGI handler only speaks HTTP.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -13,4 +16,29 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up, since it pulls in models
+from reading.live_feedback import LIVE_FEEDBACK_PATH, live_feedback_app  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+
+if settings.CONTENT_NLP.get("WARM_ON_START"):
+    from content.nlp import warm_up  # noqa: E402
+
+    warm_up()
+
+websocket_routes = {
+    LIVE_FEEDBACK_PATH: live_feedback_app,
+}
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        app = websocket_routes.get(scope["path"])
+        if app is None:
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        await app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,90 @@
+# backend/conditional.py
+"""
+Conditional GET for DRF views.
+
+A view using ``ConditionalGetMixin`` implements ``get_validators`` with a
+cheap query (an ``updated_at``, a ``version``, a count) and returns
+``(key, last_modified)``. The mixin turns that into ``ETag`` and
+``Last-Modified`` headers and answers ``If-None-Match`` /
+``If-Modified-Since`` with a 304 after authentication and permission checks
+but before the view loads or serialises anything. The query must apply the
+same filters as the view's queryset, or an out-of-scope object could get a
+304 instead of a 404.
+"""
+
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+_SAFE_METHODS = ("GET", "HEAD")
+
+
+class _NotModified(Exception):
+    pass
+
+
+def make_etag(*parts):
+    """Weak ETag over ``parts`` (anything with a stable ``repr``)."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def latest(*values):
+    """Most recent of some possibly-None datetimes."""
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+class ConditionalGetMixin:
+    """
+    Add before the DRF view class: ``class V(ConditionalGetMixin, RetrieveAPIView)``.
+    """
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Return ``(key, last_modified)`` for the response about to be built,
+        or None to skip conditional handling (e.g. the object doesn't exist;
+        the view then answers as usual). ``key`` is any repr-able value that
+        changes whenever the response body would.
+        """
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._etag = self._last_modified = None
+        if request.method not in _SAFE_METHODS:
+            return
+
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return
+        key, last_modified = validators
+        # The browsable API and JSON renderings are different representations
+        self._etag = make_etag(key, request.accepted_media_type)
+        self._last_modified = last_modified
+
+        not_modified = get_conditional_response(
+            request,
+            etag=self._etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if not_modified is not None:
+            raise _NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "_etag", None)
+        if etag and response.status_code in (200, 304):
+            response["ETag"] = etag
+            if self._last_modified:
+                response["Last-Modified"] = http_date(self._last_modified.timestamp())
+            # Cacheable, but always revalidated
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -91,6 +91,77 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Reading: pronunciation scoring engine (see reading/scoring.py)
+READING_SCORING = {
+    "THRESHOLD": float(os.getenv("READING_SCORING_THRESHOLD", "0.6")),
+    "BAND": int(os.getenv("READING_SCORING_BAND", "32")),
+    "ENCODER": os.getenv("READING_SCORING_ENCODER", "soundex"),
+    "CODE_CACHE_SIZE": int(os.getenv("READING_SCORING_CODE_CACHE_SIZE", "50000")),
+    "PAIR_CACHE_SIZE": int(os.getenv("READING_SCORING_PAIR_CACHE_SIZE", "200000")),
+    "WARM_PAIRS": int(os.getenv("READING_SCORING_WARM_PAIRS", "0")),
+}
+
+# Reading: write-behind buffer for PronunciationAttempt rows
+READING_ATTEMPT_BATCH_SIZE = int(os.getenv("READING_ATTEMPT_BATCH_SIZE", "50"))
+READING_ATTEMPT_FLUSH_SECONDS = float(os.getenv("READING_ATTEMPT_FLUSH_SECONDS", "2.0"))
+READING_ATTEMPT_JOURNAL_DIR = Path(os.getenv("READING_ATTEMPT_JOURNAL_DIR", BASE_DIR / "var" / "attempt_journal"))
+
+# Reading: audio fluency analysis (AudioFeedbackAPIView)
+READING_AUDIO_WORKERS = int(os.getenv("READING_AUDIO_WORKERS", "2"))
+READING_AUDIO_MAX_QUEUED = int(os.getenv("READING_AUDIO_MAX_QUEUED", "4"))
+READING_AUDIO_TIMEOUT = float(os.getenv("READING_AUDIO_TIMEOUT", "60"))
+READING_AUDIO_MAX_UPLOAD_BYTES = int(os.getenv("READING_AUDIO_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+# Reading: server-side speech recognition for audio uploads ("" = off)
+READING_RECOGNIZER = {
+    "ENGINE": os.getenv("READING_RECOGNIZER_ENGINE", ""),
+    "OPTIONS": {"model_path": os.getenv("READING_VOSK_MODEL", "")},
+    "WORKERS": int(os.getenv("READING_RECOGNIZER_WORKERS", "1")),
+    "MAX_QUEUED": int(os.getenv("READING_RECOGNIZER_MAX_QUEUED", "8")),
+    "TIMEOUT": float(os.getenv("READING_RECOGNIZER_TIMEOUT", "30")),
+    "LOAD_TIMEOUT": float(os.getenv("READING_RECOGNIZER_LOAD_TIMEOUT", "120")),
+}
+
+# Content: grammar extraction rules (see content/grammar_rules.py).
+# Later files replace rules with the same id.
+CONTENT_GRAMMAR_RULES = [BASE_DIR / "data" / "grammar_rules.json"] + [
+    Path(p) for p in os.getenv("CONTENT_GRAMMAR_RULES", "").split(os.pathsep) if p
+]
+
+# Content: spaCy pipeline, loaded on first use (see content/nlp.py).
+# Only PIPES are loaded; set CONTENT_NLP_WARM=1 to load it as a web worker starts.
+CONTENT_NLP = {
+    "MODEL": os.getenv("CONTENT_NLP_MODEL", "en_core_web_sm"),
+    "PIPES": ["tok2vec", "tagger", "attribute_ruler", "parser"],
+    "WARM_ON_START": os.getenv("CONTENT_NLP_WARM", "") == "1",
+    # Parsed docs cached on disk, so each text is parsed once (see content/doc_cache.py)
+    "DOC_CACHE_DIR": Path(os.getenv("CONTENT_NLP_DOC_CACHE_DIR", BASE_DIR / "var" / "doc_cache")),
+}
+
+# Content: splitting lessons into chunks (see content/utils/chunk_helper.py)
+# UNIT is "sentences", "words" or "seconds" (estimated at WORDS_PER_SECOND).
+CONTENT_CHUNKING = {
+    "UNIT": os.getenv("CONTENT_CHUNK_UNIT", "sentences"),
+    "TARGET": float(os.getenv("CONTENT_CHUNK_TARGET", "15")),
+    "WORDS_PER_SECOND": float(os.getenv("CONTENT_CHUNK_WORDS_PER_SECOND", "2.5")),
+}
+
+# Content: text-to-speech for lesson chunks (see content/tts.py)
+CONTENT_TTS = {
+    "BACKEND": os.getenv("CONTENT_TTS_BACKEND", "gtts"),
+    "OPTIONS": {},
+    "WORKERS": int(os.getenv("CONTENT_TTS_WORKERS", "4")),
+}
+
+# Content: machine translation with a persistent translation memory (see content/translation_memory.py)
+CONTENT_TRANSLATION = {
+    "BACKEND": os.getenv("CONTENT_TRANSLATION_BACKEND", "google"),
+    "OPTIONS": {"url": os.getenv("CONTENT_TRANSLATION_URL", "")},
+    "BATCH_CHARS": int(os.getenv("CONTENT_TRANSLATION_BATCH_CHARS", "4500")),
+    "BATCH_SIZE": int(os.getenv("CONTENT_TRANSLATION_BATCH_SIZE", "50")),
+    "MAX_CONCURRENT": int(os.getenv("CONTENT_TRANSLATION_MAX_CONCURRENT", "2")),
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
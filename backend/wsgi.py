@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.CONTENT_NLP.get("WARM_ON_START"):
+    from content.nlp import warm_up  # noqa: E402
+
+    warm_up()
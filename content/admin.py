@@ -130,9 +130,9 @@ class SentenceAttemptAdmin(admin.ModelAdmin):
 
 @admin.register(GrammarPoint)
 class GrammarPointAdmin(admin.ModelAdmin):
-    list_display = ("title", "lesson")
+    list_display = ("title", "lesson", "source", "occurrences")
     search_fields = ("title", "explanation")
-    list_filter = ("lesson",)
+    list_filter = ("source", "lesson")
 
 
 @admin.register(GrammarAttempt)
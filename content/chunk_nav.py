@@ -0,0 +1,66 @@
+# content/chunk_nav.py
+"""
+Chunk-by-chunk navigation for the lesson player.
+
+A page needs the current chunk, its neighbours' positions and the lesson's
+chunk count. Instead of loading the lesson's chunks, ``chunk_page`` reads
+the requested chunk and the next one in a single ``(lesson, order)`` index
+range scan, the previous order with another, and takes the count from a
+cache keyed by ``Lesson.updated_at``. Every chunk write bumps that
+timestamp (``content.signals``), so a cached count is never stale.
+"""
+
+from functools import lru_cache
+
+from .models import LessonChunk
+
+
+@lru_cache(maxsize=1024)
+def chunk_count(lesson_id, updated_at):
+    return LessonChunk.objects.filter(lesson_id=lesson_id).count()
+
+
+def chunk_page(lesson, order):
+    """
+    The chunk of ``lesson`` at ``order`` (or the nearest one after it; the
+    last chunk if ``order`` is past the end) as
+    ``{"chunk", "total", "previous_order", "next_chunk"}``. Costs a few
+    small queries whatever the lesson's length.
+    """
+    page = {
+        "chunk": None,
+        "total": chunk_count(lesson.pk, lesson.updated_at),
+        "previous_order": None,
+        "next_chunk": None,
+    }
+    if not page["total"]:
+        return page
+
+    chunks = LessonChunk.objects.filter(lesson_id=lesson.pk)
+    pair = list(chunks.filter(order__gte=max(0, order)).order_by("order", "pk")[:2])
+    if not pair:
+        pair = list(chunks.order_by("-order", "-pk")[:1])
+    current = page["chunk"] = pair[0]
+    if len(pair) > 1:
+        # Rows sharing an order (hand-edited lessons) are skipped, not looped over
+        page["next_chunk"] = pair[1] if pair[1].order > current.order else (
+            chunks.filter(order__gt=current.order).order_by("order", "pk").first()
+        )
+    page["previous_order"] = (
+        chunks.filter(order__lt=current.order)
+        .order_by("-order")
+        .values_list("order", flat=True)
+        .first()
+    )
+    return page
+
+
+def prefetch_links(urls):
+    """``Link`` header value hinting the browser to fetch ``(url, as)`` pairs ahead of time."""
+    links = []
+    for url, kind in urls:
+        link = f"<{url}>; rel=prefetch"
+        if kind:
+            link += f"; as={kind}"
+        links.append(link)
+    return ", ".join(links)
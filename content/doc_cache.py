@@ -0,0 +1,140 @@
+# content/doc_cache.py
+"""
+On-disk cache of parsed spaCy docs, so a text is parsed once for every NLP
+consumer (grammar extraction today; glossary linking and writing scoring
+can use the same parses) and every process.
+
+Each text is stored once as a serialized ``DocBin`` under
+``CONTENT_NLP["DOC_CACHE_DIR"]/<model key>/<hh>/<sha256>.spacy``. The model
+key covers the model name, version and loaded pipes, so a model upgrade or
+a different ``PIPES`` setting starts a fresh directory rather than serving
+docs with the wrong annotation (``prune`` removes the old ones).
+
+Files are written atomically. What is shared is the parsing work, not
+memory: loading a doc decompresses and deserializes the file into a
+private copy in the calling process, which is still much cheaper than
+running the parser again.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import zlib
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+
+from .hashing import text_hash
+from .nlp import get_nlp, model_version
+
+SUFFIX = ".spacy"
+
+
+def cache_dir():
+    conf = getattr(settings, "CONTENT_NLP", {})
+    return Path(conf.get("DOC_CACHE_DIR") or Path(settings.BASE_DIR) / "var" / "doc_cache")
+
+
+def model_key():
+    """Directory name for docs parsed by the current pipeline."""
+    version = model_version()
+    spec = f"{version}:{'+'.join(get_nlp().pipe_names)}"
+    return f"{version}-{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _path(root, digest):
+    return root / digest[:2] / f"{digest}{SUFFIX}"
+
+
+def load(text, root=None):
+    """The cached doc for ``text``, or None."""
+    nlp = get_nlp()
+    path = _path(root or cache_dir() / model_key(), text_hash(text))
+    from spacy.tokens import DocBin
+
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        docs = list(DocBin().from_bytes(data).get_docs(nlp.vocab))
+    except (ValueError, zlib.error):
+        # Empty, truncated or corrupt: a miss, and the parse replaces it
+        path.unlink(missing_ok=True)
+        return None
+    return docs[0] if docs else None
+
+
+def store(doc, text=None, root=None):
+    """Save ``doc`` (parsed from ``text``, by default ``doc.text``)."""
+    from spacy.tokens import DocBin
+
+    path = _path(root or cache_dir() / model_key(), text_hash(doc.text if text is None else text))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(DocBin(docs=[doc]).to_bytes())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def get_doc(text):
+    """Parsed doc for ``text``, from the cache when it has been parsed before."""
+    root = cache_dir() / model_key()
+    doc = load(text, root)
+    if doc is None:
+        doc = get_nlp()(text)
+        store(doc, text, root)
+    return doc
+
+
+def get_docs(items, batch_size=64, n_process=1, stats=None):
+    """
+    Like ``nlp.pipe(items, as_tuples=True)``: yield ``(doc, context)`` for
+    ``(text, context)`` pairs, but only parse (and then store) the texts not
+    in the cache. Docs come back in no particular order; cache hits and
+    parses are counted in ``stats`` when given.
+    """
+    nlp = get_nlp()
+    root = cache_dir() / model_key()
+    stats = stats if stats is not None else {}
+    stats.setdefault("hits", 0)
+    stats.setdefault("parsed", 0)
+    hits = deque()
+
+    def misses():
+        for text, context in items:
+            doc = load(text, root)
+            if doc is None:
+                yield text, context
+            else:
+                hits.append((doc, context))
+
+    # One pipe for the whole stream, so parser processes start only once
+    for doc, context in nlp.pipe(misses(), as_tuples=True, batch_size=batch_size, n_process=n_process):
+        while hits:
+            stats["hits"] += 1
+            yield hits.popleft()
+        store(doc, root=root)
+        stats["parsed"] += 1
+        yield doc, context
+    while hits:
+        stats["hits"] += 1
+        yield hits.popleft()
+
+
+def prune():
+    """Remove docs parsed by other models or pipelines; returns the directories removed."""
+    root, current = cache_dir(), model_key()
+    removed = []
+    if root.is_dir():
+        for child in root.iterdir():
+            if child.is_dir() and child.name != current:
+                shutil.rmtree(child, ignore_errors=True)
+                removed.append(child.name)
+    return removed
@@ -0,0 +1,130 @@
+# content/grammar_cache.py
+"""
+Persistent cache of grammar extraction results, one row per lesson
+(``LessonGrammarCache``), valid while the hash of the lesson text and the
+rule-set version match.
+
+Concurrent requests for the same lesson are coalesced: threads of one
+process share a single in-flight parse, and across processes the row
+doubles as a claim (``points`` unset) that others wait on instead of
+parsing too. A claim older than ``CLAIM_TIMEOUT`` is treated as abandoned.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .hashing import text_hash
+from .models import LessonGrammarCache
+
+CLAIM_TIMEOUT = 120
+POLL_INTERVAL = 0.1
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def cached_grammar(lesson_id, text, extract, rules_version):
+    """
+    Return ``extract(text)`` for the lesson, from the cache when the text
+    and ``rules_version`` haven't changed since it was last computed.
+    """
+    key = (lesson_id, text_hash(text), rules_version)
+    points = _lookup(key)
+    if points is not None:
+        return points
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        points = _compute(key, text, extract)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(points)
+        return points
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def invalidate(lesson_id, text):
+    """Drop the lesson's cached result unless it was computed from ``text``."""
+    LessonGrammarCache.objects.filter(lesson_id=lesson_id).exclude(text_hash=text_hash(text)).delete()
+
+
+# ---------------------------------------------------
+# Internals
+# ---------------------------------------------------
+def _lookup(key):
+    lesson_id, digest, version = key
+    return (
+        LessonGrammarCache.objects
+        .filter(lesson_id=lesson_id, text_hash=digest, rules_version=version, points__isnull=False)
+        .values_list("points", flat=True)
+        .first()
+    )
+
+
+def _compute(key, text, extract):
+    lesson_id, digest, version = key
+    while not _claim(key):
+        # Another process is parsing this text; wait for its result
+        time.sleep(POLL_INTERVAL)
+        points = _lookup(key)
+        if points is not None:
+            return points
+
+    try:
+        points = extract(text)
+    except BaseException:
+        # Let waiters claim it rather than sit out the timeout
+        LessonGrammarCache.objects.filter(
+            lesson_id=lesson_id, text_hash=digest, rules_version=version, points__isnull=True,
+        ).delete()
+        raise
+
+    LessonGrammarCache.objects.filter(
+        lesson_id=lesson_id, text_hash=digest, rules_version=version,
+    ).update(points=points, updated_at=timezone.now())
+    return points
+
+
+def _claim(key):
+    """Mark the lesson's row as being parsed for ``key``; False if someone else is."""
+    lesson_id, digest, version = key
+    now = timezone.now()
+
+    # Take over a row for other text or rules, or an abandoned claim
+    taken = (
+        LessonGrammarCache.objects
+        .filter(lesson_id=lesson_id)
+        .filter(
+            ~Q(text_hash=digest)
+            | ~Q(rules_version=version)
+            | Q(points__isnull=True, updated_at__lt=now - timedelta(seconds=CLAIM_TIMEOUT))
+        )
+        .update(text_hash=digest, rules_version=version, points=None, updated_at=now)
+    )
+    if taken:
+        return True
+    try:
+        with transaction.atomic():
+            LessonGrammarCache.objects.create(
+                lesson_id=lesson_id, text_hash=digest, rules_version=version, points=None,
+            )
+    except IntegrityError:
+        return False
+    return True
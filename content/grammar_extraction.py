@@ -0,0 +1,180 @@
+# content/grammar_extraction.py
+"""
+Grammar points pre-extracted from lesson and chunk texts, written by the
+``extract_grammar`` command.
+
+Every text that has been through the rules has a ``GrammarExtraction`` row
+recording the hash of the text and the rules version; its points are
+``GrammarPoint`` rows with ``source="extracted"``. A text is only parsed
+again when its hash or the rules change. Results are committed every few
+hundred texts, so an interrupted run picks up where it stopped.
+
+Re-extraction updates points in place (matched by rule id), so students'
+``GrammarAttempt`` rows survive as long as the feature is still found.
+
+Chunk points carry their ``chunk``. A lesson's text contains its chunks'
+texts, so lesson-level listings go through ``lesson_points``, which shows
+each extracted feature once.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from .hashing import text_hash
+from .models import GrammarExtraction, GrammarPoint, Lesson, LessonChunk
+from .signals import touch_lessons
+
+_POINT_FIELDS = ["title", "explanation", "examples", "occurrences"]
+
+
+def pending_texts(rules_version, force=False, stale=None):
+    """
+    Yield ``(text, (lesson_id, chunk_id, digest))`` for every lesson and chunk
+    whose extracted grammar is missing or out of date (all of them with
+    ``force``). Sources whose text is now empty are added to ``stale``.
+    """
+    done = {
+        (lesson_id, chunk_id): (digest, version)
+        for lesson_id, chunk_id, digest, version in GrammarExtraction.objects.values_list(
+            "lesson_id", "chunk_id", "text_hash", "rules_version"
+        )
+    }
+
+    sources = (
+        Lesson.objects.order_by("pk").values_list("pk", "english_text"),
+        LessonChunk.objects.order_by("pk").values_list("lesson_id", "pk", "english_text"),
+    )
+    for queryset in sources:
+        for row in queryset.iterator(chunk_size=500):
+            lesson_id, chunk_id, text = (row[0], None, row[1]) if len(row) == 2 else row
+            key = (lesson_id, chunk_id)
+            text = (text or "").strip()
+            if not text:
+                if key in done and stale is not None:
+                    stale.append(key)
+                continue
+            digest = text_hash(text)
+            if force or done.get(key) != (digest, rules_version):
+                yield text, (lesson_id, chunk_id, digest)
+
+
+def lesson_points(points):
+    """
+    A lesson's grammar points with extracted features listed once per rule:
+    the whole-lesson point if there is one, else the first chunk's.
+    Manual points are all kept.
+    """
+    points = sorted(points, key=lambda p: (p.chunk_id is not None, p.chunk_id or 0, p.pk))
+    seen, result = set(), []
+    for point in points:
+        if point.source == "extracted" and point.rule_id:
+            if point.rule_id in seen:
+                continue
+            seen.add(point.rule_id)
+        result.append(point)
+    return sorted(result, key=lambda p: p.pk)
+
+
+class GrammarPointWriter:
+    """Buffers extracted points and writes them ``batch_size`` texts at a time."""
+
+    def __init__(self, rules_version, batch_size=200):
+        self.rules_version = rules_version
+        self.batch_size = batch_size
+        self.stats = {"texts": 0, "created": 0, "updated": 0, "deleted": 0}
+        self.lesson_ids = set()
+        self._pending = []
+
+    def add(self, key, points):
+        self._pending.append((key, points))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+
+        with transaction.atomic():
+            extractions = self._extractions([key for key, _ in batch])
+            existing = {}
+            for point in GrammarPoint.objects.filter(extraction__in=extractions.values()):
+                existing[(point.extraction_id, point.rule_id)] = point
+
+            created, updated = [], []
+            for (lesson_id, chunk_id, _), points in batch:
+                extraction = extractions[(lesson_id, chunk_id)]
+                for p in points:
+                    values = {
+                        "title": p["title"][:200],
+                        "explanation": p["explanation"],
+                        "examples": "\n".join(p["examples"]),
+                        "occurrences": p["count"],
+                    }
+                    point = existing.pop((extraction.pk, p["id"]), None)
+                    if point is None:
+                        created.append(GrammarPoint(
+                            lesson_id=lesson_id, chunk_id=chunk_id, extraction=extraction,
+                            source="extracted", rule_id=p["id"], **values,
+                        ))
+                    elif any(getattr(point, k) != v for k, v in values.items()):
+                        for k, v in values.items():
+                            setattr(point, k, v)
+                        updated.append(point)
+
+            GrammarPoint.objects.bulk_create(created, batch_size=500)
+            GrammarPoint.objects.bulk_update(updated, _POINT_FIELDS, batch_size=500)
+            # Features no longer found in the text
+            GrammarPoint.objects.filter(pk__in=[p.pk for p in existing.values()]).delete()
+
+        self.stats["texts"] += len(batch)
+        self.stats["created"] += len(created)
+        self.stats["updated"] += len(updated)
+        self.stats["deleted"] += len(existing)
+        self.lesson_ids.update(lesson_id for (lesson_id, _, _), _ in batch)
+
+    def clear(self, keys):
+        """Drop extracted points for sources whose text is gone."""
+        for lesson_id, chunk_id in keys:
+            GrammarExtraction.objects.filter(lesson_id=lesson_id, chunk_id=chunk_id).delete()
+            self.lesson_ids.add(lesson_id)
+
+    def finish(self):
+        """Flush, then bump ``updated_at`` once on every lesson whose points changed."""
+        self.flush()
+        if self.lesson_ids:
+            touch_lessons(self.lesson_ids)
+
+    def _extractions(self, keys):
+        """``GrammarExtraction`` for each key, created or brought up to date."""
+        lesson_ids = [l for l, c, _ in keys if c is None]
+        chunk_ids = [c for _, c, _ in keys if c is not None]
+        rows = {
+            (e.lesson_id, e.chunk_id): e
+            for e in GrammarExtraction.objects.filter(
+                Q(chunk__isnull=True, lesson_id__in=lesson_ids) | Q(chunk_id__in=chunk_ids)
+            )
+        }
+
+        missing, changed = [], []
+        for lesson_id, chunk_id, digest in keys:
+            row = rows.get((lesson_id, chunk_id))
+            if row is None:
+                missing.append(GrammarExtraction(
+                    lesson_id=lesson_id, chunk_id=chunk_id, text_hash=digest, rules_version=self.rules_version,
+                ))
+            else:
+                row.text_hash, row.rules_version = digest, self.rules_version
+                changed.append(row)
+
+        for row in changed:
+            row.save(update_fields=["text_hash", "rules_version", "extracted_at"])
+        if missing:
+            GrammarExtraction.objects.bulk_create(missing)
+            rows.update(
+                ((e.lesson_id, e.chunk_id), e)
+                for e in GrammarExtraction.objects.filter(
+                    Q(chunk__isnull=True, lesson_id__in=lesson_ids) | Q(chunk_id__in=chunk_ids)
+                )
+            )
+        return rows
@@ -0,0 +1,152 @@
+# content/grammar_rules.py
+"""
+Declarative grammar rules, compiled to spaCy matchers.
+
+Rules are read from JSON files (``settings.CONTENT_GRAMMAR_RULES``; by
+default data/grammar_rules.json):
+
+    {
+      "max_examples": 3,
+      "rules": [
+        {
+          "id": "modal_verb",
+          "title": "Modal Verb",
+          "explanation": "Modal verbs ({words}) express ...",
+          "patterns": [[{"LOWER": {"IN": ["can", "must"]}}]],
+          "dependency_patterns": [[{"RIGHT_ID": "verb", ...}, ...]],
+          "max_examples": 1
+        }
+      ]
+    }
+
+``patterns`` are ``Matcher`` token patterns, ``dependency_patterns``
+``DependencyMatcher`` patterns; a rule may have either or both. A later
+file replaces a rule by reusing its id. ``{words}`` in an explanation is
+filled with the words that matched.
+
+Every rule is matched in a single pass of one ``Matcher`` and one
+``DependencyMatcher``. Each feature found is reported once, with the
+number of matches and at most ``max_examples`` distinct example sentences,
+so the output stays small however long the lesson is.
+"""
+
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+
+DEFAULT_MAX_EXAMPLES = 3
+MAX_WORDS = 10
+
+
+class GrammarRuleError(ValueError):
+    pass
+
+
+def load_rules(paths):
+    """Rules from ``paths`` in order, later ids replacing earlier ones."""
+    rules = {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise GrammarRuleError(f"{path}: {exc}")
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            raise GrammarRuleError(f"{path}: expected an object with a 'rules' list")
+
+        default_cap = data.get("max_examples", DEFAULT_MAX_EXAMPLES)
+        for rule in data["rules"]:
+            if not isinstance(rule, dict) or not rule.get("id") or not rule.get("title"):
+                raise GrammarRuleError(f"{path}: every rule needs an 'id' and a 'title'")
+            if not rule.get("patterns") and not rule.get("dependency_patterns"):
+                raise GrammarRuleError(f"{path}: rule {rule['id']!r} has no patterns")
+            rules[rule["id"]] = {"max_examples": default_cap, **rule}
+    return list(rules.values())
+
+
+class GrammarRuleEngine:
+    def __init__(self, vocab, rules):
+        from spacy.matcher import DependencyMatcher, Matcher
+
+        self.vocab = vocab
+        self.rules = {rule["id"]: rule for rule in rules}
+        self.order = {rule_id: i for i, rule_id in enumerate(self.rules)}
+        self.matcher = Matcher(vocab, validate=True)
+        self.dependency_matcher = DependencyMatcher(vocab, validate=True)
+
+        for rule_id, rule in self.rules.items():
+            try:
+                if rule.get("patterns"):
+                    self.matcher.add(rule_id, rule["patterns"])
+                if rule.get("dependency_patterns"):
+                    self.dependency_matcher.add(rule_id, rule["dependency_patterns"])
+            except ValueError as exc:
+                raise GrammarRuleError(f"rule {rule_id!r}: {exc}")
+
+        # Part of the grammar cache key: changes whenever any rule does
+        canonical = json.dumps(rules, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def extract(self, doc):
+        """
+        Grammar features in ``doc``, in rule order. Rules that need
+        annotation the doc lacks (say, POS without a tagger) match nothing.
+        """
+        strings = doc.vocab.strings
+        hits = [(start, end, strings[match_id]) for match_id, start, end in self.matcher(doc, allow_missing=True)]
+        if len(self.dependency_matcher) and doc.has_annotation("DEP"):
+            for match_id, token_ids in self.dependency_matcher(doc):
+                # The first token of a dependency pattern is its anchor
+                hits.append((token_ids[0], token_ids[0] + 1, strings[match_id]))
+        hits.sort()
+
+        has_sents = doc.has_annotation("SENT_START")
+        found = {}
+        for start, end, rule_id in hits:
+            entry = found.setdefault(rule_id, {"count": 0, "sentences": {}, "words": {}})
+            entry["count"] += 1
+
+            sent = doc[start].sent if has_sents else doc[:]
+            if len(entry["sentences"]) < self.rules[rule_id]["max_examples"]:
+                entry["sentences"].setdefault(sent.text.strip(), None)
+            if len(entry["words"]) < MAX_WORDS:
+                entry["words"].setdefault(doc[start:end].text.lower(), None)
+
+        points = []
+        for rule_id in sorted(found, key=self.order.__getitem__):
+            rule, entry = self.rules[rule_id], found[rule_id]
+            examples = list(entry["sentences"])
+            words = ", ".join(f"‘{w}’" for w in entry["words"])
+            points.append({
+                "id": rule_id,
+                "title": rule["title"],
+                "explanation": rule.get("explanation", "").replace("{words}", words),
+                "example": examples[0] if examples else "",
+                "examples": examples,
+                "count": entry["count"],
+            })
+        return points
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_rule_engine(vocab):
+    """Engine for the configured rule files, compiled once per process."""
+    global _engine
+    if _engine is None or _engine.vocab is not vocab:
+        with _engine_lock:
+            if _engine is None or _engine.vocab is not vocab:
+                rules = load_rules(getattr(settings, "CONTENT_GRAMMAR_RULES", []))
+                _engine = GrammarRuleEngine(vocab, rules)
+    return _engine
+
+
+def rules_version():
+    """Cache key for the configured rules plus the model they run on."""
+    from .nlp import get_nlp, model_version
+
+    return f"{get_rule_engine(get_nlp().vocab).version}:{model_version()}"
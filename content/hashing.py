@@ -0,0 +1,9 @@
+# content/hashing.py
+"""Content hashes shared by the caches keyed on a text."""
+
+import hashlib
+
+
+def text_hash(text):
+    """Hex SHA-256 of ``text`` (None hashes like the empty string)."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
@@ -0,0 +1,69 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from content.doc_cache import cache_dir, get_docs, model_key, prune
+from content.nlp import NLPUnavailable, get_nlp
+
+# (model, text field) pairs whose texts NLP consumers parse
+SOURCES = (
+    ("content.Lesson", "english_text"),
+    ("content.LessonChunk", "english_text"),
+    ("reading.ReadingLesson", "content"),
+    ("translation.TranslationLesson", "english_chunk"),
+)
+
+
+def _texts(sources):
+    for label, field in sources:
+        queryset = apps.get_model(label).objects.exclude(**{field: ""}).order_by("pk")
+        for text in queryset.values_list(field, flat=True).iterator(chunk_size=500):
+            if text and text.strip():
+                yield text, label
+
+
+class Command(BaseCommand):
+    help = "Parse lesson texts that aren't in the shared doc cache yet (see content/doc_cache.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", action="append", dest="models",
+            help=f"Only this source (repeatable): {', '.join(label for label, _ in SOURCES)}",
+        )
+        parser.add_argument("--batch-size", type=int, default=64, help="Texts per nlp.pipe batch")
+        parser.add_argument("--n-process", type=int, default=1, help="Parser processes for nlp.pipe")
+        parser.add_argument("--prune", action="store_true", help="Remove docs from other models/pipelines")
+
+    def handle(self, *args, **options):
+        try:
+            get_nlp()
+        except NLPUnavailable as exc:
+            raise CommandError(str(exc))
+
+        sources = SOURCES
+        if options["models"]:
+            sources = [s for s in SOURCES if s[0] in options["models"]]
+            unknown = set(options["models"]) - {label for label, _ in sources}
+            if unknown:
+                raise CommandError(f"Unknown source(s): {', '.join(sorted(unknown))}")
+
+        if options["prune"]:
+            for name in prune():
+                self.stdout.write(f"  removed {name}")
+
+        stats = {}
+        started = time.perf_counter()
+        for _ in get_docs(
+            _texts(sources),
+            batch_size=max(1, options["batch_size"]),
+            n_process=max(1, options["n_process"]),
+            stats=stats,
+        ):
+            pass
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['parsed']} texts parsed, {stats['hits']} already cached, in {elapsed:.2f}s "
+            f"({stats['parsed'] / elapsed:.1f} docs/s) -> {cache_dir() / model_key()}"
+        ))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content.models import Lesson
+from content.utils.chunk_helper import UNITS, chunk_lesson_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Split lesson texts into chunks. Only chunks whose text changed are written; "
+        "unchanged chunks keep their translations and audio."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lesson", type=int, action="append", help="Only this lesson id (repeatable)")
+        parser.add_argument("--unit", choices=UNITS, help="Chunk size unit (default: CONTENT_CHUNKING['UNIT'])")
+        parser.add_argument("--target", type=float, help="Chunk size in units (default: CONTENT_CHUNKING['TARGET'])")
+
+    def handle(self, *args, **options):
+        lessons = Lesson.objects.exclude(english_text="").order_by("pk").only("pk", "english_text")
+        if options["lesson"]:
+            lessons = lessons.filter(pk__in=options["lesson"])
+
+        totals = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        started = time.perf_counter()
+        count = 0
+        for lesson in lessons.iterator(chunk_size=200):
+            try:
+                stats = chunk_lesson_text(lesson, chunk_size=options["target"], unit=options["unit"])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            for key, value in stats.items():
+                totals[key] += value
+            count += 1
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} lessons chunked in {elapsed:.2f}s: {totals['created']} chunks created, "
+            f"{totals['updated']} updated, {totals['deleted']} deleted, {totals['unchanged']} unchanged."
+        ))
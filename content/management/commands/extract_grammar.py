@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content.doc_cache import get_docs
+from content.grammar_extraction import GrammarPointWriter, pending_texts
+from content.grammar_rules import get_rule_engine, rules_version
+from content.nlp import NLPUnavailable, get_nlp
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract grammar points from every lesson and chunk text whose text (or the "
+        "rules) changed since the last run. Safe to interrupt and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=64, help="Texts per nlp.pipe batch")
+        parser.add_argument("--n-process", type=int, default=1, help="Parser processes for nlp.pipe")
+        parser.add_argument("--write-every", type=int, default=200, help="Texts per database commit")
+        parser.add_argument("--force", action="store_true", help="Re-extract unchanged texts too")
+
+    def handle(self, *args, **options):
+        try:
+            nlp = get_nlp()
+        except NLPUnavailable as exc:
+            raise CommandError(str(exc))
+        engine = get_rule_engine(nlp.vocab)
+        version = rules_version()
+
+        writer = GrammarPointWriter(version, batch_size=max(1, options["write_every"]))
+        stale = []
+        texts = pending_texts(version, force=options["force"], stale=stale)
+
+        started = time.perf_counter()
+        # Texts parsed before (by any NLP consumer) come from the doc cache
+        cache_stats = {}
+        docs = get_docs(
+            texts,
+            batch_size=max(1, options["batch_size"]),
+            n_process=max(1, options["n_process"]),
+            stats=cache_stats,
+        )
+        write_every = writer.batch_size
+        for parsed, (doc, key) in enumerate(docs, start=1):
+            writer.add(key, engine.extract(doc))
+            if parsed % write_every == 0:
+                self.stdout.write(f"  {parsed} texts parsed")
+        writer.clear(stale)
+        writer.finish()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        stats = writer.stats
+        self.stdout.write(self.style.SUCCESS(
+            f"Parsed {stats['texts']} texts in {elapsed:.2f}s ({stats['texts'] / elapsed:.1f} docs/s): "
+            f"{stats['created']} points created, {stats['updated']} updated, {stats['deleted']} removed; "
+            f"{len(stale)} emptied texts cleared. "
+            f"Doc cache: {cache_stats['hits']} hits, {cache_stats['parsed']} parsed."
+        ))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from content.models import LessonChunk
+from content.tts import generate_chunk_audio, load_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate English and translated audio for lesson chunks. Each distinct text "
+        "is synthesised once; chunks whose audio matches their text are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lesson", type=int, action="append", help="Only this lesson id (repeatable)")
+        parser.add_argument("--backend", help="TTS backend (default: CONTENT_TTS['BACKEND'])")
+        parser.add_argument("--workers", type=int, help="Concurrent synthesis requests")
+        parser.add_argument("--overwrite", action="store_true", help="Synthesise again even if audio exists")
+
+    def handle(self, *args, **options):
+        chunks = LessonChunk.objects.order_by("lesson_id", "order").only(
+            "pk", "lesson_id", "english_text", "translated_text", "audio_file", "translated_audio_file",
+        )
+        if options["lesson"]:
+            chunks = chunks.filter(lesson_id__in=options["lesson"])
+
+        started = time.perf_counter()
+        stats = generate_chunk_audio(
+            chunks,
+            backend=load_backend(options["backend"]),
+            workers=options["workers"],
+            overwrite=options["overwrite"],
+        )
+        elapsed = time.perf_counter() - started
+
+        for error in stats["errors"]:
+            self.stdout.write(self.style.WARNING(error))
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['chunks_updated']} chunks updated in {elapsed:.2f}s: "
+            f"{stats['synthesized']} files synthesised, {stats['reused']} reused, {stats['failed']} failed."
+        ))
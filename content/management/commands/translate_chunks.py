@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from content.models import LessonChunk
+from content.signals import touch_lessons
+from content.translation_memory import TranslationError, load_backend, translate_many
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in missing chunk translations in batches. Texts already in the "
+        "translation memory are not sent to the backend again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lesson", type=int, action="append", help="Only this lesson id (repeatable)")
+        parser.add_argument("--backend", help="Translation backend (default: CONTENT_TRANSLATION['BACKEND'])")
+        parser.add_argument("--target", default="ur", help="Target language code")
+        parser.add_argument("--overwrite", action="store_true", help="Also replace existing translations")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Chunks per translate/update round")
+
+    def handle(self, *args, **options):
+        chunks = LessonChunk.objects.order_by("pk").only("pk", "lesson_id", "english_text", "translated_text")
+        if options["lesson"]:
+            chunks = chunks.filter(lesson_id__in=options["lesson"])
+        if not options["overwrite"]:
+            chunks = chunks.filter(translated_text="")
+
+        backend = load_backend(options["backend"])
+        stats = {}
+        started = time.perf_counter()
+        updated, lesson_ids = 0, set()
+        last_pk = 0
+        while True:
+            rows = list(chunks.filter(pk__gt=last_pk)[:max(1, options["chunk_size"])])
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            try:
+                results = translate_many(
+                    [c.english_text for c in rows], "en", options["target"], backend=backend, stats=stats,
+                )
+            except TranslationError as exc:
+                raise CommandError(f"{exc} ({updated} chunks translated before the failure)")
+
+            changed = [c for c, text in zip(rows, results) if text and text != c.translated_text]
+            for chunk, text in zip(rows, results):
+                if text:
+                    chunk.translated_text = text
+            with transaction.atomic():
+                LessonChunk.objects.bulk_update(changed, ["translated_text"], batch_size=500)
+            updated += len(changed)
+            lesson_ids.update(c.lesson_id for c in changed)
+
+        if lesson_ids:
+            touch_lessons(lesson_ids)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{updated} chunks translated in {elapsed:.2f}s: {stats.get('cached', 0)} texts from memory, "
+            f"{stats.get('translated', 0)} translated in {stats.get('calls', 0)} backend calls."
+        ))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0013_lesson_updated_at_lessonchunk_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonGrammarCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('rules_version', models.CharField(max_length=64)),
+                ('points', models.JSONField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lesson', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grammar_cache', to='content.lesson')),
+            ],
+        ),
+    ]
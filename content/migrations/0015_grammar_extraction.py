@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0014_lessongrammarcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grammarpoint',
+            name='occurrences',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='grammarpoint',
+            name='rule_id',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='grammarpoint',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual'), ('extracted', 'Extracted')], default='manual', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='GrammarExtraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('rules_version', models.CharField(max_length=64)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('chunk', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grammar_extractions', to='content.lessonchunk')),
+                ('lesson', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grammar_extractions', to='content.lesson')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='grammarpoint',
+            name='extraction',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='points', to='content.grammarextraction'),
+        ),
+        migrations.AddConstraint(
+            model_name='grammarextraction',
+            constraint=models.UniqueConstraint(condition=models.Q(('chunk__isnull', True)), fields=('lesson',), name='unique_lesson_grammar_extraction'),
+        ),
+        migrations.AddConstraint(
+            model_name='grammarextraction',
+            constraint=models.UniqueConstraint(fields=('chunk',), name='unique_chunk_grammar_extraction'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0016_translationmemory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lessonchunk',
+            index=models.Index(fields=['lesson', 'order'], name='lessonchunk_lesson_order'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_chunks(apps, schema_editor):
+    GrammarPoint = apps.get_model("content", "GrammarPoint")
+    GrammarExtraction = apps.get_model("content", "GrammarExtraction")
+    GrammarPoint.objects.filter(extraction__chunk__isnull=False).update(
+        chunk=Subquery(GrammarExtraction.objects.filter(pk=OuterRef("extraction_id")).values("chunk_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0017_lessonchunk_lesson_order_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grammarpoint',
+            name='chunk',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grammar_points', to='content.lessonchunk'),
+        ),
+        migrations.RunPython(fill_chunks, migrations.RunPython.noop),
+    ]
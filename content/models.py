@@ -38,6 +38,8 @@ class Lesson(models.Model):
     english_text = models.TextField(blank=True, help_text="Optional: full English lesson text")
     translated_text = models.TextField(blank=True, help_text="Optional: full Urdu/Punjabi/Pashto translation")
     audio_file = models.FileField(upload_to="lesson_audio/", blank=True, null=True)
+    # Also bumped when anything nested under the lesson changes (content/signals.py)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['number']
@@ -61,9 +63,12 @@ class LessonChunk(models.Model):
     # Audio files
     audio_file = models.FileField(upload_to="chunk_audio/", blank=True, null=True, help_text="English audio")
     translated_audio_file = models.FileField(upload_to="chunk_audio_urdu/", blank=True, null=True, help_text="Urdu audio")  # ✅ new field
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        # The lesson player reads one chunk at a time by (lesson, order)
+        indexes = [models.Index(fields=["lesson", "order"], name="lessonchunk_lesson_order")]
 
     def __str__(self):
         return f"{self.lesson} – Chunk {self.order}"
@@ -144,12 +149,55 @@ class SentenceAttempt(models.Model):
 # -------------------------------
 # 7. GRAMMAR POINTS + ATTEMPTS
 # -------------------------------
+class GrammarExtraction(models.Model):
+    """
+    One run of the grammar rules over a lesson's text, or one chunk's
+    (``extract_grammar`` command). Records which text and rules produced the
+    extracted ``GrammarPoint`` rows, so unchanged texts are skipped next time.
+    """
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="grammar_extractions")
+    chunk = models.ForeignKey(
+        LessonChunk, on_delete=models.CASCADE, null=True, blank=True, related_name="grammar_extractions"
+    )
+    text_hash = models.CharField(max_length=64)
+    rules_version = models.CharField(max_length=64)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lesson"], condition=models.Q(chunk__isnull=True), name="unique_lesson_grammar_extraction"
+            ),
+            models.UniqueConstraint(fields=["chunk"], name="unique_chunk_grammar_extraction"),
+        ]
+
+    def __str__(self):
+        return f"Grammar extraction for lesson={self.lesson_id} chunk={self.chunk_id}"
+
+
 class GrammarPoint(models.Model):
+    SOURCES = [
+        ("manual", "Manual"),
+        ("extracted", "Extracted"),
+    ]
+
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="grammar_points")
     title = models.CharField(max_length=200, help_text="e.g., 'Present Perfect Tense'")
     explanation = models.TextField(help_text="Explain the grammar rule here.")
     examples = models.TextField(help_text="Add example sentences here.")
 
+    # Provenance of extracted points (manual points leave these empty)
+    source = models.CharField(max_length=20, choices=SOURCES, default="manual")
+    extraction = models.ForeignKey(
+        GrammarExtraction, on_delete=models.CASCADE, null=True, blank=True, related_name="points"
+    )
+    # Set when the point was extracted from one chunk rather than the whole lesson
+    chunk = models.ForeignKey(
+        LessonChunk, on_delete=models.CASCADE, null=True, blank=True, related_name="grammar_points"
+    )
+    rule_id = models.CharField(max_length=64, blank=True)
+    occurrences = models.PositiveIntegerField(null=True, blank=True)
+
     def __str__(self):
         return self.title
 
@@ -164,6 +212,22 @@ class GrammarAttempt(models.Model):
         return f"{self.student_id} - {self.grammar_point.title}"
 
 
+class LessonGrammarCache(models.Model):
+    """
+    Grammar extracted from a lesson's English text, reused while the text
+    and the rule set are unchanged (see content/grammar_cache.py).
+    A row with no ``points`` yet is a parse in progress.
+    """
+    lesson = models.OneToOneField(Lesson, on_delete=models.CASCADE, related_name="grammar_cache")
+    text_hash = models.CharField(max_length=64)
+    rules_version = models.CharField(max_length=64)
+    points = models.JSONField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Grammar cache for lesson={self.lesson_id}"
+
+
 # -------------------------------
 # 8. COMPREHENSION QUESTIONS + ATTEMPTS
 # -------------------------------
@@ -199,4 +263,30 @@ class PronunciationAttempt(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.student_id} – Pronunciation of {self.chunk}"
\ No newline at end of file
+        return f"{self.student_id} – Pronunciation of {self.chunk}"
+
+# -------------------------------
+# 10. TRANSLATION MEMORY
+# -------------------------------
+class TranslationMemory(models.Model):
+    """
+    Every machine translation made so far, keyed by language pair and the
+    hash of the normalised source text (see content/translation_memory.py).
+    """
+    source_lang = models.CharField(max_length=10)
+    target_lang = models.CharField(max_length=10)
+    source_hash = models.CharField(max_length=64)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    backend = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_lang", "target_lang", "source_hash"], name="unique_translation_memory"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source_lang}->{self.target_lang}: {self.source_text[:40]}"
@@ -0,0 +1,132 @@
+# content/nlp.py
+"""
+The spaCy pipeline, loaded once per process on first use rather than at
+import, so ``manage.py`` commands and workers that never parse text don't
+pay for it. Configured by ``settings.CONTENT_NLP``:
+
+    CONTENT_NLP = {
+        "MODEL": "en_core_web_sm",
+        "PIPES": ["tok2vec", "tagger", "attribute_ruler", "parser"],
+        "WARM_ON_START": False,
+    }
+
+Components of the model not in ``PIPES`` are excluded (never loaded). The
+grammar rules need tags, POS, dependencies and sentence boundaries, which
+the parser provides; a model without a parser keeps its ``senter``.
+
+Web workers can call ``warm_up()`` at start (backend/wsgi.py and asgi.py do
+when ``WARM_ON_START`` is set) so the first request doesn't wait for it.
+"""
+
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NLPUnavailable(Exception):
+    """The configured model could not be loaded."""
+
+
+_nlp = None
+_error = None
+_stats = {}
+_lock = threading.Lock()
+
+
+def _conf():
+    conf = getattr(settings, "CONTENT_NLP", {})
+    return conf.get("MODEL", "en_core_web_sm"), list(conf.get("PIPES", []))
+
+
+def _rss_bytes():
+    """Current resident set size (peak where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _excluded(spacy, model, pipes):
+    """Components of ``model`` that aren't needed, read from its meta.json."""
+    try:
+        path = Path(model) if Path(model).exists() else spacy.util.get_package_path(model)
+        meta = spacy.util.get_model_meta(path)
+    except Exception:
+        return []
+    components = meta.get("components") or meta.get("pipeline") or []
+    keep = set(pipes)
+    if "parser" not in components:
+        keep.add("senter")
+    return [name for name in components if name not in keep]
+
+
+def _load():
+    global _nlp, _error, _stats
+    import spacy
+
+    model, pipes = _conf()
+    started, rss_before = time.perf_counter(), _rss_bytes()
+    try:
+        nlp = spacy.load(model, exclude=_excluded(spacy, model, pipes))
+    except Exception as exc:
+        _error = f"Could not load spaCy model {model!r}: {exc}"
+        logger.warning(_error)
+        return
+
+    rss_after = _rss_bytes()
+    _stats = {
+        "model": f"{nlp.meta.get('name', model)}-{nlp.meta.get('version', '')}",
+        "pipes": nlp.pipe_names,
+        "load_seconds": round(time.perf_counter() - started, 3),
+        "rss_mb": round(rss_after / 2 ** 20, 1),
+        "rss_delta_mb": round((rss_after - rss_before) / 2 ** 20, 1),
+    }
+    logger.info(
+        "Loaded spaCy %s (%s) in %.2fs; RSS %.0f MB (+%.0f MB)",
+        _stats["model"], ", ".join(_stats["pipes"]), _stats["load_seconds"],
+        _stats["rss_mb"], _stats["rss_delta_mb"],
+    )
+    _nlp = nlp
+
+
+def get_nlp():
+    """The process-wide pipeline; raises ``NLPUnavailable`` if it can't be loaded."""
+    if _nlp is None and _error is None:
+        with _lock:
+            if _nlp is None and _error is None:
+                _load()
+    if _nlp is None:
+        raise NLPUnavailable(_error)
+    return _nlp
+
+
+def model_version():
+    """``name-version`` of the loaded model, part of derived-data cache keys."""
+    get_nlp()
+    return _stats["model"]
+
+
+def warm_up():
+    """Load the pipeline now and return ``load_stats()``; never raises."""
+    try:
+        get_nlp()
+    except NLPUnavailable:
+        pass
+    return load_stats()
+
+
+def load_stats():
+    """Model, pipes, load time and resident memory, or the load error."""
+    if _error:
+        return {"loaded": False, "error": _error}
+    return {"loaded": _nlp is not None, **_stats}
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from .grammar_extraction import lesson_points
 from .models import (
     Textbook,
     Unit,
@@ -64,7 +66,7 @@ class ComprehensionQuestionSerializer(serializers.ModelSerializer):
 class GrammarPointSerializer(serializers.ModelSerializer):
     class Meta:
         model = GrammarPoint
-        fields = ["id", "title", "explanation", "examples"]
+        fields = ["id", "title", "explanation", "examples", "source", "chunk", "occurrences"]
 
 
 # -------------------------------
@@ -83,7 +85,7 @@ class LessonSerializer(serializers.ModelSerializer):
     chunks = LessonChunkSerializer(many=True, read_only=True)
     vocab_items = VocabularyItemSerializer(many=True, read_only=True)
     comprehension_questions = ComprehensionQuestionSerializer(many=True, read_only=True)
-    grammar_points = GrammarPointSerializer(many=True, read_only=True)
+    grammar_points = serializers.SerializerMethodField()
     writing_tasks = WritingTaskSerializer(many=True, read_only=True)
 
     class Meta:
@@ -102,6 +104,11 @@ class LessonSerializer(serializers.ModelSerializer):
             "writing_tasks",
         ]
 
+    def get_grammar_points(self, obj):
+        # Features extracted per chunk are also in the lesson's own extraction
+        points = lesson_points(obj.grammar_points.all())
+        return GrammarPointSerializer(points, many=True, context=self.context).data
+
 
 # -------------------------------
 #  UNITS (OPTIONAL NESTED LESSONS)
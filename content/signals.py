@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import ComprehensionQuestion, GrammarPoint, Lesson, LessonChunk, VocabularyItem, WritingTask
+
+# Everything LessonSerializer nests under a lesson
+LESSON_CHILDREN = (LessonChunk, VocabularyItem, ComprehensionQuestion, GrammarPoint, WritingTask)
+
+
+def touch_lesson(sender, instance, **kwargs):
+    """
+    Keep ``Lesson.updated_at`` the single validator for the lesson API:
+    any change to a nested row counts as a change to the lesson.
+    Bulk queryset operations don't send signals; call ``touch_lessons`` after them.
+    """
+    touch_lessons([instance.lesson_id])
+
+
+def touch_lessons(lesson_ids):
+    Lesson.objects.filter(pk__in=lesson_ids).update(updated_at=timezone.now())
+
+
+def drop_stale_grammar(sender, instance, **kwargs):
+    """A lesson saved with new English text no longer matches its cached grammar."""
+    from .grammar_cache import invalidate
+
+    invalidate(instance.pk, instance.english_text)
+
+
+def connect():
+    post_save.connect(drop_stale_grammar, sender=Lesson, dispatch_uid="drop-stale-grammar")
+    for model in LESSON_CHILDREN:
+        post_save.connect(touch_lesson, sender=model, dispatch_uid=f"touch-lesson-{model.__name__}")
+        post_delete.connect(touch_lesson, sender=model, dispatch_uid=f"touch-lesson-del-{model.__name__}")
@@ -0,0 +1,297 @@
+# content/translation_memory.py
+"""
+Machine translation with a persistent translation memory, configured by
+``settings.CONTENT_TRANSLATION``:
+
+    CONTENT_TRANSLATION = {
+        "BACKEND": "google",    # "google", "http", "fake", or a dotted path
+        "OPTIONS": {},          # passed to the backend's constructor
+        "BATCH_CHARS": 4500,    # source characters per backend call
+        "BATCH_SIZE": 50,       # texts per backend call
+        "MAX_CONCURRENT": 2,    # backend calls in flight per process
+    }
+
+Texts are normalised (Unicode NFC, whitespace collapsed to single spaces)
+and looked up in ``TranslationMemory`` by (source, target, sha256 of the
+normalised text) first, so repeated textbook content is only ever sent to
+the backend once. What's left is deduplicated, packed into batches and
+translated with at most ``MAX_CONCURRENT`` calls at a time.
+
+The ``http`` backend speaks the LibreTranslate API (``{"q": [...]}`` in,
+``{"translatedText": [...]}`` out); ``start_fake_server`` runs a local
+server speaking it for tests, and the ``fake`` backend skips the network
+altogether.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import threading
+import unicodedata
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+
+from .models import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    "google": "content.translation_memory.GoogleBackend",
+    "http": "content.translation_memory.HTTPBackend",
+    "fake": "content.translation_memory.FakeBackend",
+}
+
+_LOOKUP_CHUNK = 500
+
+
+class TranslationError(Exception):
+    pass
+
+
+# ---------------------------------------------------
+# BACKENDS
+# ---------------------------------------------------
+class TranslationBackend:
+    """Base class. ``options`` comes from ``CONTENT_TRANSLATION["OPTIONS"]``."""
+
+    name = ""
+
+    def __init__(self, **options):
+        self.options = options
+
+    def translate_batch(self, texts, source, target):
+        """Return the translations of ``texts`` (single-line strings), in order."""
+        raise NotImplementedError
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google Translate via deep-translator. A batch is sent as one request,
+    one text per line; if the lines don't come back one-for-one, the batch
+    is retried text by text.
+    """
+
+    name = "google"
+
+    def translate_batch(self, texts, source, target):
+        from deep_translator import GoogleTranslator
+
+        translator = GoogleTranslator(source=source, target=target)
+        try:
+            if len(texts) > 1:
+                lines = (translator.translate("\n".join(texts)) or "").split("\n")
+                if len(lines) == len(texts):
+                    return [line.strip() for line in lines]
+            return [translator.translate(text) or "" for text in texts]
+        except Exception as exc:
+            raise TranslationError(f"Google Translate failed: {exc}") from exc
+
+
+class HTTPBackend(TranslationBackend):
+    """A LibreTranslate-compatible server at ``options["url"]``."""
+
+    name = "http"
+
+    def translate_batch(self, texts, source, target):
+        url = self.options.get("url")
+        if not url:
+            raise TranslationError("Set CONTENT_TRANSLATION['OPTIONS']['url'] for the http backend.")
+        payload = {"q": texts, "source": source, "target": target, "format": "text"}
+        if self.options.get("api_key"):
+            payload["api_key"] = self.options["api_key"]
+        request = urllib.request.Request(
+            url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=float(self.options.get("timeout", 30))) as response:
+                translated = json.loads(response.read().decode("utf-8"))["translatedText"]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise TranslationError(f"Translation server failed: {exc}") from exc
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise TranslationError("Translation server returned the wrong number of texts.")
+        return translated
+
+
+def fake_translate(text, source, target):
+    return f"[{target}] {text}"
+
+
+class FakeBackend(TranslationBackend):
+    """Offline stand-in for tests and development: ``"[ur] <text>"``."""
+
+    name = "fake"
+
+    def translate_batch(self, texts, source, target):
+        return [fake_translate(text, source, target) for text in texts]
+
+
+def load_backend(name=None, options=None):
+    """Build the backend named ``name`` (a key of ``BACKENDS`` or a dotted path)."""
+    conf = getattr(settings, "CONTENT_TRANSLATION", {})
+    name = name or conf.get("BACKEND", "google")
+    path = BACKENDS.get(name, name)
+    module_name, _, class_name = path.rpartition(".")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**(conf.get("OPTIONS", {}) if options is None else options))
+
+
+# ---------------------------------------------------
+# TRANSLATION MEMORY
+# ---------------------------------------------------
+def normalize(text):
+    return unicodedata.normalize("NFC", " ".join((text or "").split()))
+
+
+def source_hash(normalized):
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def _get_slots():
+    """Process-wide cap on backend calls in flight."""
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                limit = getattr(settings, "CONTENT_TRANSLATION", {}).get("MAX_CONCURRENT", 2)
+                _slots = threading.BoundedSemaphore(max(1, int(limit)))
+    return _slots
+
+
+def _batches(texts, max_chars, max_items):
+    batch, size = [], 0
+    for text in texts:
+        if batch and (size + len(text) > max_chars or len(batch) >= max_items):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def lookup(texts, source, target):
+    """Translations already in memory, as ``{normalised text: translation}``."""
+    by_hash = {source_hash(t): t for t in texts}
+    found = {}
+    hashes = list(by_hash)
+    for i in range(0, len(hashes), _LOOKUP_CHUNK):
+        rows = TranslationMemory.objects.filter(
+            source_lang=source, target_lang=target, source_hash__in=hashes[i:i + _LOOKUP_CHUNK],
+        ).values_list("source_hash", "translated_text")
+        for digest, translated in rows:
+            found[by_hash[digest]] = translated
+    return found
+
+
+def translate_many(texts, source="en", target="ur", backend=None, stats=None):
+    """
+    Translate ``texts``, returning the translations in the same order
+    (empty texts translate to ""). Only texts not in the translation memory
+    reach the backend, each distinct text once. Batches that did translate
+    are remembered even if another fails; then ``TranslationError`` is raised.
+    """
+    conf = getattr(settings, "CONTENT_TRANSLATION", {})
+    normalized = [normalize(t) for t in texts]
+    unique = [t for t in dict.fromkeys(normalized) if t]
+    found = lookup(unique, source, target)
+    missing = [t for t in unique if t not in found]
+
+    stats = stats if stats is not None else {}
+    stats["cached"] = stats.get("cached", 0) + len(found)
+    stats["translated"] = stats.get("translated", 0)
+    stats["calls"] = stats.get("calls", 0)
+
+    if missing:
+        backend = backend or load_backend()
+        batches = list(_batches(missing, conf.get("BATCH_CHARS", 4500), conf.get("BATCH_SIZE", 50)))
+        slots = _get_slots()
+
+        def run(batch):
+            with slots:
+                try:
+                    return backend.translate_batch(batch, source, target)
+                except TranslationError:
+                    raise
+                except Exception as exc:
+                    # Backends should raise TranslationError; don't trust a plugged-in one to
+                    raise TranslationError(f"{backend.name or type(backend).__name__} backend failed: {exc}") from exc
+
+        errors = []
+        workers = max(1, min(len(batches), int(conf.get("MAX_CONCURRENT", 2))))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+            futures = [(batch, pool.submit(run, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    translated = future.result()
+                except TranslationError as exc:
+                    logger.warning("Translation batch of %d texts failed: %s", len(batch), exc)
+                    errors.append(str(exc))
+                    continue
+                stats["calls"] += 1
+                stats["translated"] += len(batch)
+                new = dict(zip(batch, translated))
+                found.update(new)
+                TranslationMemory.objects.bulk_create(
+                    [
+                        TranslationMemory(
+                            source_lang=source, target_lang=target, source_hash=source_hash(text),
+                            source_text=text, translated_text=result, backend=backend.name,
+                        )
+                        for text, result in new.items()
+                    ],
+                    batch_size=500,
+                    ignore_conflicts=True,
+                )
+        if errors:
+            raise TranslationError(errors[0])
+
+    return [found.get(t, "") if t else "" for t in normalized]
+
+
+def translate(text, source="en", target="ur", backend=None):
+    """Translate one text (see ``translate_many``)."""
+    return translate_many([text], source, target, backend=backend)[0]
+
+
+# ---------------------------------------------------
+# FAKE SERVER (tests / development)
+# ---------------------------------------------------
+class _FakeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            q = body["q"]
+            texts = q if isinstance(q, list) else [q]
+            translated = [fake_translate(t, body.get("source"), body.get("target")) for t in texts]
+        except (ValueError, KeyError, TypeError):
+            self.send_error(400)
+            return
+        self.server.requests += 1
+        data = json.dumps({"translatedText": translated if isinstance(q, list) else translated[0]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(data.encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server(host="127.0.0.1", port=0):
+    """
+    Serve the LibreTranslate API locally with ``fake_translate`` on a daemon
+    thread. Returns the server; its URL is ``f"http://{host}:{server.server_port}/translate"``
+    and ``server.requests`` counts the calls it answered.
+    """
+    server = ThreadingHTTPServer((host, port), _FakeHandler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, name="fake-translate", daemon=True).start()
+    return server
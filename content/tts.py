@@ -0,0 +1,195 @@
+# content/tts.py
+"""
+Text-to-speech for lesson chunks, configured by ``settings.CONTENT_TTS``:
+
+    CONTENT_TTS = {
+        "BACKEND": "gtts",      # "gtts", "fake", or a dotted path
+        "OPTIONS": {},          # passed to the backend's constructor
+        "WORKERS": 4,           # concurrent synthesis requests
+    }
+
+Audio files are named by a hash of (backend, language, text), so a text is
+synthesised once however many chunks share it and however often the
+pipeline runs; a chunk whose text changes gets a new file. English text
+goes to ``LessonChunk.audio_file``, the translation to
+``translated_audio_file``.
+"""
+
+import hashlib
+import io
+import importlib
+import logging
+import math
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import LessonChunk
+from .signals import touch_lessons
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    "gtts": "content.tts.GTTSBackend",
+    "fake": "content.tts.FakeTTSBackend",
+}
+
+# (text field, audio field, language)
+CHUNK_AUDIO = (
+    ("english_text", "audio_file", "en"),
+    ("translated_text", "translated_audio_file", "ur"),
+)
+
+
+class TTSError(Exception):
+    pass
+
+
+class TTSBackend:
+    """Base class. ``options`` comes from ``CONTENT_TTS["OPTIONS"]``."""
+
+    name = ""
+    extension = "mp3"
+
+    def __init__(self, **options):
+        self.options = options
+
+    def synthesize(self, text, lang):
+        """Return the audio for ``text`` in language ``lang`` as bytes."""
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's TTS via gTTS (needs network access)."""
+
+    name = "gtts"
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        buf = io.BytesIO()
+        try:
+            gTTS(text=text, lang=lang, **self.options).write_to_fp(buf)
+        except Exception as exc:
+            raise TTSError(f"gTTS failed: {exc}") from exc
+        return buf.getvalue()
+
+
+class FakeTTSBackend(TTSBackend):
+    """
+    Offline stand-in for tests and development: a WAV tone lasting
+    ``seconds_per_word`` (default 0.3) per word, pitched from a hash of the text.
+    """
+
+    name = "fake"
+    extension = "wav"
+    RATE = 16000
+
+    def synthesize(self, text, lang):
+        seconds = max(1, len(text.split())) * float(self.options.get("seconds_per_word", 0.3))
+        seed = hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).digest()
+        freq = 200 + seed[0] * 2
+        frames = bytearray()
+        for i in range(int(seconds * self.RATE)):
+            sample = int(8000 * math.sin(2 * math.pi * freq * i / self.RATE))
+            frames += sample.to_bytes(2, "little", signed=True)
+
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.RATE)
+            w.writeframes(bytes(frames))
+        return buf.getvalue()
+
+
+def load_backend(name=None, options=None):
+    """Build the backend named ``name`` (a key of ``BACKENDS`` or a dotted path)."""
+    conf = getattr(settings, "CONTENT_TTS", {})
+    name = name or conf.get("BACKEND", "gtts")
+    path = BACKENDS.get(name, name)
+    module_name, _, class_name = path.rpartition(".")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**(conf.get("OPTIONS", {}) if options is None else options))
+
+
+def audio_name(backend, upload_to, text, lang):
+    """Storage name for ``text`` spoken in ``lang`` by ``backend``."""
+    digest = hashlib.sha256(f"{backend.name}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+    return f"{upload_to.rstrip('/')}/tts/{digest}.{backend.extension}"
+
+
+def synthesize_to_storage(backend, text, lang, name):
+    """Write the audio to ``name`` unless a file is already there; returns the stored name."""
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, ContentFile(backend.synthesize(text, lang)))
+
+
+def generate_chunk_audio(chunks, backend=None, workers=None, overwrite=False):
+    """
+    Attach English and translated audio to ``chunks`` (a LessonChunk
+    queryset or list), synthesising each distinct text once on a pool of
+    ``workers`` threads. Chunks that already point at the file for their
+    current text are left alone unless ``overwrite``. Returns stats.
+    """
+    backend = backend or load_backend()
+    workers = workers or getattr(settings, "CONTENT_TTS", {}).get("WORKERS", 4)
+    stats = {"synthesized": 0, "reused": 0, "failed": 0, "chunks_updated": 0, "errors": []}
+
+    # Storage name -> (text, lang), and which chunk fields want it
+    jobs, wanted = {}, []
+    for chunk in chunks:
+        for text_field, audio_field, lang in CHUNK_AUDIO:
+            text = (getattr(chunk, text_field) or "").strip()
+            if not text:
+                continue
+            upload_to = LessonChunk._meta.get_field(audio_field).upload_to
+            name = audio_name(backend, upload_to, text, lang)
+            if getattr(chunk, audio_field).name == name and not overwrite:
+                continue
+            jobs[name] = (text, lang)
+            wanted.append((chunk, audio_field, name))
+
+    stored = {}
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="tts") as pool:
+            futures = {}
+            for name, (text, lang) in jobs.items():
+                if default_storage.exists(name) and not overwrite:
+                    stored[name] = name
+                    stats["reused"] += 1
+                else:
+                    if overwrite and default_storage.exists(name):
+                        default_storage.delete(name)
+                    futures[pool.submit(synthesize_to_storage, backend, text, lang, name)] = name
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    stored[name] = future.result()
+                    stats["synthesized"] += 1
+                except Exception as exc:
+                    stats["failed"] += 1
+                    stats["errors"].append(f"{name}: {exc}")
+                    logger.warning("Speech synthesis failed for %s: %s", name, exc)
+
+    changed = {}
+    now = timezone.now()
+    for chunk, audio_field, name in wanted:
+        if name in stored:
+            getattr(chunk, audio_field).name = stored[name]
+            chunk.updated_at = now
+            changed.setdefault(chunk.pk, chunk)
+    if changed:
+        LessonChunk.objects.bulk_update(
+            list(changed.values()),
+            [field for _, field, _ in CHUNK_AUDIO] + ["updated_at"],
+            batch_size=500,
+        )
+        touch_lessons({chunk.lesson_id for chunk in changed.values()})
+    stats["chunks_updated"] = len(changed)
+    return stats
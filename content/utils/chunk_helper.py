@@ -1,26 +1,139 @@
 # content/utils/chunk_helper.py
+"""
+Split a lesson's English text into ``LessonChunk`` rows, configured by
+``settings.CONTENT_CHUNKING``:
+
+    CONTENT_CHUNKING = {
+        "UNIT": "sentences",        # "sentences", "words" or "seconds"
+        "TARGET": 15,               # chunk size in UNITs
+        "WORDS_PER_SECOND": 2.5,    # reading pace used to estimate seconds
+    }
+
+Sentences are never split: a chunk holds whole sentences up to the target
+(and at least one, however long).
+
+Re-chunking is incremental. The new chunk texts are diffed against the
+lesson's existing chunks and only the difference is written, in one
+transaction: a chunk whose text is still there keeps its row (and with it
+its translation, audio, pronunciation attempts and grammar), at most
+getting a new ``order``. A changed text is a new row; rows whose text is
+gone are deleted, together with everything recorded against that text.
+"""
 
 import re
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
 from content.models import Lesson, LessonChunk
+from content.signals import touch_lessons
+
+UNITS = ("sentences", "words", "seconds")
+
+_SENTENCE_END = re.compile(r"[.!?][\"')\]}]*$")
+
+
+def split_sentences(text):
+    """Sentences of ``text``, whitespace collapsed; a line break also ends one."""
+    sentences = []
+    for line in (text or "").splitlines():
+        words = []
+        for word in line.split():
+            words.append(word)
+            if _SENTENCE_END.search(word):
+                sentences.append(" ".join(words))
+                words = []
+        if words:
+            sentences.append(" ".join(words))
+    return sentences
+
+
+def chunk_texts(text, unit=None, target=None):
+    """Group the sentences of ``text`` into chunk texts of about ``target`` ``unit``s."""
+    conf = getattr(settings, "CONTENT_CHUNKING", {})
+    unit = unit or conf.get("UNIT", "sentences")
+    target = target or conf.get("TARGET", 15)
+    if unit not in UNITS:
+        raise ValueError(f"Unknown chunk unit {unit!r}; expected one of {', '.join(UNITS)}.")
+    if target <= 0:
+        raise ValueError("Chunk target must be positive.")
 
-def chunk_lesson_text(lesson: Lesson, chunk_size: int = 15):
+    words_per_second = float(conf.get("WORDS_PER_SECOND", 2.5))
+    if unit == "sentences":
+        measure = lambda sentence: 1
+    elif unit == "words":
+        measure = lambda sentence: len(sentence.split())
+    else:
+        measure = lambda sentence: len(sentence.split()) / words_per_second
+
+    chunks, current, size = [], [], 0
+    for sentence in split_sentences(text):
+        n = measure(sentence)
+        if current and size + n > target:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += n
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_lesson_text(lesson: Lesson, chunk_size: int = None, unit: str = None):
     """
-    Splits a lesson's english_text into chunks of ~chunk_size sentences
-    and saves them as LessonChunk records.
-    
+    Bring ``lesson``'s chunks in line with its english_text, writing only
+    what changed (see the module docstring).
+
     Args:
         lesson (Lesson): The Lesson object to chunk.
-        chunk_size (int): Number of sentences per chunk (default 15).
+        chunk_size (int): Chunk size in ``unit``s (default CONTENT_CHUNKING["TARGET"]).
+        unit (str): "sentences", "words" or "seconds" (default CONTENT_CHUNKING["UNIT"]).
+
+    Returns:
+        dict: counts of chunks ``created``, ``updated`` (moved), ``deleted`` and ``unchanged``.
     """
-    # Split text into sentences using punctuation marks
-    sentences = re.split(r'(?<=[.!?]) +', lesson.english_text.strip())
-
-    # Group sentences into chunks
-    for i in range(0, len(sentences), chunk_size):
-        chunk_text = " ".join(sentences[i:i+chunk_size])
-        LessonChunk.objects.create(
-            lesson=lesson,
-            order=(i // chunk_size) + 1,
-            english_text=chunk_text,
-            urdu_translation="",  # add later in admin
-        )
\ No newline at end of file
+    texts = chunk_texts(lesson.english_text, unit=unit, target=chunk_size)
+    stats = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    with transaction.atomic():
+        # Serialise concurrent re-chunks of the same lesson
+        Lesson.objects.select_for_update().filter(pk=lesson.pk).values_list("pk").first()
+        existing = list(LessonChunk.objects.filter(lesson=lesson).order_by("order", "pk"))
+
+        by_text = defaultdict(deque)
+        for chunk in existing:
+            by_text[chunk.english_text].append(chunk)
+
+        # Keep every chunk whose text survives; the rest go
+        kept = [by_text[text].popleft() if by_text.get(text) else None for text in texts]
+        kept_pks = {chunk.pk for chunk in kept if chunk}
+        gone = [chunk.pk for chunk in existing if chunk.pk not in kept_pks]
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for order, (text, chunk) in enumerate(zip(texts, kept), start=1):
+            if chunk is None:
+                to_create.append(LessonChunk(
+                    lesson=lesson, order=order, english_text=text, translated_text="", updated_at=now,
+                ))
+            elif chunk.order != order:
+                chunk.order = order
+                chunk.updated_at = now
+                to_update.append(chunk)
+            else:
+                stats["unchanged"] += 1
+
+        if gone:
+            # Cascades to attempts and grammar recorded against the old text
+            LessonChunk.objects.filter(pk__in=gone).delete()
+        if to_update:
+            LessonChunk.objects.bulk_update(to_update, ["order", "updated_at"], batch_size=500)
+        if to_create:
+            LessonChunk.objects.bulk_create(to_create, batch_size=500)
+
+        stats["created"], stats["updated"], stats["deleted"] = len(to_create), len(to_update), len(gone)
+        if to_create or to_update or gone:
+            touch_lessons([lesson.pk])
+    return stats
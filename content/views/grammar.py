@@ -2,26 +2,21 @@
 # Grammar API + Template Views
 # ============================================================
 
-import spacy
+import logging
+
 from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from ..doc_cache import get_doc
+from ..grammar_cache import cached_grammar
+from ..grammar_rules import GrammarRuleError, get_rule_engine, rules_version
 from ..models import GrammarPoint, Lesson
+from ..nlp import NLPUnavailable, get_nlp
 from ..serializers import GrammarPointSerializer
 
-
-# ============================================================
-# spaCy Load (Once at Startup)
-# ============================================================
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-    SPACY_READY = True
-except Exception as e:
-    print("spaCy not available:", e)
-    SPACY_READY = False
+logger = logging.getLogger(__name__)
 
 
 # ============================================================
@@ -30,116 +25,17 @@ except Exception as e:
 
 def extract_advanced_grammar(text):
     """
-    Analyze text and extract grammar points using spaCy.
-    Returns a list of dictionaries with title, explanation, and example.
+    Analyze text and extract grammar points using spaCy and the rules in
+    ``settings.CONTENT_GRAMMAR_RULES`` (see content/grammar_rules.py).
+    Returns one dictionary per feature found: id, title, explanation,
+    example, examples and count.
     """
-    if not SPACY_READY:
+    try:
+        nlp = get_nlp()
+    except NLPUnavailable:
         return []
 
-    doc = nlp(text)
-    grammar_points = []
-
-    # ---------- Tense Detection ----------
-    for token in doc:
-        if token.tag_ in ["VBD", "VBN"]:
-            grammar_points.append({
-                "title": "Past Tense",
-                "explanation": "Verb forms showing past actions (VBD/VBN).",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-        if token.tag_ in ["VBP", "VBZ"]:
-            grammar_points.append({
-                "title": "Present Simple",
-                "explanation": "Verb forms showing present habitual actions.",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-        if token.tag_ == "VBG":
-            grammar_points.append({
-                "title": "Present Continuous",
-                "explanation": "Uses -ing verb forms to show ongoing actions.",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-    # ---------- Modal Verbs ----------
-    modals = {"can", "could", "will", "would", "shall", "should", "may", "might", "must"}
-    for token in doc:
-        if token.text.lower() in modals:
-            grammar_points.append({
-                "title": "Modal Verb",
-                "explanation": f"‘{token.text}’ is a modal verb expressing ability, permission, or probability.",
-                "example": token.sent.text.strip(),
-            })
-
-    # ---------- Passive Voice ----------
-    for token in doc:
-        if token.dep_ == "auxpass":
-            grammar_points.append({
-                "title": "Passive Voice",
-                "explanation": "Be + past participle structure focusing on the action, not the doer.",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-    # ---------- Conditionals ----------
-    for sent in doc.sents:
-        if "if" in sent.text.lower():
-            grammar_points.append({
-                "title": "Conditional Sentence",
-                "explanation": "A sentence showing a condition and result.",
-                "example": sent.text.strip(),
-            })
-
-    # ---------- Gerunds / Infinitives ----------
-    for token in doc:
-        if token.tag_ == "VBG" and token.dep_ == "xcomp":
-            grammar_points.append({
-                "title": "Gerund",
-                "explanation": "Verb ending in -ing used as a noun or complement.",
-                "example": token.sent.text.strip(),
-            })
-
-        if token.tag_ == "VB" and token.dep_ == "xcomp":
-            grammar_points.append({
-                "title": "Infinitive",
-                "explanation": "Base form of verb used after certain verbs.",
-                "example": token.sent.text.strip(),
-            })
-
-    # ---------- Direct Speech ----------
-    for sent in doc.sents:
-        if "\"" in sent.text or "'" in sent.text:
-            grammar_points.append({
-                "title": "Direct Speech",
-                "explanation": "Sentence contains quoted spoken words.",
-                "example": sent.text.strip(),
-            })
-
-    # ---------- Prepositions ----------
-    for token in doc:
-        if token.pos_ == "ADP":
-            grammar_points.append({
-                "title": "Preposition",
-                "explanation": f"‘{token.text}’ shows a relationship of place, time, or direction.",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-    # ---------- Articles ----------
-    for token in doc:
-        if token.text.lower() in ["a", "an", "the"]:
-            grammar_points.append({
-                "title": "Article",
-                "explanation": f"‘{token.text}’ is an article used before nouns.",
-                "example": token.sent.text.strip(),
-            })
-            break
-
-    return grammar_points
+    return get_rule_engine(nlp.vocab).extract(get_doc(text))
 
 
 # ============================================================
@@ -164,15 +60,25 @@ class GrammarPointViewSet(viewsets.ModelViewSet):
 class ExtractGrammar(APIView):
     """
     POST /api/content/lessons/<lesson_id>/extract-grammar/
-    Returns detected grammar features from the lesson text.
+    Returns detected grammar features from the lesson text, parsing it
+    only when the text (or the rules) changed since the last request.
     """
 
     def post(self, request, lesson_id):
-        if not SPACY_READY:
+        try:
+            version = rules_version()
+        except NLPUnavailable:
             return Response(
                 {"error": "spaCy model is not available on the server."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
+        except GrammarRuleError:
+            # Malformed CONTENT_GRAMMAR_RULES: a server setup problem, like a missing model
+            logger.exception("Could not load the grammar rules")
+            return Response(
+                {"error": "Grammar rules are misconfigured on the server."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
 
         lesson = get_object_or_404(Lesson, id=lesson_id)
 
@@ -182,7 +88,9 @@ class ExtractGrammar(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        grammar_points = extract_advanced_grammar(lesson.english_text)
+        grammar_points = cached_grammar(
+            lesson.pk, lesson.english_text, extract_advanced_grammar, version
+        )
 
         return Response(
             {
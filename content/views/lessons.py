@@ -1,28 +1,85 @@
 from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 
+from backend.conditional import ConditionalGetMixin
+
+from ..chunk_nav import chunk_page, prefetch_links
 from ..models import Lesson, Unit
-from ..serializers import LessonSerializer
+from ..serializers import LessonChunkSerializer, LessonSerializer
+
+
+def _next_chunk_links(next_chunk, page_url, request):
+    """Prefetch hints for the next chunk's page and audio."""
+    urls = [(page_url, "")] if page_url else []
+    for audio in (next_chunk.audio_file, next_chunk.translated_audio_file):
+        if audio:
+            urls.append((request.build_absolute_uri(audio.url), "audio"))
+    return prefetch_links(urls)
 
 
 # ============================================================
 # API VIEWSET
 # ============================================================
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD API endpoint for Lessons.
     Supports:
     - /api/content/lessons/
     - /api/content/units/<unit_id>/lessons/
+    - /api/content/lessons/<pk>/chunks/<order>/ (one chunk plus a preview of the next)
+    Lesson detail and chunks answer conditional GETs from ``Lesson.updated_at``.
     """
     serializer_class = LessonSerializer
 
+    def get_validators(self, request, *args, **kwargs):
+        if self.action not in ("retrieve", "chunk"):
+            return None
+        # Scoped like get_object(): a lesson outside a nested unit is a 404, not a 304
+        updated_at = (
+            self.get_queryset().filter(pk=kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return (kwargs["pk"], updated_at, kwargs.get("order")), updated_at
+
+    @action(detail=True, methods=["get"], url_path=r"chunks/(?P<order>[0-9]+)")
+    def chunk(self, request, pk=None, order=None, **kwargs):
+        """
+        The chunk at ``order`` with the lesson's chunk count, the previous
+        chunk's order and the next chunk embedded, so the player can show it
+        without another round trip. Constant-time in the lesson's length.
+        """
+        lesson = self.get_queryset().select_related(None).filter(pk=pk).only("pk", "updated_at").first()
+        if lesson is None:
+            raise NotFound()
+        page = chunk_page(lesson, int(order))
+        if page["chunk"] is None:
+            raise NotFound("This lesson has no chunks.")
+
+        context = self.get_serializer_context()
+        next_chunk = page["next_chunk"]
+        response = Response({
+            "lesson": lesson.pk,
+            "total": page["total"],
+            "previous": page["previous_order"],
+            "chunk": LessonChunkSerializer(page["chunk"], context=context).data,
+            "next": LessonChunkSerializer(next_chunk, context=context).data if next_chunk else None,
+        })
+        if next_chunk and (next_chunk.audio_file or next_chunk.translated_audio_file):
+            response["Link"] = _next_chunk_links(next_chunk, None, request)
+        return response
+
     def get_queryset(self):
         queryset = (
             Lesson.objects
             .select_related("unit")
-            .order_by("order", "id")
+            .order_by("number", "id")
         )
 
         unit_id = self.kwargs.get("unit_id")
@@ -56,34 +113,37 @@ def content_lesson_list(request, student_id, unit_id):
 
 
 def content_lesson_detail(request, student_id, lesson_id):
+    """
+    One chunk of the lesson, chosen by ``?chunk=<order>``. Only that chunk
+    and its neighbours are read (see content/chunk_nav.py); the next chunk's
+    page and audio are sent as prefetch hints.
+    """
     lesson = get_object_or_404(
-        Lesson.objects.prefetch_related("chunks"),
+        Lesson.objects.only("id", "title", "number", "unit_id", "updated_at"),
         id=lesson_id
     )
 
-    chunks = list(lesson.chunks.all().order_by("order", "id"))
-    total_chunks = len(chunks)
-
     try:
-        current_idx = int(request.GET.get("chunk", 1))
+        order = int(request.GET.get("chunk", 1))
     except ValueError:
-        current_idx = 1
+        order = 1
 
-    if total_chunks > 0:
-        current_idx = max(1, min(current_idx, total_chunks))
-        current_chunk = chunks[current_idx - 1]
-    else:
-        current_idx = 0
-        current_chunk = None
+    page = chunk_page(lesson, order)
+    chunk, next_chunk = page["chunk"], page["next_chunk"]
 
-    return render(
+    response = render(
         request,
         "content/lesson_detail.html",
         {
             "lesson": lesson,
-            "chunk": current_chunk,
+            "chunk": chunk,
             "student_id": student_id,
-            "total_chunks": total_chunks,
-            "current_chunk": current_idx,
+            "total_chunks": page["total"],
+            "current_chunk": chunk.order if chunk else 0,
+            "previous_order": page["previous_order"],
+            "next_chunk": next_chunk,
         },
     )
+    if next_chunk:
+        response["Link"] = _next_chunk_links(next_chunk, f"{request.path}?chunk={next_chunk.order}", request)
+    return response
@@ -0,0 +1,136 @@
+# reading/alignment.py
+"""
+Word-level global alignment between an expected text and a spoken transcript.
+
+Banded Needleman-Wunsch: every row of the DP matrix only keeps a window of
+``2 * band + 1`` cells, re-centred on the best cell of the previous row, so the
+alignment follows the reader through skipped or repeated passages while the
+work stays O(n * band) and the memory O(n + m) (one byte of traceback per
+banded cell plus two score rows).
+"""
+
+from array import array
+
+# Op codes used in the traceback matrix and in the returned alignment
+MATCH = "match"
+SUBSTITUTION = "substitution"
+INSERTION = "insertion"   # word heard that is not in the expected text
+DELETION = "deletion"     # expected word that was never heard
+
+DEFAULT_BAND = 32
+
+_INF = float("inf")
+
+_DIAG_MATCH = 1
+_DIAG_SUB = 2
+_UP = 3
+_LEFT = 4
+
+
+def align_words(expected, spoken, is_match, band=DEFAULT_BAND, open_end=False):
+    """
+    Align two token lists and return the edit script.
+
+    Args:
+        expected (list[str]): Expected tokens (already normalised).
+        spoken (list[str]): Spoken tokens (already normalised).
+        is_match (callable): ``is_match(i, j)`` -> True when expected[i]
+            and spoken[j] should count as the same word.
+        band (int): Half-width of the DP band, in words.
+        open_end (bool): Let the alignment stop before the end of
+            ``expected`` (the reader hasn't got there yet). Unread expected
+            words are then left out of the result instead of reported as
+            deletions.
+
+    Returns:
+        list[tuple]: ``(op, i, j)`` in reading order, where ``i`` indexes
+        ``expected`` and ``j`` indexes ``spoken``. ``i`` is None for
+        insertions and ``j`` is None for deletions.
+    """
+    n, m = len(expected), len(spoken)
+    band = max(1, int(band))
+    width = 2 * band + 1
+
+    lows = array("l", [0]) * (n + 1)
+    dirs = bytearray((n + 1) * width)
+
+    # Row 0: only insertions are possible
+    prev = [_INF] * width
+    for k in range(min(width, m + 1)):
+        prev[k] = k
+        dirs[k] = _LEFT
+    prev_lo = 0
+
+    # Best place to stop on the last spoken column (open_end only)
+    end_score, end_i = (prev[m], 0) if m < width else (_INF, 0)
+
+    for i in range(1, n + 1):
+        # Re-centre the band one column right of the previous row's best cell
+        best_k = min(range(width), key=prev.__getitem__)
+        lo = max(prev_lo, prev_lo + best_k + 1 - band)
+        lo = min(lo, m)
+        lows[i] = lo
+
+        cur = [_INF] * width
+        base = i * width
+        for k in range(width):
+            j = lo + k
+            if j > m:
+                break
+
+            best = _INF
+            step = 0
+
+            # Diagonal: expected[i-1] aligned with spoken[j-1]
+            pk = j - 1 - prev_lo
+            if j > 0 and 0 <= pk < width and prev[pk] < _INF:
+                if is_match(i - 1, j - 1):
+                    best, step = prev[pk], _DIAG_MATCH
+                else:
+                    best, step = prev[pk] + 1, _DIAG_SUB
+
+            # Up: expected[i-1] skipped
+            pk = j - prev_lo
+            if 0 <= pk < width and prev[pk] + 1 < best:
+                best, step = prev[pk] + 1, _UP
+
+            # Left: spoken[j-1] is an extra word
+            if k > 0 and cur[k - 1] + 1 < best:
+                best, step = cur[k - 1] + 1, _LEFT
+
+            cur[k] = best
+            dirs[base + k] = step
+
+        if open_end and m - lo < width and cur[m - lo] <= end_score:
+            end_score, end_i = cur[m - lo], i
+
+        prev, prev_lo = cur, lo
+
+    if open_end and end_score < _INF:
+        i, j = end_i, m
+    else:
+        # Finish on the last row; anything heard past the band is an insertion
+        end_k = min(
+            (k for k in range(width) if prev[k] < _INF and prev_lo + k <= m),
+            key=lambda k: prev[k] + (m - prev_lo - k),
+        )
+        i, j = n, prev_lo + end_k
+
+    ops = [(INSERTION, None, jj) for jj in range(m - 1, j - 1, -1)]
+    while i > 0 or j > 0:
+        step = dirs[i * width + (j - lows[i])]
+        if step == _DIAG_MATCH:
+            i, j = i - 1, j - 1
+            ops.append((MATCH, i, j))
+        elif step == _DIAG_SUB:
+            i, j = i - 1, j - 1
+            ops.append((SUBSTITUTION, i, j))
+        elif step == _UP:
+            i -= 1
+            ops.append((DELETION, i, None))
+        else:
+            j -= 1
+            ops.append((INSERTION, None, j))
+
+    ops.reverse()
+    return ops
@@ -6,7 +6,11 @@ from .api_views import (
     ReadingLessonDetailAPIView,
     TextFeedbackAPIView,
     AudioFeedbackAPIView,
+    MispronunciationHeatmapAPIView,
+    RecognitionStatsAPIView,
+    ScoringCacheStatsAPIView,
 )
+from .views_feedback import feedback_batch_view
 
 urlpatterns = [
     # Lessons list
@@ -18,6 +22,18 @@ urlpatterns = [
     # Text feedback (DRF APIView, CSRF handled automatically)
     path("feedback/", TextFeedbackAPIView.as_view(), name="text-feedback"),
 
-    # Audio feedback (stub endpoint)
+    # Batch scoring: many transcripts against one lesson
+    path("feedback/batch/", feedback_batch_view, name="text-feedback-batch"),
+
+    # Audio fluency analysis (multipart upload)
     path("audio-feedback/", AudioFeedbackAPIView.as_view(), name="audio-feedback"),
+
+    # Most mispronounced words per lesson or per student
+    path("heatmap/", MispronunciationHeatmapAPIView.as_view(), name="mispronunciation-heatmap"),
+
+    # Scoring memo hit/miss counters (per process)
+    path("scoring/cache/", ScoringCacheStatsAPIView.as_view(), name="scoring-cache-stats"),
+
+    # Speech recogniser pool queue depth and latencies (per process)
+    path("recognition/stats/", RecognitionStatsAPIView.as_view(), name="recognition-stats"),
 ]
\ No newline at end of file
@@ -3,24 +3,33 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
 
+from .audio import AudioError
+from .audio_pool import AudioBusy, AudioTimeout, BoundedTemporaryFileUploadHandler, analyze_upload
+from .mispronunciations import DEFAULT_TOP_K, MAX_TOP_K, top_words_for_lesson, top_words_for_user
 from .models import ReadingLesson
+from .recognition import RecognizerBusy, RecognizerError, RecognizerTimeout, get_recognizer_pool
+from .scoring import get_engine, tokenize
 from .serializers import ReadingLessonSerializer
+from .views import ReadingLessonConditionalMixin, ReadingLessonListView
+from .views_feedback import score_feedback_request
 
 
 # ---------------------------------------------------
 # LESSON LIST & DETAIL
 # ---------------------------------------------------
-class ReadingLessonListAPIView(APIView):
-    """Return a list of all reading lessons."""
-    def get(self, request):
-        lessons = ReadingLesson.objects.all()
-        serializer = ReadingLessonSerializer(lessons, many=True)
-        return Response(serializer.data)
+class ReadingLessonListAPIView(ReadingLessonListView):
+    """
+    Return reading lesson summaries, a cursor page at a time:
+    {"next": url|null, "previous": url|null, "results": [{id, title, unit, order}]}
+    Filter with ?unit=<id> or ?book=<id>; the text is on the detail endpoint.
+    """
 
 
-class ReadingLessonDetailAPIView(APIView):
-    """Return details of a single lesson by ID."""
+class ReadingLessonDetailAPIView(ReadingLessonConditionalMixin, APIView):
+    """Return details of a single lesson by ID (answers conditional GETs)."""
     def get(self, request, pk):
         try:
             lesson = ReadingLesson.objects.get(pk=pk)
@@ -40,16 +49,17 @@ class TextFeedbackAPIView(APIView):
     """
     Accepts JSON payload:
     {
-        "expected": "...",
+        "expected": "...",      # optional when lesson_id is given
         "spoken": "...",
         "lesson_id": 3
     }
-    Returns score, feedback, and mispronounced words.
+    Returns score, feedback, mispronounced words and the attempt id,
+    using the shared scoring engine (see reading/scoring.py).
     """
 
     def post(self, request):
         data = request.data
-        spoken = data.get("spoken", "").strip()
+        spoken = (data.get("spoken", "") or "").strip()
 
         if not spoken:
             return Response(
@@ -57,23 +67,8 @@ class TextFeedbackAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Placeholder scoring logic
-        score = 70
-        feedback = "Good attempt! Keep practicing."
-
-        # Simulated mispronounced words for frontend highlighting
-        simulated_mispronounced = [
-            {"word": "attempt", "offset": 10, "duration": 500},
-            {"word": "practicing", "offset": 30, "duration": 800},
-        ]
-
         return Response(
-            {
-                "score": score,
-                "feedback": feedback,
-                "mispronounced": simulated_mispronounced,
-                "attempt_id": None,
-            },
+            score_feedback_request(data, request.user),
             status=status.HTTP_200_OK
         )
 
@@ -82,9 +77,143 @@ class TextFeedbackAPIView(APIView):
 # AUDIO FEEDBACK
 # ---------------------------------------------------
 class AudioFeedbackAPIView(APIView):
-    """Stub endpoint for audio feedback (not yet implemented)."""
+    """
+    Accepts multipart/form-data:
+        audio      WAV (or WebM/Ogg when ffmpeg is installed)
+        spoken     optional transcript from the browser; without it the
+                   server recogniser (READING_RECOGNIZER) transcribes the audio
+        lesson_id  optional, used for the pronunciation score
+    Returns fluency metrics: voiced segments, pauses, speaking rate and
+    loudness, measured after trimming leading/trailing silence; and, when a
+    transcript is available, the same pronunciation score as
+    TextFeedbackAPIView.
+    """
+    parser_classes = [MultiPartParser]
+
     def post(self, request):
-        return Response(
-            {"error": "Audio processing temporarily disabled. Use text feedback only for now."},
-            status=status.HTTP_501_NOT_IMPLEMENTED
-        )
\ No newline at end of file
+        # Must be in place before request.data is first read
+        upload = BoundedTemporaryFileUploadHandler(request)
+        request.upload_handlers = [upload]
+
+        audio_file = request.FILES.get("audio")
+        if upload.too_large:
+            return Response(
+                {"error": f"Audio upload is larger than {upload.max_bytes} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        if audio_file is None:
+            return Response(
+                {"error": "No 'audio' file received."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        path = audio_file.temporary_file_path()
+        spoken = (request.data.get("spoken", "") or "").strip()
+        source = "client"
+        recognizer = None if spoken else get_recognizer_pool()
+        try:
+            if recognizer is not None:
+                spoken, source = recognizer.transcribe(path).strip(), "server"
+            metrics = analyze_upload(path, word_count=len(tokenize(spoken)) or None)
+        except AudioError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        except (AudioBusy, RecognizerBusy):
+            return Response(
+                {"error": "Audio analysis is busy, please retry shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "5"},
+            )
+        except (AudioTimeout, RecognizerTimeout):
+            return Response(
+                {"error": "Audio analysis took too long."},
+                status=status.HTTP_504_GATEWAY_TIMEOUT
+            )
+        except RecognizerError:
+            return Response(
+                {"error": "Could not transcribe the recording."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        result = {"fluency": metrics}
+        if spoken:
+            data = {
+                "spoken": spoken,
+                "expected": request.data.get("expected", ""),
+                "lesson_id": request.data.get("lesson_id"),
+            }
+            result["transcript"] = {"text": spoken, "source": source}
+            result["pronunciation"] = score_feedback_request(data, request.user)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+# ---------------------------------------------------
+# MISPRONUNCIATION HEATMAP
+# ---------------------------------------------------
+class MispronunciationHeatmapAPIView(APIView):
+    """
+    Top-k mispronounced words.
+
+    ?lesson_id=<id>            -> across all students of the lesson
+    ?student=<id|me>[&lesson_id=<id>] -> one student (staff, or yourself)
+    &k=<n>                     -> how many words (default 20, max 200)
+    """
+    def get(self, request):
+        params = request.query_params
+        try:
+            k = min(MAX_TOP_K, max(1, int(params.get("k", DEFAULT_TOP_K))))
+            lesson_id = int(params["lesson_id"]) if params.get("lesson_id") else None
+        except ValueError:
+            return Response(
+                {"error": "'k' and 'lesson_id' must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        student = params.get("student")
+        if student:
+            if not request.user.is_authenticated:
+                return Response(
+                    {"error": "Authentication required."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            user_id = request.user.pk if student == "me" else student
+            if str(user_id) != str(request.user.pk) and not request.user.is_staff:
+                return Response(
+                    {"error": "You can only view your own heatmap."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            try:
+                words = top_words_for_user(int(user_id), k, lesson_id)
+            except ValueError:
+                return Response(
+                    {"error": "'student' must be a user id or 'me'."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response({"student": int(user_id), "lesson_id": lesson_id, "words": words})
+
+        if lesson_id is None:
+            return Response(
+                {"error": "Provide 'lesson_id' or 'student'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({"lesson_id": lesson_id, "words": top_words_for_lesson(lesson_id, k)})
+
+
+# ---------------------------------------------------
+# MONITORING
+# ---------------------------------------------------
+class ScoringCacheStatsAPIView(APIView):
+    """Hit/miss counters of this process's scoring memos."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        engine = get_engine()
+        return Response({"version": engine.version, "caches": engine.cache_stats()})
+
+
+class RecognitionStatsAPIView(APIView):
+    """Queue depth, counters and latencies of this process's recogniser pool."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        pool = get_recognizer_pool()
+        return Response(pool.stats() if pool is not None else {"engine": None})
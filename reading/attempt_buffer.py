@@ -0,0 +1,425 @@
+# reading/attempt_buffer.py
+"""
+Write-behind buffer for PronunciationAttempt rows.
+
+Scoring requests only append the attempt to an in-memory batch and to a
+per-process journal file, then return. A background thread writes the
+batch with a single ``bulk_create`` once it reaches
+``READING_ATTEMPT_BATCH_SIZE`` rows or is older than
+``READING_ATTEMPT_FLUSH_SECONDS``, so a classroom submitting at once takes
+one SQLite write lock per batch instead of one per student, and no request
+waits for it.
+
+Durability: every attempt is in the journal before the request returns.
+A flush moves the journal aside (``*.flushing.jsonl``) and deletes it only
+after the batch commits; a segment whose write fails is kept and retried.
+``uid`` is unique, so writing rows that did make it again is harmless.
+After ``max_attempts`` failures the segment's records are written one at a
+time, and those that still fail are moved to ``dead_letter/`` under the
+journal directory (same JSON lines format) instead of being retried forever.
+
+Journal files belong to an owner token (pid plus a random suffix, so a
+reused pid never shares files with a dead process). The owner holds an
+exclusive ``flock`` on ``attempts-<owner>.lock`` for its lifetime, which the
+kernel releases when the process dies. Files whose owner's lock can be
+taken are orphans: a new buffer adopts them as segments to retry, and
+``replay_journal()`` (``manage.py replay_attempt_journal``) writes them.
+Files of a live owner, including segments it is flushing, are never touched.
+
+Each batch also writes the attempts' ``Mispronunciation`` rows and lesson
+word-error counters, in the same transaction.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to checking the owner's pid
+    fcntl = None
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .mispronunciations import record_mispronunciations
+from .models import PronunciationAttempt, ReadingLesson, StoredText
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = (
+    "user_id", "lesson_id", "expected", "spoken", "score", "mispronounced", "feedback",
+    "algorithm_version",
+)
+
+
+def _journal_dir():
+    return Path(getattr(
+        settings,
+        "READING_ATTEMPT_JOURNAL_DIR",
+        Path(settings.BASE_DIR) / "var" / "attempt_journal",
+    ))
+
+
+def _to_instances(records):
+    """Build model instances, dropping lesson links that no longer exist."""
+    text_ids = StoredText.intern_many(r.get("expected") for r in records)
+    lesson_ids = {r["lesson_id"] for r in records if r.get("lesson_id")}
+    existing = set(
+        ReadingLesson.objects.filter(pk__in=lesson_ids).values_list("pk", flat=True)
+    ) if lesson_ids else set()
+
+    objs = []
+    for r in records:
+        fields = {name: r.get(name) for name in _FIELDS if name != "expected"}
+        fields["expected_text_id"] = text_ids[StoredText.digest_for(r.get("expected"))]
+        if fields["lesson_id"] not in existing:
+            fields["lesson_id"] = None
+        fields["mispronounced"] = fields["mispronounced"] or []
+        fields["feedback"] = fields["feedback"] or ""
+        fields["algorithm_version"] = fields["algorithm_version"] or ""
+        objs.append(PronunciationAttempt(
+            uid=uuid.UUID(r["uid"]),
+            created_at=parse_datetime(r["created_at"]),
+            **fields,
+        ))
+    return objs
+
+
+def _existing_uids(uids):
+    found = {}
+    for start in range(0, len(uids), 500):
+        found.update(
+            PronunciationAttempt.objects.filter(uid__in=uids[start:start + 500])
+            .values_list("uid", "pk")
+        )
+    return found
+
+
+def _write(records):
+    with transaction.atomic():
+        objs = _to_instances(records)
+        # Replays may carry rows that are already in; those keep their child rows
+        seen = _existing_uids([o.uid for o in objs])
+        new = [o for o in objs if o.uid not in seen]
+        PronunciationAttempt.objects.bulk_create(new, batch_size=500, ignore_conflicts=True)
+
+        pks = _existing_uids([o.uid for o in new])
+        for o in new:
+            o.pk = pks.get(o.uid)
+        record_mispronunciations([o for o in new if o.pk is not None])
+
+
+def _read_journal(path):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Torn last line from a crash mid-write; everything before it is intact
+                logger.warning("Skipping unreadable journal line in %s", path)
+    return records
+
+
+class AttemptBuffer:
+    # Seconds between retries of a segment whose write failed
+    retry_delay = 30.0
+    # Failed writes of a segment before its unwritable records are set aside
+    max_attempts = 5
+
+    def __init__(self, journal_dir, max_size=50, max_delay=2.0):
+        self.journal_dir = Path(journal_dir)
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._oldest = None
+        self._journal = None
+        self._seq = 0
+        self._timer = None
+        self._wake = threading.Event()
+
+        self.owner = None
+        self._owner_pid = None
+        self._owner_lock = None
+        # (segment path, records or None to read it back, failures) still to be written
+        self._segments = []
+        self._retry_at = 0.0
+
+    # ---------------------------------------------------
+    # Public API
+    # ---------------------------------------------------
+    def add(self, **fields):
+        """
+        Queue one attempt and return its pre-allocated ``uid``.
+        Accepts the PronunciationAttempt fields listed in ``_FIELDS``.
+        """
+        record = {name: fields.get(name) for name in _FIELDS}
+        record["uid"] = str(uuid.uuid4())
+        record["created_at"] = timezone.now().isoformat()
+
+        with self._lock:
+            self._journal_file().write(json.dumps(record) + "\n")
+            self._journal.flush()
+            self._pending.append(record)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._pending) >= self.max_size:
+                self._wake.set()
+            self._ensure_timer()
+        return record["uid"]
+
+    def flush(self):
+        """
+        Write everything queued so far, and retry segments that failed
+        before. Returns the number of attempts written. Safe to call from any thread.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._pending:
+                    batch, self._pending, self._oldest = self._pending, [], None
+                    self._segments.append((self._rotate_journal(), batch, 0))
+                segments, self._segments = self._segments, []
+
+            written, failed = 0, []
+            for path, records, failures in segments:
+                if records is None:
+                    records = _read_journal(path) if path.exists() else []
+                try:
+                    if records:
+                        _write(records)
+                except Exception:
+                    failures += 1
+                    logger.exception(
+                        "Failed to flush %d pronunciation attempts (attempt %d of %d)",
+                        len(records), failures, self.max_attempts,
+                    )
+                    if failures < self.max_attempts:
+                        # Keep the segment on disk and try again later
+                        failed.append((path, None, failures))
+                        continue
+                    written += self._set_aside(path, records)
+                else:
+                    written += len(records)
+                path.unlink(missing_ok=True)
+
+            if failed:
+                with self._lock:
+                    self._segments[:0] = failed
+                    self._retry_at = time.monotonic() + self.retry_delay
+            return written
+
+    # ---------------------------------------------------
+    # Internals
+    # ---------------------------------------------------
+    def _set_aside(self, path, records):
+        """
+        Write ``records`` one by one, moving those that fail to the
+        dead-letter file. Returns the number written.
+        """
+        dead = []
+        for record in records:
+            try:
+                _write([record])
+            except Exception:
+                dead.append(record)
+        if dead:
+            dead_dir = self.journal_dir / "dead_letter"
+            dead_dir.mkdir(parents=True, exist_ok=True)
+            with open(dead_dir / path.name, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in dead)
+                f.flush()
+                os.fsync(f.fileno())
+            logger.error(
+                "Gave up on %d pronunciation attempts after %d tries; moved to %s",
+                len(dead), self.max_attempts, dead_dir / path.name,
+            )
+        return len(records) - len(dead)
+
+    def _journal_path(self):
+        return self.journal_dir / f"attempts-{self.owner}.jsonl"
+
+    def _journal_file(self):
+        if self._owner_pid != os.getpid():
+            self._start_owner()
+        if self._journal is None:
+            self._journal = open(self._journal_path(), "a", encoding="utf-8")
+        return self._journal
+
+    def _start_owner(self):
+        """
+        Take a fresh owner token and its lock (again after a fork), then
+        adopt journal files left by dead owners.
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self._journal = None
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self._owner_pid = os.getpid()
+        self._owner_lock = _hold_lock(self.journal_dir / f"attempts-{self.owner}.lock")
+
+        for _, paths in _dead_owners(self.journal_dir, exclude=self.owner):
+            for path in paths:
+                claimed = self._segment_path()
+                try:
+                    os.replace(path, claimed)
+                except FileNotFoundError:
+                    continue
+                self._segments.append((claimed, None, 0))
+                logger.info("Adopted orphaned attempt journal %s as %s", path.name, claimed.name)
+
+    def _segment_path(self):
+        self._seq += 1
+        return self.journal_dir / f"attempts-{self.owner}.{self._seq}.flushing.jsonl"
+
+    def _rotate_journal(self):
+        """Move the live journal aside for the batch being flushed."""
+        self._journal.close()
+        self._journal = None
+        flushing = self._segment_path()
+        os.replace(self._journal_path(), flushing)
+        return flushing
+
+    def _ensure_timer(self):
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Thread(
+                target=self._run_timer, name="attempt-buffer", daemon=True
+            )
+            self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            # Woken early by add() when the batch is full
+            self._wake.wait(self.max_delay / 2)
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = (
+                    len(self._pending) >= self.max_size
+                    or (self._oldest is not None and now - self._oldest >= self.max_delay)
+                    or (self._segments and now >= self._retry_at)
+                )
+            if due:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Attempt buffer flush failed")
+
+
+# ---------------------------------------------------
+# Journal ownership
+# ---------------------------------------------------
+def _owner_of(path):
+    """``attempts-<owner>.jsonl`` / ``.<seq>.flushing.jsonl`` / ``.lock`` -> owner."""
+    return path.name[len("attempts-"):].split(".", 1)[0]
+
+
+def _hold_lock(path):
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return fd
+
+
+def _try_lock(journal_dir, owner):
+    """
+    Take a journal owner's lock if the owner is gone: returns the lock's fd,
+    None if there is no lock file (nothing to hold), or False if the owner
+    is alive.
+    """
+    if fcntl is None:
+        pid = owner.split("-", 1)[0]
+        return False if pid.isdigit() and _pid_alive(int(pid)) else None
+    try:
+        fd = os.open(journal_dir / f"attempts-{owner}.lock", os.O_RDWR)
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    return fd
+
+
+def _dead_owners(journal_dir, exclude=None):
+    """
+    Yield ``(owner, journal paths)`` for every owner that is gone, holding
+    its lock while the caller deals with the files; the lock file is
+    removed afterwards.
+    """
+    owners = sorted({_owner_of(p) for p in journal_dir.glob("attempts-*")} - {exclude})
+    for owner in owners:
+        fd = _try_lock(journal_dir, owner)
+        if fd is False:
+            continue
+        try:
+            # Listed under the lock: a dead owner's files can't change any more
+            yield owner, sorted(journal_dir.glob(f"attempts-{owner}.*jsonl"))
+        finally:
+            if fd is not None:
+                (journal_dir / f"attempts-{owner}.lock").unlink(missing_ok=True)
+                os.close(fd)
+
+
+def replay_journal(journal_dir=None):
+    """
+    Insert attempts left in journal files by processes that are gone.
+    Journals of live processes are skipped, segments they are flushing
+    included. Returns the number of records replayed.
+    """
+    journal_dir = Path(journal_dir or _journal_dir())
+    if not journal_dir.exists():
+        return 0
+
+    own = _buffer.owner if _buffer is not None else None
+    replayed = 0
+    for _, paths in _dead_owners(journal_dir, exclude=own):
+        for path in paths:
+            records = _read_journal(path)
+            if records:
+                _write(records)
+            path.unlink()
+            replayed += len(records)
+    return replayed
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_attempt_buffer():
+    """Process-wide buffer, configured from settings on first use."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AttemptBuffer(
+                    _journal_dir(),
+                    max_size=getattr(settings, "READING_ATTEMPT_BATCH_SIZE", 50),
+                    max_delay=getattr(settings, "READING_ATTEMPT_FLUSH_SECONDS", 2.0),
+                )
+                atexit.register(_buffer.flush)
+    return _buffer
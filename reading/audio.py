@@ -0,0 +1,265 @@
+# reading/audio.py
+"""
+Fluency metrics for a recorded reading.
+
+Runs inside the audio worker processes (see ``audio_pool``), so it only
+depends on NumPy and the standard library. The recording is never loaded
+whole: WAV data is memory-mapped where it lies in the upload's temporary
+file, other containers (WebM/Ogg from MediaRecorder) are decoded by ffmpeg
+to a raw PCM file that is mapped the same way, and frame energies are
+computed a block at a time.
+
+Pipeline: decode -> 20 ms frame RMS -> energy VAD -> trim leading/trailing
+silence -> pauses, speaking rate and loudness over the trimmed span.
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+
+import numpy as np
+
+FRAME_SECONDS = 0.02
+MIN_SEGMENT_SECONDS = 0.06    # shorter voiced blips are clicks, not speech
+MIN_PAUSE_SECONDS = 0.25      # shorter gaps are within-phrase, not pauses
+LONG_PAUSE_SECONDS = 1.0
+VAD_FLOOR_DB = -50.0          # never call anything quieter than this speech
+VAD_MARGIN_DB = 12.0          # speech is this much above the noise floor
+
+DECODE_RATE = 16000
+# Samples per block when computing frame energies; bounds the float temporaries
+_BLOCK_FRAMES = 4096
+
+_WAV_PCM = 1
+_WAV_FLOAT = 3
+_WAV_EXTENSIBLE = 0xFFFE
+
+
+class AudioError(ValueError):
+    """The upload is not audio we can decode."""
+
+
+# ---------------------------------------------------
+# DECODING
+# ---------------------------------------------------
+def _wav_layout(path):
+    """Return (channels, rate, dtype, data_offset, frames) of a PCM/float WAV."""
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise AudioError("WAV file has no data chunk.")
+            cid, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if cid == b"fmt ":
+                body = f.read(size)
+                if len(body) < 16:
+                    raise AudioError("WAV format chunk is truncated.")
+                tag, channels, rate = struct.unpack("<HHI", body[:8])
+                bits = struct.unpack("<H", body[14:16])[0]
+                if tag == _WAV_EXTENSIBLE:
+                    if len(body) < 26:
+                        raise AudioError("WAV format chunk is truncated.")
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif cid == b"data":
+                if fmt is None:
+                    raise AudioError("WAV data chunk before its format chunk.")
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+    tag, channels, rate, bits = fmt
+    dtypes = {(_WAV_PCM, 8): "u1", (_WAV_PCM, 16): "<i2", (_WAV_PCM, 32): "<i4", (_WAV_FLOAT, 32): "<f4"}
+    dtype = dtypes.get((tag, bits))
+    if dtype is None or not channels or not rate:
+        return None  # unusual encoding; let ffmpeg convert it
+
+    available = os.path.getsize(path) - offset
+    frames = min(size, available) // (channels * (bits // 8))
+    return channels, rate, np.dtype(dtype), offset, frames
+
+
+def _ffmpeg_to_pcm(path, out_path):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise AudioError("Only WAV is supported on this server (ffmpeg is not installed).")
+    proc = subprocess.run(
+        [ffmpeg, "-nostdin", "-v", "error", "-y", "-i", path,
+         "-ac", "1", "-ar", str(DECODE_RATE), "-f", "s16le", out_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise AudioError("Could not decode audio: " + proc.stderr.decode(errors="replace")[-200:])
+
+
+class PCM:
+    """
+    Memory-mapped samples of a recording, shape (frames, channels).
+    Use as a context manager; decoded temp files are removed on exit.
+    """
+
+    def __init__(self, path):
+        self._tmp = None
+        layout = _wav_layout(path)
+        if layout is None:
+            fd, self._tmp = tempfile.mkstemp(suffix=".pcm")
+            os.close(fd)
+            _ffmpeg_to_pcm(path, self._tmp)
+            frames = os.path.getsize(self._tmp) // 2
+            layout = (1, DECODE_RATE, np.dtype("<i2"), 0, frames)
+            path = self._tmp
+
+        self.channels, self.rate, self.dtype, offset, frames = layout
+        if frames <= 0:
+            self.samples = np.zeros((0, self.channels), dtype=self.dtype)
+        else:
+            self.samples = np.memmap(
+                path, dtype=self.dtype, mode="r", offset=offset, shape=(frames, self.channels)
+            )
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.rate
+
+    def full_scale(self):
+        if self.dtype.kind == "f":
+            return 1.0
+        if self.dtype.kind == "u":
+            return float(2 ** (8 * self.dtype.itemsize - 1))
+        return float(np.iinfo(self.dtype).max + 1)
+
+    def close(self):
+        self.samples = None
+        if self._tmp:
+            try:
+                os.unlink(self._tmp)
+            except OSError:
+                pass
+            self._tmp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------
+# METRICS
+# ---------------------------------------------------
+def frame_levels(pcm, frame_seconds=FRAME_SECONDS):
+    """RMS level of each frame in dBFS (channels mixed down), one block at a time."""
+    hop = max(1, int(round(pcm.rate * frame_seconds)))
+    n_frames = len(pcm.samples) // hop
+    levels = np.empty(n_frames, dtype=np.float32)
+    scale = pcm.full_scale()
+    offset = scale if pcm.dtype.kind == "u" else 0.0
+
+    for f0 in range(0, n_frames, _BLOCK_FRAMES):
+        f1 = min(n_frames, f0 + _BLOCK_FRAMES)
+        block = np.asarray(pcm.samples[f0 * hop:f1 * hop], dtype=np.float32)
+        mono = block.mean(axis=1) if pcm.channels > 1 else block[:, 0]
+        mono = (mono - offset) / scale
+        power = np.square(mono).reshape(f1 - f0, hop).mean(axis=1)
+        levels[f0:f1] = 10 * np.log10(power + 1e-12)
+    return levels
+
+
+def _runs(mask):
+    """(start, end) frame index pairs of the True runs in ``mask``."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def voice_activity(levels, frame_seconds=FRAME_SECONDS):
+    """Voiced (start, end) frame runs, with short gaps bridged and blips dropped."""
+    if not len(levels):
+        return np.zeros((0, 2), dtype=np.int64)
+    noise_floor = float(np.percentile(levels, 10))
+    threshold = max(VAD_FLOOR_DB, noise_floor + VAD_MARGIN_DB)
+    starts, ends = _runs(levels > threshold)
+
+    # Bridge gaps shorter than a pause, then drop segments too short to be speech
+    min_gap = int(round(MIN_PAUSE_SECONDS / frame_seconds))
+    if len(starts) > 1:
+        keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_gap))
+        starts = starts[keep]
+        ends = np.concatenate((ends[np.flatnonzero(keep)[1:] - 1], ends[-1:]))
+    long_enough = ends - starts >= int(round(MIN_SEGMENT_SECONDS / frame_seconds))
+    return np.stack((starts[long_enough], ends[long_enough]), axis=1)
+
+
+def fluency_metrics(levels, segments, frame_seconds=FRAME_SECONDS, word_count=None):
+    """Pauses, speaking rate and loudness over the trimmed (first to last voiced) span."""
+    total = len(levels) * frame_seconds
+    if not len(segments):
+        return {
+            "duration": round(total, 3),
+            "trim": [0.0, 0.0],
+            "speech_seconds": 0.0,
+            "voiced_seconds": 0.0,
+            "segments": [],
+            "pauses": {"count": 0, "long_count": 0, "total": 0.0, "mean": 0.0, "longest": 0.0},
+            "rate": {"segments_per_minute": 0.0, "words_per_minute": None, "articulation_rate": None},
+            "loudness": None,
+        }
+
+    # Leading and trailing silence is trimmed before anything else is measured
+    first, last = int(segments[0, 0]), int(segments[-1, 1])
+    span = (last - first) * frame_seconds
+    voiced = float((segments[:, 1] - segments[:, 0]).sum()) * frame_seconds
+    gaps = (segments[1:, 0] - segments[:-1, 1]) * frame_seconds
+
+    marks = np.zeros(len(levels) + 1, dtype=np.int32)
+    np.add.at(marks, segments[:, 0], 1)
+    np.add.at(marks, segments[:, 1], -1)
+    voiced_mask = np.cumsum(marks[:-1]) > 0
+    voiced_levels = levels[voiced_mask]
+    p10, p95 = np.percentile(voiced_levels, [10, 95])
+
+    minutes = span / 60
+    return {
+        "duration": round(total, 3),
+        "trim": [round(first * frame_seconds, 3), round(last * frame_seconds, 3)],
+        "speech_seconds": round(span, 3),
+        "voiced_seconds": round(voiced, 3),
+        "segments": [[round(s * frame_seconds, 3), round(e * frame_seconds, 3)] for s, e in segments.tolist()],
+        "pauses": {
+            "count": int(len(gaps)),
+            "long_count": int((gaps >= LONG_PAUSE_SECONDS).sum()),
+            "total": round(float(gaps.sum()), 3),
+            "mean": round(float(gaps.mean()), 3) if len(gaps) else 0.0,
+            "longest": round(float(gaps.max()), 3) if len(gaps) else 0.0,
+        },
+        "rate": {
+            "segments_per_minute": round(len(segments) / minutes, 1) if minutes else 0.0,
+            "words_per_minute": round(word_count / minutes, 1) if word_count and minutes else None,
+            "articulation_rate": round(word_count / (voiced / 60), 1) if word_count and voiced else None,
+        },
+        "loudness": {
+            "mean_dbfs": round(float(10 * np.log10(np.mean(10 ** (voiced_levels / 10)))), 1),
+            "peak_dbfs": round(float(voiced_levels.max()), 1),
+            "range_db": round(float(p95 - p10), 1),
+        },
+    }
+
+
+def analyze_file(path, word_count=None):
+    """
+    Decode ``path`` and return its fluency metrics (see ``fluency_metrics``)
+    plus the sample rate and channel count. Worker-process entry point.
+    """
+    with PCM(path) as pcm:
+        levels = frame_levels(pcm)
+        segments = voice_activity(levels)
+        result = fluency_metrics(levels, segments, word_count=word_count)
+        result.update(sample_rate=pcm.rate, channels=pcm.channels)
+    return result
@@ -0,0 +1,88 @@
+# reading/audio_pool.py
+"""
+Runs ``audio.analyze_file`` in a bounded pool of worker processes.
+
+Uploads are streamed to a temporary file (``BoundedTemporaryFileUploadHandler``)
+and only the file's path crosses the process boundary; the worker maps the
+samples from disk. At most ``READING_AUDIO_MAX_QUEUED`` analyses are queued
+or running per web process: beyond that ``AudioBusy`` is raised straight
+away, so a burst of uploads is turned away instead of piling up.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+from .audio import analyze_file
+
+
+class AudioBusy(Exception):
+    """Every analysis slot is taken."""
+
+
+class AudioTimeout(Exception):
+    """The analysis did not finish within ``READING_AUDIO_TIMEOUT``."""
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Always streams to disk, and stops reading past ``max_bytes``."""
+
+    def __init__(self, request=None, max_bytes=None):
+        super().__init__(request)
+        self.max_bytes = max_bytes or settings.READING_AUDIO_MAX_UPLOAD_BYTES
+        self.received = 0
+        self.too_large = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_bytes:
+            self.too_large = True
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # "spawn": forking a threaded web worker can copy held locks
+                _slots = threading.BoundedSemaphore(settings.READING_AUDIO_MAX_QUEUED)
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.READING_AUDIO_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def analyze_upload(path, word_count=None, timeout=None):
+    """
+    Analyse the audio file at ``path`` in a worker process and wait for it.
+    Raises ``AudioBusy``, ``AudioTimeout`` or ``audio.AudioError``.
+    """
+    pool = _get_pool()
+    if not _slots.acquire(blocking=False):
+        raise AudioBusy()
+
+    try:
+        future = pool.submit(analyze_file, str(path), word_count)
+    except Exception:
+        _slots.release()
+        raise
+    # The slot is held until the worker is really done, even after a timeout
+    future.add_done_callback(lambda _: _slots.release())
+
+    try:
+        return future.result(timeout=timeout or settings.READING_AUDIO_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise AudioTimeout()
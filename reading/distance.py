@@ -0,0 +1,131 @@
+# reading/distance.py
+"""
+Bit-parallel edit distance (Myers 1999, Hyyrö 2001 formulation).
+
+Each column of the Levenshtein DP table is packed into the bits of a Python
+int, so a word pair costs O(len(b)) big-int operations instead of an
+O(len(a) * len(b)) table of lists. A ``max_dist`` cutoff lets callers stop as
+soon as the pair can no longer come back under their threshold.
+"""
+
+
+def _peq(a):
+    """Match bitmask for every character of ``a``."""
+    peq = {}
+    bit = 1
+    for ch in a:
+        peq[ch] = peq.get(ch, 0) | bit
+        bit <<= 1
+    return peq
+
+
+def _myers(peq, m, b, max_dist):
+    """
+    Distance between the pattern described by ``peq`` (length ``m``) and
+    ``b``. Returns ``max_dist + 1`` as soon as the cutoff is exceeded.
+    """
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv = full, 0
+    score = m
+    remaining = len(b)
+
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+        # The score moves by at most 1 per remaining character
+        remaining -= 1
+        if max_dist is not None and score - remaining > max_dist:
+            return max_dist + 1
+
+    return score
+
+
+def edit_distance(a, b, max_dist=None):
+    """
+    Levenshtein distance between ``a`` and ``b``.
+
+    If ``max_dist`` is given, any distance above it is reported as
+    ``max_dist + 1`` without finishing the computation.
+    """
+    if a == b:
+        return 0
+    if max_dist is not None and abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    return _myers(_peq(a), len(a), b, max_dist)
+
+
+def max_distance_for(a, b, threshold):
+    """Largest distance that still gives ``1 - dist / max_len >= threshold``."""
+    max_len = max(len(a), len(b), 1)
+    return int((1 - threshold) * max_len + 1e-9)
+
+
+def is_similar(a, b, threshold=0.6):
+    """True when ``1 - distance / max_len >= threshold``."""
+    max_dist = max_distance_for(a, b, threshold)
+    return edit_distance(a, b, max_dist) <= max_dist
+
+
+def batch_distances(pairs, max_dist=None):
+    """
+    Distances for many ``(expected, heard)`` pairs in one call.
+
+    Pattern bitmasks are built once per distinct expected word, which is
+    where most of the per-pair setup goes when a lesson repeats words.
+    """
+    patterns = {}
+    out = []
+    for a, b in pairs:
+        if a == b:
+            out.append(0)
+            continue
+        if max_dist is not None and abs(len(a) - len(b)) > max_dist:
+            out.append(max_dist + 1)
+            continue
+        if not a or not b:
+            out.append(len(a) or len(b))
+            continue
+        peq = patterns.get(a)
+        if peq is None:
+            peq = patterns[a] = _peq(a)
+        out.append(_myers(peq, len(a), b, max_dist))
+    return out
+
+
+def batch_similar(pairs, threshold=0.6):
+    """``is_similar`` for many pairs, sharing pattern setup across the batch."""
+    patterns = {}
+    out = []
+    for a, b in pairs:
+        if a == b:
+            out.append(True)
+            continue
+        max_dist = max_distance_for(a, b, threshold)
+        if abs(len(a) - len(b)) > max_dist:
+            out.append(False)
+            continue
+        if not a or not b:
+            out.append((len(a) or len(b)) <= max_dist)
+            continue
+        peq = patterns.get(a)
+        if peq is None:
+            peq = patterns[a] = _peq(a)
+        out.append(_myers(peq, len(a), b, max_dist) <= max_dist)
+    return out
@@ -0,0 +1,220 @@
+# reading/lesson_import.py
+"""
+Bulk, idempotent import of reading lessons from JSON files.
+
+A file holds one lesson object, a JSON array of them, or JSON Lines
+(``.jsonl``). Arrays and JSON Lines are parsed one lesson at a time, so a
+file of any size is read with a small, fixed buffer.
+
+Lesson fields:
+    title            required
+    text / content   a string, or a list of paragraphs (joined by blank lines)
+    order            position in the unit; defaults to the 1-based position in the file
+    unit             a Unit id, or {"book": <Book id or title>, "order": n, "title": "..."}
+                     (created if missing); defaults to the command's --unit
+
+Lessons are upserted on (unit, order), the model's unique key, with
+``bulk_create(update_conflicts=True)``. Rows whose title and text haven't
+changed are left alone, so re-running an import doesn't bump ``updated_at``
+(and with it the token index and HTTP validators).
+"""
+
+import json
+
+from django.db import transaction
+
+from .models import Book, ReadingLesson, Unit
+
+_READ_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+
+
+class LessonImportError(ValueError):
+    pass
+
+
+# ---------------------------------------------------
+# STREAMING JSON
+# ---------------------------------------------------
+def iter_json_records(path):
+    """Yield the lesson objects of a JSON, JSON-array or JSON Lines file."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(_READ_SIZE).lstrip(_WHITESPACE + "\ufeff")
+        if not buf:
+            return
+        if buf[0] != "[":
+            # One object, or one object per line
+            yield from _iter_concatenated(f, buf, decoder)
+            return
+
+        buf, pos, eof = buf, 1, False
+        while True:
+            pos = _skip(buf, pos, ",")
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise LessonImportError(f"{path}: invalid or truncated JSON array")
+                more = f.read(_READ_SIZE)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield obj
+            pos = end
+            if pos > _READ_SIZE:
+                buf, pos = buf[pos:], 0
+
+
+def _iter_concatenated(f, buf, decoder):
+    pos, eof = 0, False
+    while True:
+        pos = _skip(buf, pos)
+        if pos >= len(buf):
+            if eof:
+                return
+            more = f.read(_READ_SIZE)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise LessonImportError(f"{f.name}: invalid or truncated JSON")
+            more = f.read(_READ_SIZE)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        if isinstance(obj, list):
+            yield from obj
+        else:
+            yield obj
+        pos = end
+        if pos > _READ_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def _skip(buf, pos, extra=""):
+    chars = _WHITESPACE + extra
+    while pos < len(buf) and buf[pos] in chars:
+        pos += 1
+    return pos
+
+
+# ---------------------------------------------------
+# IMPORT
+# ---------------------------------------------------
+def lesson_text(record):
+    text = record.get("text", record.get("content", ""))
+    if isinstance(text, list):
+        text = "\n\n".join(str(p).strip() for p in text if str(p).strip())
+    return (text or "").strip()
+
+
+class LessonImporter:
+    """Collects lessons and upserts them ``batch_size`` at a time."""
+
+    def __init__(self, default_unit=None, batch_size=500, dry_run=False):
+        self.default_unit = default_unit
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        self.errors = []
+        self._pending = {}
+        self._units = {}
+        self._books = {}
+
+    def add(self, record, position, source=""):
+        try:
+            if not isinstance(record, dict):
+                raise LessonImportError("not a JSON object")
+            title = str(record.get("title") or "").strip()
+            if not title:
+                raise LessonImportError("missing 'title'")
+            unit_id = self._unit_id(record.get("unit", self.default_unit))
+            order = int(record.get("order", position))
+        except (LessonImportError, TypeError, ValueError) as exc:
+            self.stats["skipped"] += 1
+            self.errors.append(f"{source}#{position}: {exc}")
+            return
+
+        # Same (unit, order) twice: the later record wins, as it would one by one
+        self._pending[(unit_id, order)] = (title[:255], lesson_text(record))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+
+        existing = {}
+        # Units that only exist in a dry run have str placeholders
+        rows = ReadingLesson.objects.filter(
+            unit_id__in={u for u, _ in batch if isinstance(u, int)},
+            order__in={o for _, o in batch},
+        ).values_list("unit_id", "order", "title", "content")
+        for unit_id, order, title, content in rows:
+            existing[(unit_id, order)] = (title, content)
+
+        changed = []
+        for key, value in batch.items():
+            current = existing.get(key)
+            if current == value:
+                self.stats["unchanged"] += 1
+                continue
+            self.stats["updated" if current else "created"] += 1
+            changed.append(ReadingLesson(unit_id=key[0], order=key[1], title=value[0], content=value[1]))
+
+        if changed and not self.dry_run:
+            with transaction.atomic():
+                ReadingLesson.objects.bulk_create(
+                    changed,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=["unit", "order"],
+                    update_fields=["title", "content", "updated_at"],
+                )
+
+    # ---------------------------------------------------
+    # Units
+    # ---------------------------------------------------
+    def _unit_id(self, spec):
+        if spec is None or spec == "":
+            raise LessonImportError("no 'unit' (set one in the file or pass --unit)")
+        key = json.dumps(spec, sort_keys=True)
+        if key not in self._units:
+            self._units[key] = self._resolve_unit(spec)
+        return self._units[key]
+
+    def _resolve_unit(self, spec):
+        if isinstance(spec, (int, str)) and str(spec).isdigit():
+            unit_id = Unit.objects.filter(pk=int(spec)).values_list("pk", flat=True).first()
+            if unit_id is None:
+                raise LessonImportError(f"unit {spec} does not exist")
+            return unit_id
+        if not isinstance(spec, dict) or "book" not in spec or "order" not in spec:
+            raise LessonImportError("'unit' must be an id or {\"book\": ..., \"order\": ...}")
+
+        book_id = self._book_id(spec["book"])
+        if self.dry_run:
+            unit_id = Unit.objects.filter(book_id=book_id, order=spec["order"]).values_list("pk", flat=True).first()
+            return unit_id if unit_id is not None else f"new:{book_id}:{spec['order']}"
+        unit, _ = Unit.objects.get_or_create(
+            book_id=book_id,
+            order=int(spec["order"]),
+            defaults={"title": spec.get("title") or f"Unit {spec['order']}"},
+        )
+        return unit.pk
+
+    def _book_id(self, ref):
+        if ref not in self._books:
+            books = Book.objects.filter(pk=ref) if str(ref).isdigit() else Book.objects.filter(title=ref)
+            ids = list(books.values_list("pk", flat=True)[:2])
+            if len(ids) != 1:
+                raise LessonImportError(f"book {ref!r} {'is ambiguous' if ids else 'does not exist'}")
+            self._books[ref] = ids[0]
+        return self._books[ref]
@@ -0,0 +1,120 @@
+# reading/live_feedback.py
+"""
+Live pronunciation feedback over a WebSocket, while the student is reading.
+
+The browser sends each new piece of transcript as it is recognised; the
+server keeps an alignment cursor into the lesson and only aligns the delta
+against the next window of expected words, so every update costs
+O(len(delta) * band) regardless of how long the lesson is.
+
+Protocol (ws://<host>/ws/reading/feedback/?lesson_id=<id>):
+    -> {"delta": "next words heard"}
+    <- {"window": [start, end], "cursor": end, "score": 92.5,
+        "mispronounced": [...], "insertions": [...], "ops": {...},
+        "done": false}
+"""
+
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+
+from .alignment import align_words, MATCH
+from .models import ReadingLesson
+from .scoring import ExpectedText, get_engine, summarize_ops, tokenize
+
+LIVE_FEEDBACK_PATH = "/ws/reading/feedback/"
+
+# Longest delta accepted in one message; keeps each update bounded
+MAX_DELTA_CHARS = 4000
+
+
+class IncrementalScorer:
+    """Alignment cursor and running totals for one reading session."""
+
+    def __init__(self, expected, engine):
+        self.engine = engine
+        self.tokens = expected.tokens
+        self.codes = expected.codes(engine.encoder_name, engine.encode)
+        self.cursor = 0     # next expected word not yet covered
+        self.heard = 0      # spoken words consumed so far
+        self.matched = 0
+
+    def feed(self, text):
+        spoken = tokenize((text or "")[:MAX_DELTA_CHARS])
+        band = self.engine.band
+        start = self.cursor
+        end = min(len(self.tokens), start + 2 * len(spoken) + band)
+        window = self.tokens[start:end]
+
+        ops = align_words(
+            window,
+            spoken,
+            self.engine.make_matcher(window, spoken, self.codes[start:end]),
+            band=band,
+            open_end=True,
+        )
+        mispronounced, insertions, op_counts = summarize_ops(
+            ops, window, spoken, expected_offset=start, spoken_offset=self.heard
+        )
+
+        covered = [i for _, i, _ in ops if i is not None]
+        if covered:
+            self.cursor = start + covered[-1] + 1
+        self.heard += len(spoken)
+        self.matched += op_counts[MATCH]
+
+        return {
+            "window": [start, self.cursor],
+            "cursor": self.cursor,
+            "score": round(self.matched / self.cursor * 100, 2) if self.cursor else 0,
+            "mispronounced": mispronounced,
+            "insertions": insertions,
+            "ops": op_counts,
+            "done": self.cursor >= len(self.tokens),
+            "version": self.engine.version,
+        }
+
+
+def _open_scorer(lesson_id):
+    try:
+        lesson = ReadingLesson.objects.filter(pk=lesson_id).first()
+    except (TypeError, ValueError):
+        lesson = None
+    if lesson is None:
+        return None
+    return IncrementalScorer(ExpectedText.from_lesson(lesson), get_engine())
+
+
+async def live_feedback_app(scope, receive, send):
+    """Raw ASGI WebSocket application; mounted in ``backend/asgi.py``."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    lesson_id = (query.get("lesson_id") or [None])[0]
+    scorer = None
+
+    while True:
+        event = await receive()
+
+        if event["type"] == "websocket.connect":
+            scorer = await sync_to_async(_open_scorer)(lesson_id)
+            if scorer is None:
+                await send({"type": "websocket.close", "code": 4404})
+                return
+            await send({"type": "websocket.accept"})
+
+        elif event["type"] == "websocket.receive":
+            try:
+                message = json.loads(event.get("text") or event.get("bytes") or "{}")
+                delta = str(message.get("delta", ""))
+            except (ValueError, AttributeError):
+                await send({
+                    "type": "websocket.send",
+                    "text": json.dumps({"error": "Expected a JSON object with a 'delta'."}),
+                })
+                continue
+
+            result = await sync_to_async(scorer.feed, thread_sensitive=False)(delta)
+            await send({"type": "websocket.send", "text": json.dumps(result)})
+
+        elif event["type"] == "websocket.disconnect":
+            return
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reading.models import PronunciationAttempt, StoredText
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the inline expected text of older pronunciation attempts into the "
+        "deduplicated StoredText table, a chunk of rows at a time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Attempts per transaction")
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        pending = PronunciationAttempt.objects.filter(expected_text__isnull=True).order_by("pk")
+
+        started = time.perf_counter()
+        last_pk = 0
+        moved = 0
+        texts = set()
+        while True:
+            # Keyset pagination: only one chunk of texts is in memory at a time
+            rows = list(pending.filter(pk__gt=last_pk).values_list("pk", "legacy_expected")[:chunk_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            with transaction.atomic():
+                ids = StoredText.intern_many(text for _, text in rows)
+                PronunciationAttempt.objects.bulk_update(
+                    [
+                        PronunciationAttempt(
+                            pk=pk,
+                            expected_text_id=ids[StoredText.digest_for(text)],
+                            legacy_expected="",
+                        )
+                        for pk, text in rows
+                    ],
+                    ["expected_text", "legacy_expected"],
+                    batch_size=500,
+                )
+            moved += len(rows)
+            texts.update(ids.values())
+            self.stdout.write(f"  {moved} attempts moved (up to id {last_pk})")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {moved} attempts onto {len(texts)} distinct texts in {elapsed:.1f}s."
+        ))
+        if moved:
+            self.stdout.write("Run VACUUM (SQLite) or VACUUM FULL (PostgreSQL) to reclaim the space.")
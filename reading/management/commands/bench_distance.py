@@ -0,0 +1,83 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.distance import edit_distance, batch_similar, max_distance_for
+
+
+def matrix_levenshtein(a, b):
+    """The original list-of-lists DP from views_feedback, kept as a baseline."""
+    if a == b:
+        return 0
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    m, n = len(a), len(b)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        dp[i][0] = i
+    for j in range(m + 1):
+        dp[0][j] = j
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = 0 if a[j - 1] == b[i - 1] else 1
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
+    return dp[n][m]
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark the bit-parallel edit distance against the matrix DP"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pairs", type=int, default=20000)
+        parser.add_argument("--threshold", type=float, default=0.6)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        threshold = options["threshold"]
+
+        def word():
+            return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 12)))
+
+        vocab = [word() for _ in range(500)]
+        pairs = []
+        for _ in range(options["pairs"]):
+            a = rng.choice(vocab)
+            # Mix of exact, near-miss and unrelated pairs, like real transcripts
+            r = rng.random()
+            if r < 0.5:
+                b = a
+            elif r < 0.8:
+                b = a[:-1] + rng.choice(string.ascii_lowercase)
+            else:
+                b = rng.choice(vocab)
+            pairs.append((a, b))
+
+        def run(label, fn):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label:<28} {elapsed * 1000:9.1f} ms  "
+                f"{elapsed / len(pairs) * 1e6:7.2f} us/pair"
+            )
+            return result
+
+        baseline = run("matrix levenshtein", lambda: [
+            1 - matrix_levenshtein(a, b) / max(len(a), len(b), 1) >= threshold for a, b in pairs
+        ])
+        run("bit-parallel (full)", lambda: [edit_distance(a, b) for a, b in pairs])
+        bounded = run("bit-parallel (cutoff)", lambda: [
+            edit_distance(a, b, max_distance_for(a, b, threshold)) <= max_distance_for(a, b, threshold)
+            for a, b in pairs
+        ])
+        batched = run("batch_similar", lambda: batch_similar(pairs, threshold))
+
+        if baseline == bounded == batched:
+            self.stdout.write(self.style.SUCCESS("Results match the baseline."))
+        else:
+            self.stdout.write(self.style.ERROR("Results differ from the baseline!"))
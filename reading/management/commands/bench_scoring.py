@@ -0,0 +1,85 @@
+import json
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.scoring import ExpectedText, get_engine
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the pronunciation scoring engine on synthetic lesson/transcript pairs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,500,1000,2500,5000",
+                            help="Comma-separated lesson lengths, in words")
+        parser.add_argument("--runs", type=int, default=20, help="Transcripts scored per size")
+        parser.add_argument("--error-rate", type=float, default=0.1,
+                            help="Fraction of words dropped, misheard or padded")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        engine = get_engine()
+        error_rate = options["error_rate"]
+
+        # Zipf-ish vocabulary so common words repeat, as in real lessons
+        vocab = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 10)))
+            for _ in range(3000)
+        ]
+        weights = [1 / (rank + 1) for rank in range(len(vocab))]
+
+        def transcript(words):
+            out = []
+            for w in words:
+                r = rng.random()
+                if r < error_rate / 3:
+                    continue                                    # dropped
+                if r < 2 * error_rate / 3:
+                    out.append(w[:-1] + rng.choice(string.ascii_lowercase))  # misheard
+                    continue
+                out.append(w)
+                if r < error_rate:
+                    out.append(rng.choice(vocab))               # extra word
+            return " ".join(out)
+
+        rows = []
+        for size in [int(s) for s in options["sizes"].split(",") if s.strip()]:
+            lesson = " ".join(rng.choices(vocab, weights, k=size))
+            expected = ExpectedText.from_text(lesson)
+            spoken = [transcript(expected.tokens) for _ in range(options["runs"])]
+
+            samples = []
+            for text in spoken:
+                start = time.perf_counter()
+                engine.score(expected, text)
+                samples.append((time.perf_counter() - start) * 1000)
+
+            rows.append({
+                "words": size,
+                "runs": len(samples),
+                "p50_ms": round(_percentile(samples, 50), 2),
+                "p99_ms": round(_percentile(samples, 99), 2),
+                "mean_ms": round(statistics.fmean(samples), 2),
+            })
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"version": engine.version, "results": rows}, indent=2))
+            return
+
+        self.stdout.write(f"Scoring engine {engine.version}")
+        self.stdout.write(f"{'words':>7} {'runs':>5} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['words']:>7} {row['runs']:>5} {row['p50_ms']:>9} {row['p99_ms']:>9} {row['mean_ms']:>9}"
+            )
@@ -0,0 +1,82 @@
+import glob
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reading.lesson_import import LessonImporter, LessonImportError, iter_json_records
+
+_PATTERNS = ("*.json", "*.jsonl")
+
+
+def _expand(paths):
+    """Files named by ``paths``: files, directories (searched recursively) or globs."""
+    files = []
+    for entry in paths:
+        matches = glob.glob(entry, recursive=True) if glob.has_magic(entry) else [entry]
+        if not matches:
+            raise CommandError(f"Nothing matches {entry}")
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                for pattern in _PATTERNS:
+                    files.extend(sorted(path.rglob(pattern)))
+            elif path.is_file():
+                files.append(path)
+            else:
+                raise CommandError(f"Not found: {match}")
+    # Keep the first occurrence of each file, in the order given
+    return list(dict.fromkeys(files))
+
+
+class Command(BaseCommand):
+    help = (
+        "Import reading lessons from JSON / JSON Lines files, directories or globs. "
+        "Lessons are upserted on (unit, order), so re-running an import is safe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*",
+            help="Files, directories or glob patterns (default: data/reading_lesson*.json)",
+        )
+        parser.add_argument("--unit", type=int, help="Unit id for lessons that don't name one")
+        parser.add_argument("--batch-size", type=int, default=500, help="Lessons per upsert")
+        parser.add_argument("--dry-run", action="store_true", help="Parse and compare, write nothing")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [os.path.join(settings.BASE_DIR, "data", "reading_lesson*.json")]
+        files = _expand(paths)
+
+        importer = LessonImporter(
+            default_unit=options["unit"],
+            batch_size=max(1, options["batch_size"]),
+            dry_run=options["dry_run"],
+        )
+
+        started = time.perf_counter()
+        lessons = 0
+        total_bytes = 0
+        for path in files:
+            total_bytes += path.stat().st_size
+            try:
+                for position, record in enumerate(iter_json_records(path), start=1):
+                    importer.add(record, position, source=path.name)
+                    lessons += 1
+            except (LessonImportError, UnicodeDecodeError) as exc:
+                importer.errors.append(f"{path}: {exc}")
+        importer.flush()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        for error in importer.errors:
+            self.stdout.write(self.style.WARNING(error))
+
+        stats = importer.stats
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if options['dry_run'] else 'Imported'} {lessons} lessons from {len(files)} files "
+            f"in {elapsed:.2f}s ({lessons / elapsed:.0f} lessons/s, {total_bytes / elapsed / 1e6:.1f} MB/s): "
+            f"{stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['skipped']} skipped."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reading.attempt_buffer import replay_journal
+
+
+class Command(BaseCommand):
+    help = "Insert pronunciation attempts left in write-behind journal files (e.g. after a crash)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="Journal directory (defaults to READING_ATTEMPT_JOURNAL_DIR)")
+
+    def handle(self, *args, **options):
+        count = replay_journal(options.get("dir"))
+        self.stdout.write(self.style.SUCCESS(f"Replayed {count} pronunciation attempts."))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0004_alter_book_order_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonTokenIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_updated_at', models.DateTimeField()),
+                ('data', models.JSONField(default=dict)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('lesson', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='token_index', to='reading.readinglesson')),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def populate_uids(apps, schema_editor):
+    PronunciationAttempt = apps.get_model("reading", "PronunciationAttempt")
+    for attempt in PronunciationAttempt.objects.filter(uid__isnull=True).only("id").iterator():
+        attempt.uid = uuid.uuid4()
+        attempt.save(update_fields=["uid"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0005_lessontokenindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pronunciationattempt',
+            name='uid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_uids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='pronunciationattempt',
+            name='uid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='pronunciationattempt',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0006_pronunciationattempt_uid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pronunciationattempt',
+            name='algorithm_version',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
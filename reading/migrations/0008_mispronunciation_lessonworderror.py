@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:27
+
+from collections import Counter
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """Build the child rows and counters from existing attempts, in chunks."""
+    Attempt = apps.get_model("reading", "PronunciationAttempt")
+    Mispronunciation = apps.get_model("reading", "Mispronunciation")
+    LessonWordError = apps.get_model("reading", "LessonWordError")
+
+    counts = Counter()
+    last_seen = {}
+    rows = []
+    attempts = Attempt.objects.values_list(
+        "pk", "lesson_id", "user_id", "mispronounced", "created_at"
+    ).iterator(chunk_size=2000)
+    for pk, lesson_id, user_id, mispronounced, created_at in attempts:
+        for item in mispronounced or []:
+            if not isinstance(item, dict) or not item.get("word"):
+                continue
+            word = str(item["word"])[:64]
+            rows.append(Mispronunciation(
+                attempt_id=pk, lesson_id=lesson_id, user_id=user_id, word=word,
+                heard=str(item.get("heard") or "")[:64],
+                distance=max(0, int(item.get("distance") or 0)),
+                created_at=created_at,
+            ))
+            if lesson_id is not None:
+                counts[(lesson_id, word)] += 1
+                last_seen[(lesson_id, word)] = max(last_seen.get((lesson_id, word), created_at), created_at)
+        if len(rows) >= 2000:
+            Mispronunciation.objects.bulk_create(rows)
+            rows = []
+    Mispronunciation.objects.bulk_create(rows)
+
+    LessonWordError.objects.bulk_create(
+        [
+            LessonWordError(lesson_id=lesson_id, word=word, count=n, last_seen=last_seen[(lesson_id, word)])
+            for (lesson_id, word), n in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0007_pronunciationattempt_algorithm_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonWordError',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now)),
+                ('lesson', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='word_errors', to='reading.readinglesson')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['lesson', '-count'], name='reading_les_lesson__c81127_idx')],
+                'constraints': [models.UniqueConstraint(fields=('lesson', 'word'), name='unique_word_error_per_lesson')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Mispronunciation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=64)),
+                ('heard', models.CharField(blank=True, max_length=64)),
+                ('distance', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mispronunciations', to='reading.pronunciationattempt')),
+                ('lesson', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mispronunciations', to='reading.readinglesson')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mispronunciations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['lesson', 'word'], name='reading_mis_lesson__0e0466_idx'), models.Index(fields=['user', 'word'], name='reading_mis_user_id_cade9a_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
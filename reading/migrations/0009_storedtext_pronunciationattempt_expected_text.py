@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0008_mispronunciation_lessonworderror'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        # Same column; existing rows keep their text until backfill_expected_texts runs
+        migrations.RenameField(
+            model_name='pronunciationattempt',
+            old_name='expected',
+            new_name='legacy_expected',
+        ),
+        migrations.AlterField(
+            model_name='pronunciationattempt',
+            name='legacy_expected',
+            field=models.TextField(blank=True, db_column='expected'),
+        ),
+        migrations.AddField(
+            model_name='pronunciationattempt',
+            name='expected_text',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attempts', to='reading.storedtext'),
+        ),
+    ]
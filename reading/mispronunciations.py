@@ -0,0 +1,118 @@
+# reading/mispronunciations.py
+"""
+Row-level mispronunciation data derived from PronunciationAttempt.
+
+Each saved attempt's ``mispronounced`` list is copied into ``Mispronunciation``
+rows and added to the per-lesson ``LessonWordError`` counters, so
+"which words in this lesson are missed most" is an index scan instead of a
+pass over every attempt's JSON.
+"""
+
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Count, F, Max, Value
+from django.db.models.functions import Greatest
+
+from .models import LessonWordError, Mispronunciation
+
+WORD_MAX_LENGTH = 64
+DEFAULT_TOP_K = 20
+MAX_TOP_K = 200
+
+
+def _rows(attempt):
+    for item in attempt.mispronounced or []:
+        if not isinstance(item, dict) or not item.get("word"):
+            continue
+        yield Mispronunciation(
+            attempt_id=attempt.pk,
+            lesson_id=attempt.lesson_id,
+            user_id=attempt.user_id,
+            word=str(item["word"])[:WORD_MAX_LENGTH],
+            heard=str(item.get("heard") or "")[:WORD_MAX_LENGTH],
+            distance=max(0, int(item.get("distance") or 0)),
+            created_at=attempt.created_at,
+        )
+
+
+def record_mispronunciations(attempts):
+    """
+    Write child rows and bump the lesson counters for newly saved attempts.
+    Call inside the transaction that inserted them, and only once per attempt.
+    """
+    rows = [row for attempt in attempts for row in _rows(attempt)]
+    if not rows:
+        return 0
+    Mispronunciation.objects.bulk_create(rows, batch_size=500)
+
+    counts = Counter()
+    last_seen = {}
+    for row in rows:
+        if row.lesson_id is None:
+            continue
+        key = (row.lesson_id, row.word)
+        counts[key] += 1
+        last_seen[key] = max(last_seen.get(key, row.created_at), row.created_at)
+    _bump_counters(counts, last_seen)
+    return len(rows)
+
+
+def _bump_counters(counts, last_seen):
+    if not counts:
+        return
+    if connection.vendor in ("sqlite", "postgresql"):
+        # One upsert per key that adds to the stored count, so concurrent
+        # writers never overwrite each other's increments; last_seen only
+        # moves forward, whatever order batches (or replays) commit in
+        qn = connection.ops.quote_name
+        table = qn(LessonWordError._meta.db_table)
+        greatest = "MAX" if connection.vendor == "sqlite" else "GREATEST"
+        sql = (
+            f"INSERT INTO {table} ({qn('lesson_id')}, {qn('word')}, {qn('count')}, {qn('last_seen')}) "
+            f"VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT ({qn('lesson_id')}, {qn('word')}) DO UPDATE SET "
+            f"{qn('count')} = {table}.{qn('count')} + excluded.{qn('count')}, "
+            f"{qn('last_seen')} = {greatest}({table}.{qn('last_seen')}, excluded.{qn('last_seen')})"
+        )
+        params = [
+            (lesson_id, word, n, connection.ops.adapt_datetimefield_value(last_seen[(lesson_id, word)]))
+            for (lesson_id, word), n in counts.items()
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+        return
+
+    for (lesson_id, word), n in counts.items():
+        updated = LessonWordError.objects.filter(lesson_id=lesson_id, word=word).update(
+            count=F("count") + n,
+            last_seen=Greatest(F("last_seen"), Value(last_seen[(lesson_id, word)])),
+        )
+        if not updated:
+            LessonWordError.objects.create(
+                lesson_id=lesson_id, word=word, count=n, last_seen=last_seen[(lesson_id, word)]
+            )
+
+
+# ---------------------------------------------------
+# HEATMAPS
+# ---------------------------------------------------
+def top_words_for_lesson(lesson_id, k=DEFAULT_TOP_K):
+    """Most mispronounced words of a lesson, from the running counters."""
+    return list(
+        LessonWordError.objects.filter(lesson_id=lesson_id)
+        .order_by("-count", "word")
+        .values("word", "count", "last_seen")[:k]
+    )
+
+
+def top_words_for_user(user_id, k=DEFAULT_TOP_K, lesson_id=None):
+    """Most mispronounced words of one student, optionally within a lesson."""
+    qs = Mispronunciation.objects.filter(user_id=user_id)
+    if lesson_id is not None:
+        qs = qs.filter(lesson_id=lesson_id)
+    return list(
+        qs.values("word")
+        .annotate(count=Count("id"), last_seen=Max("created_at"))
+        .order_by("-count", "word")[:k]
+    )
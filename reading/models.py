@@ -1,6 +1,10 @@
 # reading/models.py
+import hashlib
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class BookCategory(models.Model):
@@ -90,7 +94,50 @@ class ReadingLesson(models.Model):
         return f"{self.unit} - {self.title}" if self.unit else self.title
 
 
+class StoredText(models.Model):
+    """
+    Content-addressed text: each distinct expected text is stored once and
+    shared by every attempt that was scored against it.
+    """
+    digest = models.CharField(max_length=64, unique=True)  # sha256 of the text
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({len(self.text)} chars)"
+
+    @staticmethod
+    def digest_for(text):
+        return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+    @classmethod
+    def intern(cls, text):
+        text = text or ""
+        obj, _ = cls.objects.get_or_create(digest=cls.digest_for(text), defaults={"text": text})
+        return obj
+
+    @classmethod
+    def intern_many(cls, texts):
+        """Store the distinct ``texts`` that are missing; return ``{digest: pk}``."""
+        by_digest = {cls.digest_for(t): t or "" for t in texts}
+        cls.objects.bulk_create(
+            [cls(digest=d, text=t) for d, t in by_digest.items()],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        digests = list(by_digest)
+        ids = {}
+        for start in range(0, len(digests), 500):
+            ids.update(
+                cls.objects.filter(digest__in=digests[start:start + 500]).values_list("digest", "pk")
+            )
+        return ids
+
+
 class PronunciationAttempt(models.Model):
+    # Allocated before the row is written, so the API can return it while the
+    # insert is still queued in the write-behind buffer
+    uid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -105,12 +152,23 @@ class PronunciationAttempt(models.Model):
         on_delete=models.SET_NULL,
         related_name="pron_attempts",
     )
-    expected = models.TextField()               # full lesson text
+    expected_text = models.ForeignKey(           # full lesson text, see ``expected``
+        StoredText,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="attempts",
+    )
+    # Inline copy kept by rows saved before StoredText; emptied by
+    # ``manage.py backfill_expected_texts``
+    legacy_expected = models.TextField(blank=True, db_column="expected")
     spoken = models.TextField()                 # student's captured transcript
     score = models.FloatField(null=True, blank=True)  # percentage 0-100
     mispronounced = models.JSONField(default=list, blank=True)  # list of words flagged
     feedback = models.TextField(blank=True)     # human-friendly textual feedback
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    algorithm_version = models.CharField(max_length=64, blank=True, db_index=True)  # ScoringEngine.version
+    # Not auto_now_add: buffered rows keep the time of the attempt, not of the flush
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -120,4 +178,113 @@ class PronunciationAttempt(models.Model):
         ]
 
     def __str__(self):
-        return f"Attempt {self.id} lesson={self.lesson_id} score={self.score}"
\ No newline at end of file
+        return f"Attempt {self.id} lesson={self.lesson_id} score={self.score}"
+
+    @property
+    def expected(self):
+        """The text this attempt was scored against, wherever it is stored."""
+        pending = getattr(self, "_pending_expected", None)
+        if pending is not None:
+            return pending
+        if self.expected_text_id is not None:
+            return self.expected_text.text
+        return self.legacy_expected
+
+    @expected.setter
+    def expected(self, text):
+        # Resolved to a StoredText on save()
+        self._pending_expected = text or ""
+        self.expected_text = None
+
+    def save(self, *args, **kwargs):
+        pending = getattr(self, "_pending_expected", None)
+        if pending is not None:
+            self.expected_text = StoredText.intern(pending)
+            self.legacy_expected = ""
+            self._pending_expected = None
+        super().save(*args, **kwargs)
+
+
+class Mispronunciation(models.Model):
+    """
+    One entry of ``PronunciationAttempt.mispronounced``, as a row.
+    ``lesson`` and ``user`` are copied from the attempt so per-lesson and
+    per-student word rankings are single indexed queries.
+    """
+    attempt = models.ForeignKey(
+        PronunciationAttempt,
+        on_delete=models.CASCADE,
+        related_name="mispronunciations",
+    )
+    lesson = models.ForeignKey(
+        ReadingLesson,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="mispronunciations",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="mispronunciations",
+    )
+    word = models.CharField(max_length=64)
+    heard = models.CharField(max_length=64, blank=True)  # "" when the word was skipped
+    distance = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["lesson", "word"]),
+            models.Index(fields=["user", "word"]),
+        ]
+
+    def __str__(self):
+        return f"{self.word} -> {self.heard or '(skipped)'}"
+
+
+class LessonWordError(models.Model):
+    """Running count of mispronunciations per (lesson, word)."""
+    lesson = models.ForeignKey(
+        ReadingLesson,
+        on_delete=models.CASCADE,
+        related_name="word_errors",
+    )
+    word = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lesson", "word"],
+                name="unique_word_error_per_lesson",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["lesson", "-count"]),
+        ]
+
+    def __str__(self):
+        return f"lesson={self.lesson_id} {self.word}: {self.count}"
+
+
+class LessonTokenIndex(models.Model):
+    """
+    Precomputed tokens and phonetic codes for a lesson's content, so the
+    feedback endpoint doesn't re-tokenise the lesson on every attempt.
+    Rebuilt whenever ``source_updated_at`` falls behind the lesson.
+    """
+    lesson = models.OneToOneField(
+        ReadingLesson,
+        on_delete=models.CASCADE,
+        related_name="token_index",
+    )
+    source_updated_at = models.DateTimeField()
+    data = models.JSONField(default=dict)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Token index for lesson={self.lesson_id}"
@@ -0,0 +1,28 @@
+# reading/pagination.py
+
+from rest_framework.pagination import CursorPagination
+
+
+class LessonCursorPagination(CursorPagination):
+    """
+    Stable cursor paging over lessons. Unlike page numbers, the cursor
+    doesn't skip or repeat lessons when others are added meanwhile.
+
+    DRF cursors only seek on the first ordering field, so that field has to
+    be unique for every page to be an index range scan:
+
+    - Within one unit (``?unit=``), lessons come in reading order, keyed on
+      ``order``, which is unique per unit (the ``unit, order`` index).
+    - Otherwise they are paged by ``id`` (creation order). ``order`` only
+      counts within a unit, so there is no global reading order to seek on;
+      clients group the summaries by ``unit_id``.
+    """
+    ordering = ("id",)
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        if request.query_params.get("unit"):
+            return ("order", "id")
+        return self.ordering
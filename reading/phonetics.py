@@ -0,0 +1,158 @@
+# reading/phonetics.py
+"""
+Phonetic encoders used to forgive spelling-level differences between the
+expected word and what the speech recogniser heard.
+
+A token without letters (a number, "&", a dash) has no sound to compare:
+the encoders return None for it, and such tokens only match exactly.
+"""
+
+
+def clean_word(w):
+    return (w or "").lower().strip().strip(".,!?;:\"'()[]{}")
+
+
+def _letters(word):
+    return "".join(ch for ch in (word or "").lower() if "a" <= ch <= "z")
+
+
+def has_letters(word):
+    return any("a" <= ch <= "z" for ch in (word or "").lower())
+
+
+def soundex(word):
+    # simple soundex (same family as frontend)
+    w = clean_word(word)
+    if not has_letters(w):
+        return None
+    w = w.lower()
+    codes = {'b':'1','f':'1','p':'1','v':'1','c':'2','g':'2','j':'2','k':'2','q':'2','s':'2','x':'2','z':'2',
+             'd':'3','t':'3','l':'4','m':'5','n':'5','r':'6'}
+    first = w[0]
+    res = first.upper()
+    prev = codes.get(first, '')
+    for ch in w[1:]:
+        code = codes.get(ch, '')
+        if code != prev:
+            res += code
+        prev = code
+    return (res + "000")[:4]
+
+
+_VOWELS = set("aeiou")
+_FRONT = set("eiy")
+
+
+def metaphone(word):
+    """
+    Original (1990) Metaphone key for an English word.
+    Coarser than Soundex on vowels, finer on consonant clusters
+    ("ph" -> F, "tion" -> X, silent "k" in "kn", ...).
+    """
+    w = _letters(word)
+    if not w:
+        return None
+
+    # Initial-letter exceptions
+    if w[:2] in ("ae", "gn", "kn", "pn", "wr"):
+        w = w[1:]
+    elif w[0] == "x":
+        w = "s" + w[1:]
+    elif w[:2] == "wh":
+        w = "w" + w[2:]
+
+    n = len(w)
+    out = []
+
+    def at(i):
+        return w[i] if 0 <= i < n else ""
+
+    i = 0
+    while i < n:
+        ch = w[i]
+        prev, nxt = at(i - 1), at(i + 1)
+
+        # Skip doubled letters except "cc"
+        if ch == prev and ch != "c":
+            i += 1
+            continue
+
+        if ch in _VOWELS:
+            if i == 0:
+                out.append(ch.upper())
+        elif ch == "b":
+            if not (prev == "m" and i == n - 1):
+                out.append("B")
+        elif ch == "c":
+            if nxt == "i" and at(i + 2) == "a":
+                out.append("X")
+            elif nxt == "h":
+                out.append("K" if prev == "s" else "X")
+                i += 1
+            elif nxt in _FRONT:
+                if prev != "s":
+                    out.append("S")
+            else:
+                out.append("K")
+        elif ch == "d":
+            if nxt == "g" and at(i + 2) in _FRONT:
+                out.append("J")
+                i += 2
+            else:
+                out.append("T")
+        elif ch == "g":
+            if nxt == "h" and at(i + 2) and at(i + 2) not in _VOWELS:
+                pass  # silent, as in "night"
+            elif nxt == "n" and (i + 1 == n - 1 or w[i + 1:] == "ned"):
+                pass  # silent, as in "sign", "signed"
+            elif prev == "d" and nxt in _FRONT:
+                pass  # handled by "dg"
+            elif nxt in _FRONT:
+                out.append("J")
+            else:
+                out.append("K")
+        elif ch == "h":
+            if prev not in ("c", "s", "p", "t", "g") and nxt in _VOWELS:
+                out.append("H")
+        elif ch == "k":
+            if prev != "c":
+                out.append("K")
+        elif ch == "p":
+            if nxt == "h":
+                out.append("F")
+                i += 1
+            else:
+                out.append("P")
+        elif ch == "q":
+            out.append("K")
+        elif ch == "s":
+            if nxt == "h":
+                out.append("X")
+                i += 1
+            elif nxt == "i" and at(i + 2) in ("o", "a"):
+                out.append("X")
+            else:
+                out.append("S")
+        elif ch == "t":
+            if nxt == "i" and at(i + 2) in ("o", "a"):
+                out.append("X")
+            elif nxt == "h":
+                out.append("0")  # theta
+                i += 1
+            elif not (nxt == "c" and at(i + 2) == "h"):
+                out.append("T")
+        elif ch == "v":
+            out.append("F")
+        elif ch in ("w", "y"):
+            if nxt in _VOWELS:
+                out.append(ch.upper())
+        elif ch == "x":
+            out.append("KS")
+        elif ch == "z":
+            out.append("S")
+        else:
+            # f, j, l, m, n, r map to themselves
+            out.append(ch.upper())
+        i += 1
+
+    return "".join(out)
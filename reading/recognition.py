@@ -0,0 +1,288 @@
+# reading/recognition.py
+"""
+Pool of speech-recognition worker processes, configured by
+``settings.READING_RECOGNIZER``:
+
+    READING_RECOGNIZER = {
+        "ENGINE": "vosk",       # "vosk", "fake", a dotted path, or "" (off)
+        "OPTIONS": {...},       # passed to the engine's constructor
+        "WORKERS": 1,           # worker processes, one job each at a time
+        "MAX_QUEUED": 8,        # jobs waiting for a worker before we refuse
+        "TIMEOUT": 30,          # seconds per job, including the wait
+        "LOAD_TIMEOUT": 120,    # seconds a worker may take to load the engine
+    }
+
+Each worker is a dedicated process with the engine loaded once, driven by
+one dispatcher thread over a pipe. Jobs wait in a bounded queue; when it is
+full ``RecognizerBusy`` is raised immediately (backpressure). A job that
+runs past its deadline gets its worker killed and restarted, so a stuck
+decode can't hold a worker forever. A new worker is only given a job once
+it reports the engine loaded; load time doesn't count against any job's
+deadline.
+
+``stats()`` reports queue depth, counters and recent latencies.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+
+from .recognizers import worker_main
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 500
+
+
+class RecognizerBusy(Exception):
+    """The job queue is full."""
+
+
+class RecognizerTimeout(Exception):
+    """The job did not finish before its deadline."""
+
+
+class RecognizerError(Exception):
+    """The engine failed on this recording."""
+
+
+class _Job:
+    def __init__(self, path, deadline):
+        self.path = path
+        self.deadline = deadline
+        self.submitted = time.monotonic()
+        self.loading = False  # waiting for a new worker to load the engine
+        self.future = Future()
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": round(ordered[-1] * 1000, 1)}
+
+
+class RecognizerPool:
+    def __init__(self, engine, options=None, workers=1, max_queued=8, timeout=30.0, load_timeout=120.0):
+        self.engine = engine
+        self.options = options or {}
+        self.workers = max(1, int(workers))
+        self.max_queued = max(1, int(max_queued))
+        self.timeout = float(timeout)
+        self.load_timeout = float(load_timeout)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._jobs = queue.Queue(maxsize=self.max_queued)
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "rejected": 0}
+        self._latency = deque(maxlen=_LATENCY_WINDOW)   # submit -> result
+        self._run_time = deque(maxlen=_LATENCY_WINDOW)  # time in the engine
+
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._dispatch, name=f"recognizer-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    # ---------------------------------------------------
+    # Public API
+    # ---------------------------------------------------
+    def submit(self, path, timeout=None):
+        """Queue a recording; returns a Future for its transcript."""
+        return self._submit(path, timeout).future
+
+    def transcribe(self, path, timeout=None):
+        """Transcribe the recording at ``path`` and wait for the text."""
+        job = self._submit(path, timeout)
+        while True:
+            try:
+                # A little slack: the dispatcher enforces the deadline itself
+                return job.future.result(max(0.0, job.deadline - time.monotonic()) + 5)
+            except FutureTimeout:
+                # A worker load pushes the deadline back; otherwise the dispatcher is stuck
+                if job.loading or time.monotonic() < job.deadline:
+                    continue
+                # Still queued: it won't run, so count it here. Once running,
+                # the dispatcher enforces the deadline and counts it.
+                if job.future.cancel():
+                    self._count("timed_out")
+                raise RecognizerTimeout()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "engine": self.engine,
+                "workers": self.workers,
+                "busy": self._busy,
+                "queue_depth": self._jobs.qsize(),
+                "max_queued": self.max_queued,
+                **self._counts,
+                "latency_ms": _percentiles(list(self._latency)),
+                "run_ms": _percentiles(list(self._run_time)),
+            }
+
+    def close(self):
+        self._closed = True
+        for _ in self._threads:
+            try:
+                self._jobs.put_nowait(None)
+            except queue.Full:
+                pass
+
+    # ---------------------------------------------------
+    # Internals
+    # ---------------------------------------------------
+    def _submit(self, path, timeout):
+        job = _Job(str(path), time.monotonic() + (timeout or self.timeout))
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            self._count("rejected")
+            raise RecognizerBusy()
+        self._count("submitted")
+        return job
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _spawn(self):
+        """Start a worker and wait until it has loaded the engine."""
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=worker_main, args=(child, self.engine, self.options), daemon=True
+        )
+        proc.start()
+        child.close()
+
+        started = time.monotonic()
+        ready = False
+        try:
+            while time.monotonic() - started < self.load_timeout and proc.is_alive():
+                if parent.poll(0.1):
+                    ready = parent.recv()[0] == "ready"
+                    break
+        except (EOFError, OSError):
+            pass
+        if not ready:
+            # Dead or hung while loading; the next job starts a new one
+            logger.error("Recognition worker did not load %r within %.0fs", self.engine, self.load_timeout)
+            proc.kill()
+            proc.join()
+        else:
+            logger.debug("Recognition worker loaded %r in %.1fs", self.engine, time.monotonic() - started)
+        return proc, parent
+
+    def _dispatch(self):
+        # Started by the first job, so that job's deadline leaves out the load
+        proc = conn = None
+        try:
+            while not self._closed:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                proc, conn = self._run(job, proc, conn)
+        finally:
+            if proc is not None:
+                try:
+                    conn.send(None)
+                except (OSError, ValueError):
+                    pass
+                proc.join(timeout=1)
+                if proc.is_alive():
+                    proc.kill()
+
+    def _run(self, job, proc, conn):
+        with self._lock:
+            self._busy += 1
+        try:
+            if proc is None or not proc.is_alive():
+                # Loading the engine isn't the job's time
+                job.loading, loading = True, time.monotonic()
+                proc, conn = self._spawn()
+                job.deadline += time.monotonic() - loading
+                job.loading = False
+                if not proc.is_alive():
+                    raise RecognizerError("Recognition worker could not start.")
+            started = time.monotonic()
+            remaining = job.deadline - started
+            if remaining <= 0:
+                raise RecognizerTimeout()
+
+            conn.send(job.path)
+            if not conn.poll(remaining):
+                # Stuck or too slow: the only way to stop it is to replace the
+                # worker, which the next job does
+                proc.kill()
+                proc.join()
+                raise RecognizerTimeout()
+
+            status, payload = conn.recv()
+            if status != "ok":
+                logger.warning("Speech recognition failed: %s", payload)
+                raise RecognizerError(payload.splitlines()[0] if payload else "Recognition failed.")
+        except RecognizerTimeout as exc:
+            self._count("timed_out")
+            job.future.set_exception(exc)
+        except (RecognizerError, EOFError, OSError) as exc:
+            self._count("failed")
+            if not isinstance(exc, RecognizerError):
+                # The worker died mid-job; the next job starts a fresh one
+                proc.kill()
+                proc.join()
+                exc = RecognizerError("Recognition worker exited.")
+            job.future.set_exception(exc)
+        else:
+            finished = time.monotonic()
+            with self._lock:
+                self._counts["completed"] += 1
+                self._latency.append(finished - job.submitted)
+                self._run_time.append(finished - started)
+            logger.debug(
+                "Recognised %s in %.0f ms (%.0f ms queued)",
+                job.path, (finished - started) * 1000, (started - job.submitted) * 1000,
+            )
+            job.future.set_result(payload)
+        finally:
+            with self._lock:
+                self._busy -= 1
+        return proc, conn
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_recognizer_pool():
+    """Process-wide pool, or None when ``READING_RECOGNIZER["ENGINE"]`` is empty."""
+    global _pool
+    conf = getattr(settings, "READING_RECOGNIZER", {})
+    if not conf.get("ENGINE"):
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = RecognizerPool(
+                    conf["ENGINE"],
+                    options=conf.get("OPTIONS"),
+                    workers=conf.get("WORKERS", 1),
+                    max_queued=conf.get("MAX_QUEUED", 8),
+                    timeout=conf.get("TIMEOUT", 30),
+                    load_timeout=conf.get("LOAD_TIMEOUT", 120),
+                )
+                atexit.register(_pool.close)
+    return _pool
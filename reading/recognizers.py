@@ -0,0 +1,156 @@
+# reading/recognizers.py
+"""
+Server-side speech recognition engines.
+
+An engine turns a recording into a transcript. It is loaded once per
+recognition worker process (see ``recognition``), so, like ``audio``, this
+module only uses NumPy and the standard library at import time; engine
+libraries are imported when the engine is built.
+
+Engines receive the recording already trimmed of leading and trailing
+silence, as mono 16-bit little-endian PCM chunks.
+"""
+
+import hashlib
+import importlib
+import json
+import time
+import traceback
+
+import numpy as np
+
+from .audio import PCM, frame_levels, voice_activity, FRAME_SECONDS
+
+# Samples per chunk handed to an engine
+CHUNK_SAMPLES = 16000
+
+ENGINES = {
+    "vosk": "reading.recognizers.VoskRecognizer",
+    "fake": "reading.recognizers.FakeRecognizer",
+}
+
+
+class Recognizer:
+    """Base class. ``options`` comes from ``READING_RECOGNIZER["OPTIONS"]``."""
+
+    def __init__(self, **options):
+        self.options = options
+
+    def transcribe(self, chunks, rate):
+        """
+        Return the transcript of ``chunks`` (an iterable of mono int16 PCM
+        bytes) sampled at ``rate`` Hz.
+        """
+        raise NotImplementedError
+
+
+class VoskRecognizer(Recognizer):
+    """Offline recognition with Vosk (``pip install vosk``) and a downloaded model."""
+
+    def __init__(self, model_path="", **options):
+        super().__init__(**options)
+        try:
+            from vosk import Model, SetLogLevel
+        except ImportError as exc:
+            raise RuntimeError("The 'vosk' package is required for the vosk recognizer.") from exc
+        if not model_path:
+            raise RuntimeError("Set READING_RECOGNIZER['OPTIONS']['model_path'] to a Vosk model directory.")
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+
+    def transcribe(self, chunks, rate):
+        from vosk import KaldiRecognizer
+
+        rec = KaldiRecognizer(self.model, rate)
+        for chunk in chunks:
+            rec.AcceptWaveform(chunk)
+        return json.loads(rec.FinalResult()).get("text", "")
+
+
+class FakeRecognizer(Recognizer):
+    """
+    Deterministic stand-in for tests and development.
+    Returns ``options["transcript"]`` when set; otherwise one pseudo-word per
+    half second of audio, chosen from a hash of the samples. With
+    ``options["realtime_factor"]`` it takes that many seconds per second of
+    audio, like a real decoder.
+    """
+
+    WORDS = ("the", "a", "cat", "sat", "on", "mat", "dog", "ran", "big", "red")
+
+    def transcribe(self, chunks, rate):
+        digest = hashlib.sha256()
+        samples = 0
+        for chunk in chunks:
+            digest.update(chunk)
+            samples += len(chunk) // 2
+
+        if self.options.get("realtime_factor") and rate:
+            time.sleep(samples / rate * float(self.options["realtime_factor"]))
+        if "transcript" in self.options:
+            return self.options["transcript"]
+        seed = digest.digest()
+        count = int(samples / rate / 0.5) if rate else 0
+        return " ".join(self.WORDS[seed[i % len(seed)] % len(self.WORDS)] for i in range(count))
+
+
+def load_recognizer(engine, options=None):
+    """Build the engine named ``engine`` (a key of ``ENGINES`` or a dotted path)."""
+    path = ENGINES.get(engine, engine)
+    module_name, _, class_name = path.rpartition(".")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**(options or {}))
+
+
+# ---------------------------------------------------
+# WORKER SIDE
+# ---------------------------------------------------
+def trimmed_chunks(pcm, chunk_samples=CHUNK_SAMPLES):
+    """Mono int16 PCM bytes between the first and last voiced frame."""
+    segments = voice_activity(frame_levels(pcm))
+    if not len(segments):
+        return
+    hop = int(round(pcm.rate * FRAME_SECONDS))
+    start, end = int(segments[0, 0]) * hop, int(segments[-1, 1]) * hop
+
+    scale = pcm.full_scale()
+    offset = scale if pcm.dtype.kind == "u" else 0.0
+    for s0 in range(start, end, chunk_samples):
+        block = np.asarray(pcm.samples[s0:min(end, s0 + chunk_samples)], dtype=np.float32)
+        mono = block.mean(axis=1) if pcm.channels > 1 else block[:, 0]
+        mono = (mono - offset) / scale * 32767
+        yield np.clip(mono, -32768, 32767).astype("<i2").tobytes()
+
+
+def transcribe_file(recognizer, path):
+    with PCM(path) as pcm:
+        return recognizer.transcribe(trimmed_chunks(pcm), pcm.rate)
+
+
+def worker_main(conn, engine, options):
+    """
+    Recognition worker loop: receive a file path, reply ``("ok", text)`` or
+    ``("error", message)``. The engine is loaded once, up front, and
+    ``("ready", None)`` is sent when that is done.
+    """
+    try:
+        recognizer = load_recognizer(engine, options)
+        load_error = None
+    except Exception as exc:
+        recognizer, load_error = None, f"Could not load recognizer {engine!r}: {exc}"
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+        if path is None:
+            return
+        if load_error:
+            conn.send(("error", load_error))
+            continue
+        try:
+            conn.send(("ok", transcribe_file(recognizer, path)))
+        except Exception as exc:
+            conn.send(("error", f"{exc.__class__.__name__}: {exc}\n{traceback.format_exc(limit=3)}"))
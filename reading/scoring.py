@@ -0,0 +1,447 @@
+# reading/scoring.py
+"""
+Pronunciation scoring engine: tokenise, align against the expected text,
+summarise. Every feedback endpoint goes through ``get_engine()``, which is
+configured by ``settings.READING_SCORING``:
+
+    READING_SCORING = {
+        "THRESHOLD": 0.6,       # edit-distance similarity that still counts
+        "BAND": 32,             # alignment band half-width, in words
+        "ENCODER": "soundex",   # "soundex", "metaphone" or a dotted path
+        "CODE_CACHE_SIZE": 50_000,    # memoised phonetic codes (LRU)
+        "PAIR_CACHE_SIZE": 200_000,   # memoised word-pair similarities (LRU)
+        "WARM_PAIRS": 0,        # preload the N most frequent mispronounced pairs
+    }
+
+``ScoringEngine.version`` identifies the algorithm and its settings and is
+stored on each PronunciationAttempt, so scores can be compared (or replayed)
+across configuration changes.
+
+``score`` scores one attempt; ``score_batch`` scores many
+transcripts against the same text. A batch preprocesses the expected text
+once, and it decides most (expected word, heard word) pairs up front with
+NumPy over the two vocabularies: same phonetic code means a match, and a
+letter-count lower bound on edit distance means "cannot match". Only the
+undecided pairs that the alignment actually reaches run the bit-parallel
+edit distance.
+
+Phonetic codes and word-pair similarities are memoised per engine (so per
+process) in bounded LRU caches: a class reading the same lesson produces
+the same (expected, heard) pairs over and over. ``ScoringEngine.cache_stats``
+reports hits and misses; ``warm_from_attempts`` preloads the pairs that
+stored attempts mispronounce most often.
+"""
+
+import logging
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .alignment import align_words, DEFAULT_BAND, MATCH, SUBSTITUTION, INSERTION, DELETION
+from .distance import edit_distance, is_similar
+from .phonetics import clean_word, has_letters, soundex, metaphone
+from .models import PronunciationAttempt
+from .token_index import get_token_index
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to tokenising, alignment or scoring can move scores
+ALGORITHM_VERSION = "align-2"
+
+SIMILARITY_THRESHOLD = 0.6
+
+ENCODERS = {
+    "soundex": soundex,
+    "metaphone": metaphone,
+}
+
+CODE_CACHE_SIZE = 50_000
+PAIR_CACHE_SIZE = 200_000
+
+# Largest expected-vocab x heard-vocab table built for a batch (int8 cells)
+MAX_TABLE_CELLS = 4_000_000
+# Pairs processed per NumPy chunk; bounds the (rows, V, 27) temporary
+_CHUNK_PAIRS = 200_000
+
+_UNDECIDED = 2
+_LETTERS = {ch: i for i, ch in enumerate("abcdefghijklmnopqrstuvwxyz")}
+
+
+def tokenize(text):
+    return [clean_word(w) for w in re.split(r"\s+", text or "") if clean_word(w)]
+
+
+class ExpectedText:
+    """Expected tokens and everything derived from them, computed once."""
+
+    def __init__(self, text, tokens, codes=None, lesson=None):
+        self.text = text
+        self.tokens = tokens
+        self.lesson = lesson
+        # Phonetic codes per encoder name, filled from the token index or lazily
+        self._codes = dict(codes or {})
+
+        vocab = {}
+        self.ids = [vocab.setdefault(w, len(vocab)) for w in tokens]
+        self.vocab = list(vocab)
+
+    @classmethod
+    def from_text(cls, text):
+        text = (text or "").strip()
+        return cls(text, tokenize(text))
+
+    @classmethod
+    def from_lesson(cls, lesson):
+        """Reuse the lesson's persisted token index instead of re-tokenising."""
+        index = get_token_index(lesson)
+        codes = {name: index[name] for name in ENCODERS if name in index}
+        return cls(lesson.content, index["tokens"], codes, lesson=lesson)
+
+    def codes(self, name, encode):
+        """Per-token codes for the encoder called ``name``."""
+        codes = self._codes.get(name)
+        if codes is None:
+            by_word = [encode(w) for w in self.vocab]
+            codes = self._codes[name] = [by_word[i] for i in self.ids]
+        return codes
+
+    def vocab_codes(self, name, encode):
+        """Per-vocabulary-word codes for the encoder called ``name``."""
+        out = [""] * len(self.vocab)
+        for vid, code in zip(self.ids, self.codes(name, encode)):
+            out[vid] = code
+        return out
+
+
+# ---------------------------------------------------
+# WORD MATCHING
+# ---------------------------------------------------
+def words_similar(a, b, threshold=SIMILARITY_THRESHOLD):
+    """``is_similar``, except that tokens without letters only match exactly."""
+    if not has_letters(a) or not has_letters(b):
+        return a == b
+    return is_similar(a, b, threshold)
+
+
+def make_matcher(expected_words, spoken_words, expected_codes=None,
+                 threshold=SIMILARITY_THRESHOLD, encode=soundex, similar=None):
+    """
+    Build the ``is_match(i, j)`` callable used by ``align_words``.
+    Phonetic codes are computed once per token (or taken from the lesson's
+    token index). ``similar(a, b)`` decides pairs whose codes differ; the
+    engine passes its memoised one, otherwise results are memoised per
+    call, since lessons repeat words.
+    """
+    if expected_codes is None:
+        expected_codes = [encode(w) for w in expected_words]
+    spoken_codes = [encode(w) for w in spoken_words]
+    if similar is None:
+        similar = lru_cache(maxsize=None)(lambda a, b: words_similar(a, b, threshold))
+
+    def is_match(i, j):
+        ew, sw = expected_words[i], spoken_words[j]
+        if ew == sw:
+            return True
+        # No code (no letters, or "" in indexes built before None): exact only
+        code = expected_codes[i]
+        if code and code == spoken_codes[j]:
+            return True
+        return similar(ew, sw)
+
+    return is_match
+
+
+def _features(words):
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int16, count=len(words))
+    hist = np.zeros((len(words), 27), dtype=np.int16)
+    for row, w in zip(hist, words):
+        for ch in w:
+            row[_LETTERS.get(ch, 26)] += 1
+    return lengths, hist
+
+
+def match_table(expected_vocab, expected_codes, heard_vocab, heard_codes, threshold=SIMILARITY_THRESHOLD):
+    """
+    Vectorised pre-filter over every (expected word, heard word) pair.
+
+    Returns an int8 array of shape (len(expected_vocab), len(heard_vocab)):
+    1 = match (same phonetic code), 0 = cannot reach ``threshold`` because the
+    letter counts alone already need too many edits, 2 = undecided.
+    """
+    e_len, e_hist = _features(expected_vocab)
+    h_len, h_hist = _features(heard_vocab)
+
+    # Words without a code never match by code; give each its own id
+    code_ids = {}
+    ids = lambda codes, start: [
+        code_ids.setdefault(c, len(code_ids)) if c else start - n for n, c in enumerate(codes)
+    ]
+    e_code = np.array(ids(expected_codes, -1), dtype=np.int32)
+    h_code = np.array(ids(heard_codes, -1 - len(expected_codes)), dtype=np.int32)
+
+    rows, cols = len(expected_vocab), len(heard_vocab)
+    table = np.zeros((rows, cols), dtype=np.int8)
+    step = max(1, _CHUNK_PAIRS // max(cols, 1))
+
+    for r0 in range(0, rows, step):
+        r1 = min(rows, r0 + step)
+        max_len = np.maximum(e_len[r0:r1, None], h_len[None, :])
+        max_dist = np.floor((1 - threshold) * max_len + 1e-9)
+
+        # Edit distance >= letters that must be added and >= letters that must go
+        diff = e_hist[r0:r1, None, :] - h_hist[None, :, :]
+        lower = np.maximum(np.clip(diff, 0, None).sum(-1), np.clip(-diff, 0, None).sum(-1))
+
+        chunk = table[r0:r1]
+        chunk[lower <= max_dist] = _UNDECIDED
+        chunk[e_code[r0:r1, None] == h_code[None, :]] = 1
+
+    return table
+
+
+def _table_matcher(table, expected, spoken_ids, heard_vocab, similar):
+    """``is_match`` backed by a ``match_table``; settles undecided cells in place."""
+    item = table.item
+    e_ids, e_vocab = expected.ids, expected.vocab
+
+    def is_match(i, j):
+        u, v = e_ids[i], spoken_ids[j]
+        state = item(u, v)
+        if state == _UNDECIDED:
+            state = 1 if similar(e_vocab[u], heard_vocab[v]) else 0
+            table[u, v] = state
+        return state == 1
+
+    return is_match
+
+
+# ---------------------------------------------------
+# RESULTS
+# ---------------------------------------------------
+def summarize_ops(ops, expected_words, spoken_words, expected_offset=0, spoken_offset=0):
+    """
+    Turn an ``align_words`` edit script into the response fields:
+    (mispronounced, insertions, op_counts). The offsets shift the reported
+    indexes when only a window of the lesson/transcript was aligned.
+    """
+    mispronounced = []
+    insertions = []
+    op_counts = {MATCH: 0, SUBSTITUTION: 0, INSERTION: 0, DELETION: 0}
+    for op, i, j in ops:
+        op_counts[op] += 1
+        if op == SUBSTITUTION:
+            ew, sw = expected_words[i], spoken_words[j]
+            mispronounced.append({
+                "word": ew, "heard": sw, "distance": edit_distance(ew, sw),
+                "type": op, "index": expected_offset + i,
+            })
+        elif op == DELETION:
+            ew = expected_words[i]
+            mispronounced.append({
+                "word": ew, "heard": "", "distance": len(ew),
+                "type": op, "index": expected_offset + i,
+            })
+        elif op == INSERTION:
+            insertions.append({"heard": spoken_words[j], "index": spoken_offset + j})
+    return mispronounced, insertions, op_counts
+
+
+def feedback_message(score):
+    # friendly feedback generation (short)
+    if score >= 90:
+        return "Excellent pronunciation. Keep it up!"
+    if score >= 75:
+        return "Good job — a few words need attention."
+    if score >= 50:
+        return "Fair — work on clearer enunciation of some words."
+    return "Needs practice — focus on articulation and pacing."
+
+
+def _cache_info(cached):
+    info = cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def resolve_encoder(encoder):
+    """Return ``(name, callable)`` for an encoder name, dotted path or callable."""
+    if callable(encoder):
+        return getattr(encoder, "__name__", "custom"), encoder
+    if encoder in ENCODERS:
+        return encoder, ENCODERS[encoder]
+    return encoder.rsplit(".", 1)[-1], import_string(encoder)
+
+
+# ---------------------------------------------------
+# ENGINE
+# ---------------------------------------------------
+class ScoringEngine:
+    """Scores transcripts against an ``ExpectedText`` with fixed settings."""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, band=DEFAULT_BAND, encoder="soundex",
+                 code_cache_size=CODE_CACHE_SIZE, pair_cache_size=PAIR_CACHE_SIZE):
+        self.threshold = float(threshold)
+        self.band = int(band)
+        self.encoder_name, encode = resolve_encoder(encoder)
+        threshold = self.threshold
+
+        # Bounded LRU memos shared by every request this engine serves
+        self.encode = lru_cache(maxsize=code_cache_size)(encode)
+
+        @lru_cache(maxsize=pair_cache_size)
+        def similar(expected_word, heard_word):
+            return words_similar(expected_word, heard_word, threshold)
+
+        self.similar = similar
+
+    @property
+    def version(self):
+        return f"{ALGORITHM_VERSION}/{self.encoder_name}/t{self.threshold:g}/b{self.band}"
+
+    def make_matcher(self, expected_words, spoken_words, expected_codes=None):
+        return make_matcher(
+            expected_words, spoken_words, expected_codes,
+            self.threshold, self.encode, self.similar,
+        )
+
+    def cache_stats(self):
+        """Hit/miss counters and sizes of the phonetic and pair memos."""
+        return {
+            "phonetic": _cache_info(self.encode),
+            "pairs": _cache_info(self.similar),
+        }
+
+    def clear_caches(self):
+        self.encode.cache_clear()
+        self.similar.cache_clear()
+
+    def warm_from_attempts(self, max_pairs=5000, max_attempts=5000):
+        """
+        Preload the memos with the (word, heard) pairs mispronounced most
+        often in the latest ``max_attempts`` stored attempts.
+        Returns the number of pairs loaded.
+        """
+        counts = Counter()
+        recent = (
+            PronunciationAttempt.objects.order_by("-created_at")
+            .values_list("mispronounced", flat=True)[:max_attempts]
+        )
+        for mispronounced in recent:
+            for item in mispronounced or []:
+                if not isinstance(item, dict):
+                    continue
+                word, heard = clean_word(item.get("word")), clean_word(item.get("heard"))
+                if word and heard:
+                    counts[(word, heard)] += 1
+
+        for (word, heard), _ in counts.most_common(max_pairs):
+            self.encode(word)
+            self.encode(heard)
+            self.similar(word, heard)
+        return min(len(counts), max_pairs)
+
+    def _result(self, ops, expected_words, spoken_words):
+        mispronounced, insertions, op_counts = summarize_ops(ops, expected_words, spoken_words)
+        total = len(expected_words) or 1
+        score = round((op_counts[MATCH] / total) * 100, 2)
+        return {
+            "score": score,
+            "feedback": feedback_message(score),
+            "mispronounced": mispronounced,
+            "insertions": insertions,
+            "ops": op_counts,
+            "version": self.version,
+        }
+
+    def score(self, expected, spoken_text):
+        """
+        Score one transcript. ``expected`` is an ``ExpectedText``.
+        Returns a dict with score, feedback, mispronounced, insertions, ops
+        and the engine version.
+        """
+        spoken_words = tokenize(spoken_text)
+        is_match = self.make_matcher(
+            expected.tokens, spoken_words, expected.codes(self.encoder_name, self.encode)
+        )
+        ops = align_words(expected.tokens, spoken_words, is_match, band=self.band)
+        return self._result(ops, expected.tokens, spoken_words)
+
+    def score_batch(self, expected, transcripts):
+        """
+        Score many transcripts against one ``ExpectedText`` in a single call.
+        Returns one result dict (as ``score``) per transcript, in order.
+        """
+        spoken_lists = [tokenize(t) for t in transcripts]
+
+        heard = {}
+        spoken_ids = [[heard.setdefault(w, len(heard)) for w in words] for words in spoken_lists]
+        heard_vocab = list(heard)
+
+        table = None
+        if heard_vocab and len(expected.vocab) * len(heard_vocab) <= MAX_TABLE_CELLS:
+            table = match_table(
+                expected.vocab, expected.vocab_codes(self.encoder_name, self.encode),
+                heard_vocab, [self.encode(w) for w in heard_vocab],
+                self.threshold,
+            )
+
+        expected_codes = expected.codes(self.encoder_name, self.encode)
+        results = []
+        for words, ids in zip(spoken_lists, spoken_ids):
+            if table is not None:
+                is_match = _table_matcher(table, expected, ids, heard_vocab, self.similar)
+            else:
+                is_match = self.make_matcher(expected.tokens, words, expected_codes)
+            ops = align_words(expected.tokens, words, is_match, band=self.band)
+            results.append(self._result(ops, expected.tokens, words))
+        return results
+
+
+def _warm(engine, max_pairs):
+    try:
+        loaded = engine.warm_from_attempts(max_pairs=max_pairs)
+        logger.info("Warmed scoring caches with %d word pairs", loaded)
+    except Exception:
+        logger.exception("Could not warm scoring caches")
+    finally:
+        connection.close()
+
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """The engine configured by ``settings.READING_SCORING``."""
+    conf = getattr(settings, "READING_SCORING", {})
+    engine = ScoringEngine(
+        threshold=conf.get("THRESHOLD", SIMILARITY_THRESHOLD),
+        band=conf.get("BAND", DEFAULT_BAND),
+        encoder=conf.get("ENCODER", "soundex"),
+        code_cache_size=conf.get("CODE_CACHE_SIZE", CODE_CACHE_SIZE),
+        pair_cache_size=conf.get("PAIR_CACHE_SIZE", PAIR_CACHE_SIZE),
+    )
+    warm_pairs = conf.get("WARM_PAIRS", 0)
+    if warm_pairs:
+        # Off the request path; lookups just miss until it is done
+        threading.Thread(
+            target=_warm, args=(engine, warm_pairs), name="scoring-warm", daemon=True
+        ).start()
+    return engine
+
+
+def score_transcript(expected, spoken_text):
+    return get_engine().score(expected, spoken_text)
+
+
+def score_batch(expected, transcripts):
+    return get_engine().score_batch(expected, transcripts)
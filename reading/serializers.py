@@ -1,12 +1,16 @@
 from rest_framework import serializers
 from .models import ReadingLesson, PronunciationAttempt
+from .token_index import get_segments
 
 
 class ReadingLessonSerializer(serializers.ModelSerializer):
     """
     Serializer for ReadingLesson model.
-    Provides lesson metadata and plain text content.
+    Provides lesson metadata and plain text content, plus the precomputed
+    word / sentence / paragraph offsets into it (``segments``).
     """
+    segments = serializers.SerializerMethodField()
+
     class Meta:
         model = ReadingLesson
         fields = [
@@ -17,9 +21,29 @@ class ReadingLessonSerializer(serializers.ModelSerializer):
             "order",
             "created_at",
             "updated_at",
+            "segments",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
 
+    def get_segments(self, obj):
+        return get_segments(obj)
+
+
+class ReadingLessonSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact lesson entry for lists and pickers; no content.
+    The full text is only served by the detail endpoint.
+    """
+    class Meta:
+        model = ReadingLesson
+        fields = [
+            "id",
+            "title",
+            "unit",
+            "order",
+        ]
+        read_only_fields = fields
+
 
 class PronunciationAttemptSerializer(serializers.ModelSerializer):
     """
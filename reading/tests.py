@@ -1,3 +1,425 @@
-from django.test import TestCase
+import math
+import os
+import random
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase
+
+from . import attempt_buffer
+from .alignment import DELETION, INSERTION, MATCH, SUBSTITUTION, align_words
+from .audio import PCM, AudioError
+from .distance import batch_distances, batch_similar, edit_distance, is_similar
+from .attempt_buffer import AttemptBuffer, replay_journal
+from .models import LessonWordError, PronunciationAttempt, ReadingLesson
+from .recognition import RecognizerBusy, RecognizerPool, RecognizerTimeout
+
+
+def _crash(buffer):
+    """What the kernel does when the process dies: close its files, releasing its lock."""
+    if buffer._journal is not None:
+        buffer._journal.close()
+        buffer._journal = None
+    os.close(buffer._owner_lock)
+    buffer._owner_lock = None
+
+
+class JournalTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        self.lesson = ReadingLesson.objects.create(title="L", content="the cat sat")
+
+    def make_buffer(self):
+        # Large limits: nothing flushes unless the test says so
+        buffer = AttemptBuffer(self.dir, max_size=1000, max_delay=3600)
+        self.addCleanup(lambda: buffer._owner_lock is not None and os.close(buffer._owner_lock))
+        return buffer
+
+    def add(self, buffer, word="cat"):
+        return buffer.add(
+            lesson_id=self.lesson.pk, expected="the cat sat", spoken="the cap sat", score=66.7,
+            mispronounced=[{"word": word, "heard": "cap", "distance": 1}],
+        )
+
+    def journal_files(self):
+        return sorted(p.name for p in self.dir.glob("attempts-*jsonl"))
+
+    def word_errors(self, word="cat"):
+        row = LessonWordError.objects.filter(lesson=self.lesson, word=word).first()
+        return row.count if row else 0
+
+
+class AttemptJournalTests(JournalTestMixin, TestCase):
+    def test_replay_after_crash(self):
+        buffer = self.make_buffer()
+        uids = [self.add(buffer) for _ in range(3)]
+        _crash(buffer)
+
+        self.assertEqual(replay_journal(self.dir), 3)
+        self.assertEqual(PronunciationAttempt.objects.filter(uid__in=uids).count(), 3)
+        self.assertEqual(self.word_errors(), 3)
+        self.assertEqual(list(self.dir.iterdir()), [])
+        # Nothing left to replay the second time
+        self.assertEqual(replay_journal(self.dir), 0)
+        self.assertEqual(self.word_errors(), 3)
+
+    def test_replay_skips_live_journal(self):
+        buffer = self.make_buffer()
+        self.add(buffer)
+
+        self.assertEqual(replay_journal(self.dir), 0)
+        self.assertEqual(PronunciationAttempt.objects.count(), 0)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(self.journal_files(), [])
+
+    def test_new_buffer_with_reused_pid_adopts_dead_journal(self):
+        # Both buffers live in this process, so they share a pid exactly
+        # like a crashed worker and its replacement can
+        dead = self.make_buffer()
+        dead_uids = [self.add(dead) for _ in range(2)]
+        _crash(dead)
+
+        fresh = self.make_buffer()
+        fresh_uid = self.add(fresh)
+        self.assertNotEqual(dead.owner, fresh.owner)
+        self.assertTrue(all(name.startswith(f"attempts-{fresh.owner}.") for name in self.journal_files()))
+
+        self.assertEqual(fresh.flush(), 3)
+        self.assertEqual(
+            PronunciationAttempt.objects.filter(uid__in=dead_uids + [fresh_uid]).count(), 3,
+        )
+        self.assertEqual(self.word_errors(), 3)
+        self.assertEqual(list(self.dir.iterdir()), [self.dir / f"attempts-{fresh.owner}.lock"])
+
+    def test_failed_write_is_kept_and_retried(self):
+        buffer = self.make_buffer()
+        uid = self.add(buffer)
+
+        with mock.patch.object(attempt_buffer, "_write", side_effect=RuntimeError("database is locked")):
+            with self.assertLogs("reading.attempt_buffer", "ERROR"):
+                self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(len(self.journal_files()), 1)
+        # The owner is alive, so a replay leaves its failed segment alone
+        self.assertEqual(replay_journal(self.dir), 0)
+
+        self.assertEqual(buffer.flush(), 1)
+        self.assertTrue(PronunciationAttempt.objects.filter(uid=uid).exists())
+        self.assertEqual(self.journal_files(), [])
+        self.assertEqual(self.word_errors(), 1)
+
+    def test_poison_record_is_set_aside(self):
+        buffer = self.make_buffer()
+        buffer.max_attempts = 2
+        good = self.add(buffer)
+        poison = self.add(buffer, word="poison")
+        real_write = attempt_buffer._write
+
+        def write(records):
+            if any(r["mispronounced"][0]["word"] == "poison" for r in records):
+                raise ValueError("unwritable record")
+            real_write(records)
+
+        with mock.patch.object(attempt_buffer, "_write", side_effect=write):
+            with self.assertLogs("reading.attempt_buffer", "ERROR"):
+                self.assertEqual(buffer.flush(), 0)
+                self.assertEqual(buffer.flush(), 1)
+
+        self.assertTrue(PronunciationAttempt.objects.filter(uid=good).exists())
+        self.assertEqual(self.journal_files(), [])
+        dead = list((self.dir / "dead_letter").iterdir())
+        self.assertEqual(len(dead), 1)
+        self.assertEqual([r["uid"] for r in attempt_buffer._read_journal(dead[0])], [poison])
+        # Nothing is left to retry
+        self.assertEqual(buffer.flush(), 0)
+
+
+class ConcurrentFlushTests(JournalTestMixin, TransactionTestCase):
+    def test_full_batch_is_flushed_off_the_request_thread(self):
+        buffer = AttemptBuffer(self.dir, max_size=2, max_delay=3600)
+        self.addCleanup(lambda: buffer._owner_lock is not None and os.close(buffer._owner_lock))
+        written = threading.Event()
+        threads = []
+        real_write = attempt_buffer._write
+
+        def write(records):
+            threads.append(threading.current_thread())
+            real_write(records)
+            written.set()
+
+        with mock.patch.object(attempt_buffer, "_write", side_effect=write):
+            self.add(buffer)
+            self.add(buffer)
+            self.assertTrue(written.wait(10))
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertEqual(PronunciationAttempt.objects.count(), 2)
+
+    def test_replay_leaves_segment_being_flushed(self):
+        buffer = self.make_buffer()
+        for _ in range(2):
+            self.add(buffer)
+
+        writing, release = threading.Event(), threading.Event()
+        real_write = attempt_buffer._write
+
+        def slow_write(records):
+            writing.set()
+            release.wait(10)
+            real_write(records)
+
+        with mock.patch.object(attempt_buffer, "_write", side_effect=slow_write):
+            flusher = threading.Thread(target=buffer.flush)
+            flusher.start()
+            self.assertTrue(writing.wait(10))
+            self.assertEqual(len([n for n in self.journal_files() if n.endswith(".flushing.jsonl")]), 1)
+
+            self.assertEqual(replay_journal(self.dir), 0)
+            release.set()
+            flusher.join(10)
+
+        self.assertEqual(PronunciationAttempt.objects.count(), 2)
+        self.assertEqual(self.word_errors(), 2)
+        self.assertEqual(self.journal_files(), [])
+
+
+class WavHeaderTests(TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+
+    def write_wav(self, fmt):
+        data = bytes(3200)
+        body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+        path = self.dir / "upload.wav"
+        path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+        return path
+
+    def test_truncated_format_chunk_is_an_audio_error(self):
+        pcm_fmt = struct.pack("<HHIIHH", 1, 1, 16000, 32000, 2, 16)
+        extensible = struct.pack("<HHIIHH", 0xFFFE, 1, 16000, 32000, 2, 16) + struct.pack("<HH", 22, 16)
+        for fmt in (pcm_fmt[:10], extensible):
+            with self.subTest(size=len(fmt)), self.assertRaises(AudioError):
+                PCM(self.write_wav(fmt))
+
+        with PCM(self.write_wav(pcm_fmt)) as pcm:
+            self.assertEqual((pcm.rate, pcm.channels, len(pcm.samples)), (16000, 1, 1600))
+
+
+def _write_tone(path, seconds, rate=16000):
+    """A recording the VAD counts as speech: a 220 Hz tone between half seconds of silence."""
+    silence = bytes(rate)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(silence + b"".join(
+            int(12000 * math.sin(2 * math.pi * 220 * i / rate)).to_bytes(2, "little", signed=True)
+            for i in range(int(seconds * rate))
+        ) + silence)
+    return path
+
+
+class RecognizerPoolTests(TestCase):
+    """The pool with the ``fake`` engine; ``realtime_factor`` makes decoding take time."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dir = Path(tempfile.mkdtemp())
+        cls.short = _write_tone(cls.dir / "short.wav", 0.5)
+        cls.long = _write_tone(cls.dir / "long.wav", 3.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def make_pool(self, **kwargs):
+        options = {"transcript": "the cat sat", "realtime_factor": 1.0}
+        pool = RecognizerPool("fake", options, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def wait_for(self, condition, timeout=30):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "condition never became true")
+            time.sleep(0.02)
+
+    def test_full_queue_is_rejected(self):
+        pool = self.make_pool(workers=1, max_queued=1, timeout=30)
+        running = pool.submit(self.long)
+        self.wait_for(lambda: pool.stats()["busy"] == 1 and pool.stats()["queue_depth"] == 0)
+        queued = pool.submit(self.short)
+
+        with self.assertRaises(RecognizerBusy):
+            pool.submit(self.short)
+
+        self.assertEqual(running.result(30), "the cat sat")
+        self.assertEqual(queued.result(30), "the cat sat")
+        stats = pool.stats()
+        self.assertEqual((stats["submitted"], stats["completed"], stats["rejected"]), (2, 2, 1))
+
+    def test_timeout_restarts_worker(self):
+        pool = self.make_pool(workers=1, timeout=1)
+        # Warm up, so the next job's time is all decoding
+        self.assertEqual(pool.transcribe(self.short, timeout=30), "the cat sat")
+
+        started = time.monotonic()
+        with self.assertRaises(RecognizerTimeout):
+            pool.transcribe(self.long)
+        self.assertLess(time.monotonic() - started, 2.5)
+
+        # The stuck worker was killed; a new one answers
+        self.assertEqual(pool.transcribe(self.short, timeout=30), "the cat sat")
+        stats = pool.stats()
+        self.assertEqual(
+            (stats["submitted"], stats["completed"], stats["timed_out"], stats["failed"]), (3, 2, 1, 0),
+        )
+        self.assertEqual(stats["busy"], 0)
+        self.assertIsNotNone(stats["latency_ms"]["p50"])
+
+
+def _dp_table(a, b):
+    """Plain O(n * m) Levenshtein table between two sequences."""
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i]
+        for j in range(1, len(b) + 1):
+            row.append(min(
+                rows[-1][j - 1] + (a[i - 1] != b[j - 1]),
+                rows[-1][j] + 1,
+                row[j - 1] + 1,
+            ))
+        rows.append(row)
+    return rows
+
+
+class AlignmentTests(TestCase):
+    WORDS = ["the", "cat", "sat", "on", "a", "mat", "dog", "ran"]
+
+    def edited(self, rng, words, edits):
+        spoken = list(words)
+        for _ in range(edits):
+            op = rng.choice(("sub", "ins", "del"))
+            pos = rng.randrange(len(spoken) + (op == "ins")) if spoken else 0
+            if op == "ins" or not spoken:
+                spoken.insert(pos, rng.choice(self.WORDS))
+            elif op == "sub":
+                spoken[pos] = rng.choice(self.WORDS)
+            else:
+                del spoken[pos]
+        return spoken
+
+    def script_cost(self, expected, spoken, ops, open_end=False):
+        """Check ``ops`` is an edit script of the pair and return its cost."""
+        i = j = 0
+        for op, oi, oj in ops:
+            if op in (MATCH, SUBSTITUTION):
+                self.assertEqual((oi, oj), (i, j))
+                self.assertEqual(op == MATCH, expected[oi] == spoken[oj])
+                i, j = i + 1, j + 1
+            elif op == DELETION:
+                self.assertEqual((oi, oj), (i, None))
+                i += 1
+            else:
+                self.assertEqual((op, oi, oj), (INSERTION, None, j))
+                j += 1
+        self.assertEqual(j, len(spoken))
+        if not open_end:
+            self.assertEqual(i, len(expected))
+        return sum(op != MATCH for op, _, _ in ops)
+
+    def align(self, expected, spoken, **kwargs):
+        return align_words(expected, spoken, lambda i, j: expected[i] == spoken[j], **kwargs)
+
+    def test_banded_alignment_matches_full_dp(self):
+        rng = random.Random(1234)
+        for _ in range(300):
+            expected = [rng.choice(self.WORDS) for _ in range(rng.randint(0, 60))]
+            spoken = self.edited(rng, expected, rng.randint(0, 6))
+            with self.subTest(expected=expected, spoken=spoken):
+                ops = self.align(expected, spoken, band=8)
+                self.assertEqual(
+                    self.script_cost(expected, spoken, ops), _dp_table(expected, spoken)[-1][-1],
+                )
+
+    def test_wide_band_is_exact_on_unrelated_texts(self):
+        rng = random.Random(99)
+        for _ in range(200):
+            expected = [rng.choice(self.WORDS) for _ in range(rng.randint(0, 25))]
+            spoken = [rng.choice(self.WORDS) for _ in range(rng.randint(0, 25))]
+            with self.subTest(expected=expected, spoken=spoken):
+                ops = self.align(expected, spoken, band=26)
+                self.assertEqual(
+                    self.script_cost(expected, spoken, ops), _dp_table(expected, spoken)[-1][-1],
+                )
+
+    def test_open_end_stops_where_the_reader_did(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            expected = [rng.choice(self.WORDS) for _ in range(rng.randint(1, 60))]
+            read = expected[:rng.randint(0, len(expected))]
+            spoken = self.edited(rng, read, rng.randint(0, 4))
+            with self.subTest(expected=expected, spoken=spoken):
+                ops = self.align(expected, spoken, band=8, open_end=True)
+                best = min(row[-1] for row in _dp_table(expected, spoken))
+                self.assertEqual(self.script_cost(expected, spoken, ops, open_end=True), best)
+
+
+class EditDistanceTests(TestCase):
+    ALPHABET = "abcdeé"
+
+    def pairs(self, seed, count, max_len):
+        rng = random.Random(seed)
+        for _ in range(count):
+            a = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, max_len)))
+            if rng.random() < 0.5:
+                # A near miss: a few edits of a
+                b = list(a)
+                for _ in range(rng.randint(0, 4)):
+                    pos = rng.randint(0, len(b))
+                    b[pos:pos + rng.randint(0, 1)] = rng.choice(["", rng.choice(self.ALPHABET)])
+                b = "".join(b)
+            else:
+                b = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, max_len)))
+            yield a, b
+
+    def test_matches_full_dp(self):
+        for a, b in self.pairs(seed=2024, count=400, max_len=20):
+            with self.subTest(a=a, b=b):
+                self.assertEqual(edit_distance(a, b), _dp_table(a, b)[-1][-1])
+
+    def test_patterns_longer_than_a_machine_word(self):
+        # Patterns past 64 characters span several machine words of bit vector
+        for a, b in self.pairs(seed=64, count=60, max_len=200):
+            with self.subTest(len_a=len(a), len_b=len(b)):
+                self.assertEqual(edit_distance(a, b), _dp_table(a, b)[-1][-1])
+
+    def test_cutoff(self):
+        for a, b in self.pairs(seed=7, count=300, max_len=90):
+            exact = _dp_table(a, b)[-1][-1]
+            for max_dist in (0, 1, 2, 5, 30):
+                with self.subTest(a=a, b=b, max_dist=max_dist):
+                    self.assertEqual(edit_distance(a, b, max_dist), min(exact, max_dist + 1))
+
+    def test_batches_agree_with_single_pairs(self):
+        pairs = list(self.pairs(seed=11, count=200, max_len=12))
+        # Repeated expected words share their pattern within a batch
+        pairs += [(a, b[::-1]) for a, b in pairs[:50]]
+        self.assertEqual(batch_distances(pairs), [_dp_table(a, b)[-1][-1] for a, b in pairs])
+        self.assertEqual(batch_distances(pairs, max_dist=2), [edit_distance(a, b, 2) for a, b in pairs])
+        self.assertEqual(batch_similar(pairs), [is_similar(a, b) for a, b in pairs])
+        self.assertEqual(
+            batch_similar(pairs),
+            [1 - _dp_table(a, b)[-1][-1] / max(len(a), len(b), 1) >= 0.6 - 1e-9 for a, b in pairs],
+        )
@@ -0,0 +1,135 @@
+# reading/token_index.py
+"""
+Per-lesson token / phonetic index and display segmentation.
+
+The index is persisted in ``LessonTokenIndex`` (shared by every worker) and
+memoised in-process by ``(lesson_id, updated_at)``, so a lesson edit simply
+produces a new key and the stale entry is rebuilt on next use.
+"""
+
+import re
+from functools import lru_cache
+
+from .models import LessonTokenIndex, ReadingLesson
+from .phonetics import clean_word, soundex, metaphone
+
+INDEX_VERSION = 3
+
+_SENTENCE_END = re.compile(r"[.!?][\"')\]}]*$")
+_LINE = re.compile(r"[^\n]+")
+_RAW_TOKEN = re.compile(r"\S+")
+
+
+def build_token_index(text):
+    """
+    Tokenise ``text`` the same way ``feedback_view`` does and record, per
+    token, its soundex/metaphone codes and character span.
+
+    The text is also segmented for display: every non-blank line is a
+    paragraph ``[start, end, first_sentence]`` and every sentence is
+    ``[start, end, first_token]``. Sentences end at ``.``, ``!`` or ``?``
+    (plus closing quotes/brackets) or at the end of the paragraph; runs
+    with no word in them (a stray ``—``) belong to no sentence.
+    """
+    text = text or ""
+    tokens, codes, keys, starts, ends = [], [], [], [], []
+    sentences, paragraphs = [], []
+
+    for line in _LINE.finditer(text):
+        first_sentence = len(sentences)
+        span = None  # [start, end, first_token] of the open sentence
+        para_start = para_end = None
+
+        for m in _RAW_TOKEN.finditer(text, line.start(), line.end()):
+            raw = m.group()
+            if para_start is None:
+                para_start = m.start()
+            para_end = m.end()
+            if span is None:
+                span = [m.start(), m.end(), len(tokens)]
+            span[1] = m.end()
+
+            word = clean_word(raw)
+            if word:
+                tokens.append(word)
+                codes.append(soundex(word))
+                keys.append(metaphone(word))
+                starts.append(m.start())
+                ends.append(m.end())
+            if _SENTENCE_END.search(raw):
+                if len(tokens) > span[2]:
+                    sentences.append(span)
+                span = None
+
+        if span is not None and len(tokens) > span[2]:
+            sentences.append(span)
+        if para_start is not None:
+            paragraphs.append([para_start, para_end, first_sentence])
+
+    return {
+        "version": INDEX_VERSION,
+        "tokens": tokens,
+        "soundex": codes,
+        "metaphone": keys,
+        "starts": starts,
+        "ends": ends,
+        "sentences": sentences,
+        "paragraphs": paragraphs,
+    }
+
+
+def segments_payload(index):
+    """
+    Display segmentation from a token index, as flat integer arrays:
+
+        words       [start, end] * tokens
+        sentences   [start, end, first_word] * sentences
+        paragraphs  [start, end, first_sentence] * paragraphs
+
+    Offsets are character offsets into the lesson content (end exclusive),
+    so a client can slice and render without tokenising anything.
+    """
+    words = [0] * (2 * len(index["starts"]))
+    words[0::2] = index["starts"]
+    words[1::2] = index["ends"]
+    return {
+        "version": index["version"],
+        "words": words,
+        "sentences": [n for s in index["sentences"] for n in s],
+        "paragraphs": [n for p in index["paragraphs"] for n in p],
+    }
+
+
+@lru_cache(maxsize=256)
+def _load_index(lesson_id, updated_at):
+    row = (
+        LessonTokenIndex.objects
+        .filter(lesson_id=lesson_id, source_updated_at=updated_at)
+        .values_list("data", flat=True)
+        .first()
+    )
+    if row and row.get("version") == INDEX_VERSION:
+        return row
+
+    content = (
+        ReadingLesson.objects
+        .filter(pk=lesson_id)
+        .values_list("content", flat=True)
+        .first()
+    )
+    data = build_token_index(content or "")
+    LessonTokenIndex.objects.update_or_create(
+        lesson_id=lesson_id,
+        defaults={"source_updated_at": updated_at, "data": data},
+    )
+    return data
+
+
+def get_token_index(lesson):
+    """Return the (possibly cached) token index for a ``ReadingLesson``."""
+    return _load_index(lesson.pk, lesson.updated_at)
+
+
+def get_segments(lesson):
+    """Compact display segmentation for a ``ReadingLesson`` (see ``segments_payload``)."""
+    return segments_payload(get_token_index(lesson))
@@ -2,20 +2,52 @@
 
 from django.shortcuts import render, get_object_or_404
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+
+from backend.conditional import ConditionalGetMixin
+
 from .models import ReadingLesson
-from .serializers import ReadingLessonSerializer
+from .pagination import LessonCursorPagination
+from .serializers import ReadingLessonSerializer, ReadingLessonSummarySerializer
+from .token_index import INDEX_VERSION
 
 
 # --- API views ---
 class ReadingLessonListView(generics.ListAPIView):
     """
-    API endpoint: return a list of all reading lessons.
+    API endpoint: cursor-paginated lesson summaries (no content).
+    Optional filters: ?unit=<id>, ?book=<id>, ?page_size=<n>.
     """
-    queryset = ReadingLesson.objects.all()
-    serializer_class = ReadingLessonSerializer
+    serializer_class = ReadingLessonSummarySerializer
+    pagination_class = LessonCursorPagination
+
+    def get_queryset(self):
+        lessons = ReadingLesson.objects.only("id", "title", "unit_id", "order")
+        for param, lookup in (("unit", "unit_id"), ("book", "unit__book_id")):
+            value = self.request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            if not value.isdigit():
+                raise ValidationError({param: "Must be an integer id."})
+            lessons = lessons.filter(**{lookup: int(value)})
+        return lessons
+
+
+class ReadingLessonConditionalMixin(ConditionalGetMixin):
+    """Lesson detail validators: the lesson's ``updated_at`` and the segmentation version."""
+
+    def get_validators(self, request, *args, **kwargs):
+        updated_at = (
+            ReadingLesson.objects.filter(pk=kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return (kwargs["pk"], updated_at, INDEX_VERSION), updated_at
 
 
-class ReadingLessonDetailView(generics.RetrieveAPIView):
+class ReadingLessonDetailView(ReadingLessonConditionalMixin, generics.RetrieveAPIView):
     """
     API endpoint: return details of a single reading lesson by ID.
     """
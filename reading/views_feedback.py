@@ -1,50 +1,59 @@
-import re
-from django.utils.html import escape
+import logging
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from .models import PronunciationAttempt, ReadingLesson
+from .attempt_buffer import get_attempt_buffer
+from .models import ReadingLesson
+from .scoring import ExpectedText, get_engine
 
-# Helper utilities (same logic as your frontend helpers but server-side too)
-def clean_word(w):
-    return (w or "").lower().strip().strip(".,!?;:\"'()[]{}")
+logger = logging.getLogger(__name__)
 
-def levenshtein(a, b):
-    if a == b:
-        return 0
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-    m, n = len(a), len(b)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
-    for i in range(n + 1):
-        dp[i][0] = i
-    for j in range(m + 1):
-        dp[0][j] = j
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            cost = 0 if a[j - 1] == b[i - 1] else 1
-            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
-    return dp[n][m]
+MAX_BATCH_TRANSCRIPTS = 500
+
+def _get_lesson(lesson_id):
+    if not lesson_id:
+        return None
+    try:
+        return ReadingLesson.objects.filter(pk=lesson_id).first()
+    except (TypeError, ValueError):
+        return None
+
+def score_feedback_request(data, user=None):
+    """
+    Score one attempt payload and queue it for saving.
+    Shared by ``feedback_view`` and ``api_views.TextFeedbackAPIView``.
+    """
+    expected_text = (data.get("expected", "") or "").strip()
+    spoken_text = (data.get("spoken", "") or "").strip()
+    lesson = _get_lesson(data.get("lesson_id"))
+
+    if lesson is not None and not expected_text:
+        expected = ExpectedText.from_lesson(lesson)
+    else:
+        expected = ExpectedText.from_text(expected_text)
+
+    engine = get_engine()
+    result = engine.score(expected, spoken_text)
+
+    # queue the attempt; it is written in batches by the write-behind buffer
+    attempt_id = None
+    try:
+        attempt_id = get_attempt_buffer().add(
+            user_id=user.pk if user is not None and user.is_authenticated else None,
+            lesson_id=lesson.pk if lesson else None,
+            expected=expected.text,
+            spoken=spoken_text,
+            score=result["score"],
+            mispronounced=result["mispronounced"],
+            feedback=result["feedback"],
+            algorithm_version=engine.version,
+        )
+    except Exception:
+        logger.exception("Could not queue pronunciation attempt")
+
+    return {**result, "attempt_id": attempt_id}
 
-def soundex(word):
-    # simple soundex (same family as frontend)
-    w = clean_word(word)
-    if not w:
-        return ""
-    w = w.lower()
-    codes = {'b':'1','f':'1','p':'1','v':'1','c':'2','g':'2','j':'2','k':'2','q':'2','s':'2','x':'2','z':'2',
-             'd':'3','t':'3','l':'4','m':'5','n':'5','r':'6'}
-    first = w[0]
-    res = first.upper()
-    prev = codes.get(first, '')
-    for ch in w[1:]:
-        code = codes.get(ch, '')
-        if code != prev:
-            res += code
-        prev = code
-    return (res + "000")[:4]
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -56,80 +65,66 @@ def feedback_view(request):
       "spoken": "transcribed student speech",
       "lesson_id": optional int
     }
+    When "lesson_id" is given, "expected" may be omitted: the lesson's
+    precomputed token index is used instead of re-tokenising the text.
     Returns:
     {
       "score": 85.5,
       "feedback": "...",
-      "mispronounced": [{"word":"laurels","suggest":"laurels","type":"substitution"} ...]
-      "attempt_id": 123 (if saved)
+      "mispronounced": [{"word":"laurels","heard":"laurel","distance":1,"type":"substitution","index":4} ...],
+      "insertions": [{"heard":"um","index":7} ...],
+      "ops": {"match": 40, "substitution": 2, "insertion": 1, "deletion": 0},
+      "version": "align-2/soundex/t0.6/b32",
+      "attempt_id": "3f0c..." (uid of the queued PronunciationAttempt)
     }
     """
-    data = request.data or {}
-    expected_text = data.get("expected", "") or ""
-    spoken_text = data.get("spoken", "") or ""
-    lesson_id = data.get("lesson_id")
-
-    # quick safety
-    expected_text = expected_text.strip()
-    spoken_text = spoken_text.strip()
+    return Response(score_feedback_request(request.data or {}, request.user))
 
-    # break into words (simple)
-    expected_words = [clean_word(w) for w in re.split(r"\s+", expected_text) if clean_word(w)]
-    spoken_words = [clean_word(w) for w in re.split(r"\s+", spoken_text) if clean_word(w)]
 
-    # alignment: simple left-to-right compare with heuristics
-    mispronounced = []
-    correct_count = 0
-    for i, ew in enumerate(expected_words):
-        sw = spoken_words[i] if i < len(spoken_words) else ""
-        if ew == sw:
-            correct_count += 1
-            continue
-        # soundex similarity
-        if soundex(ew) == soundex(sw) and ew:
-            correct_count += 1
-            continue
-        # edit distance similarity
-        dist = levenshtein(ew, sw)
-        max_len = max(len(ew), len(sw), 1)
-        similarity = 1 - (dist / max_len)
-        if similarity >= 0.6:
-            correct_count += 1
-            continue
-        # otherwise flagged
-        mispronounced.append({"word": ew, "heard": sw, "distance": dist})
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def feedback_batch_view(request):
+    """
+    Score many transcripts against one lesson/text in a single call
+    (re-scoring a class's recordings, replaying attempts after a threshold
+    change). Nothing is saved.
 
-    total = len(expected_words) or 1
-    score = round((correct_count / total) * 100, 2)
+    POST payload:
+    {
+      "lesson_id": 3,                 # or "expected": "full text"
+      "transcripts": ["...", "..."]
+    }
+    Returns:
+    {
+      "count": 2,
+      "results": [{"score": ..., "feedback": ..., "mispronounced": [...],
+                   "insertions": [...], "ops": {...}, "version": ...}, ...]
+    }
+    """
+    data = request.data or {}
+    transcripts = data.get("transcripts")
+    if not isinstance(transcripts, list) or not all(isinstance(t, str) for t in transcripts):
+        return Response(
+            {"error": "'transcripts' must be a list of strings."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(transcripts) > MAX_BATCH_TRANSCRIPTS:
+        return Response(
+            {"error": f"At most {MAX_BATCH_TRANSCRIPTS} transcripts per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    # friendly feedback generation (short)
-    if score >= 90:
-        fb = "Excellent pronunciation. Keep it up!"
-    elif score >= 75:
-        fb = "Good job — a few words need attention."
-    elif score >= 50:
-        fb = "Fair — work on clearer enunciation of some words."
+    expected_text = (data.get("expected", "") or "").strip()
+    lesson = _get_lesson(data.get("lesson_id"))
+    if lesson is not None and not expected_text:
+        expected = ExpectedText.from_lesson(lesson)
+    elif expected_text:
+        expected = ExpectedText.from_text(expected_text)
     else:
-        fb = "Needs practice — focus on articulation and pacing."
-
-    # optional: save attempt
-    attempt_id = None
-    try:
-        attempt = PronunciationAttempt.objects.create(
-            lesson_id=lesson_id if lesson_id else None,
-            expected=expected_text,
-            spoken=spoken_text,
-            score=score,
-            mispronounced=mispronounced,
-            feedback=fb
+        return Response(
+            {"error": "Provide a valid 'lesson_id' or the 'expected' text."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
-        attempt_id = attempt.id
-    except Exception:
-        attempt_id = None  # don't fail if DB save fails
 
-    return Response({
-        "score": score,
-        "feedback": fb,
-        "mispronounced": mispronounced,
-        "attempt_id": attempt_id,
-    })
+    results = get_engine().score_batch(expected, transcripts)
+    return Response({"count": len(results), "results": results})
@@ -1,5 +1,5 @@
 // project/static/reading/reading.feedback.js
-import { renderHighlighted, getCurrentIndex } from "./reading.text.js";
+import { renderHighlighted, getCurrentIndex, sentenceWords } from "./reading.text.js";
 
 const getFeedbackBtn = document.getElementById("get-feedback-btn");
 const feedbackBox = document.getElementById("feedbackBox");
@@ -34,6 +34,38 @@ function escapeHtml(s) {
   });
 }
 
+// ----------------------
+// HIGHLIGHT FLAGGED WORDS
+// ----------------------
+export function highlightWords(words) {
+  const wordsToFlag = new Set(words.map((w) => w.toLowerCase()));
+
+  const layout = window.lessonLayout;
+  const isFlagged = (token) => wordsToFlag.has(token.replace(/[^\w']/g, "").toLowerCase());
+
+  window.displayedSentences = window.originalSentences.map((sentence, i) => {
+    if (!layout) {
+      return sentence
+        .split(/\b/)
+        .map(token => isFlagged(token) ? `<span class="mispronounced">${token}</span>` : escapeHtml(token))
+        .join("");
+    }
+
+    // Word offsets come from the server; just wrap the flagged ones
+    let html = "";
+    let pos = layout.sentences[i].start;
+    sentenceWords(i).forEach(([start, end]) => {
+      const token = layout.text.slice(start, end);
+      html += escapeHtml(layout.text.slice(pos, start));
+      html += isFlagged(token) ? `<span class="mispronounced">${escapeHtml(token)}</span>` : escapeHtml(token);
+      pos = end;
+    });
+    return html + escapeHtml(layout.text.slice(pos, layout.sentences[i].end));
+  });
+
+  renderHighlighted(getCurrentIndex());
+}
+
 // ----------------------
 // INITIALIZE FEEDBACK
 // ----------------------
@@ -50,10 +82,11 @@ export function initFeedback() {
 
     feedbackBox.textContent = "Analyzing...";
 
-    const payload = {
-      expected: window.lessonText || "",
-      spoken: transcript,
-    };
+    // The server scores against its own copy of the lesson when given an id
+    const lessonId = document.querySelector("[data-lesson-id]")?.dataset.lessonId;
+    const payload = lessonId
+      ? { lesson_id: lessonId, spoken: transcript }
+      : { expected: window.lessonText || "", spoken: transcript };
 
     try {
       const res = await fetch("/api/reading/feedback/", {
@@ -82,24 +115,7 @@ export function initFeedback() {
       let highlightMessage = "";
 
       if (mispronouncedWords.length) {
-        const wordsToFlag = new Set(
-          mispronouncedWords.map((m) => m.word.toLowerCase())
-        );
-
-        window.displayedSentences = window.originalSentences.map(sentence =>
-          sentence
-            .split(/\b/)
-            .map(token => {
-              const clean = token.replace(/[^\w']/g, "").toLowerCase();
-              if (wordsToFlag.has(clean)) {
-                return `<span class="mispronounced">${token}</span>`;
-              }
-              return escapeHtml(token);
-            })
-            .join("")
-        );
-
-        renderHighlighted(getCurrentIndex());
+        highlightWords(mispronouncedWords.map((m) => m.word));
         highlightMessage = " (Words highlighted above)";
       } else {
         highlightMessage = " (Highlighting feature pending AI integration.)";
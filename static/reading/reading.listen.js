@@ -1,5 +1,6 @@
 // project/static/reading/reading.listen.js
 import { recognition, initRecognition } from "./reading.recognition.js";
+import { startLiveFeedback, stopLiveFeedback } from "./reading.live.js";
 
 let startRecordBtn;
 let stopRecordBtn;
@@ -26,6 +27,7 @@ export function initListening() {
 
     try {
       recognition.start();
+      startLiveFeedback(document.querySelector("[data-lesson-id]")?.dataset.lessonId);
       startRecordBtn.disabled = true;
       stopRecordBtn.disabled = false;
       console.log("Recognition started…");
@@ -45,6 +47,7 @@ export function initListening() {
       }
     }
 
+    stopLiveFeedback();
     recording = false;
     startRecordBtn.disabled = false;
     stopRecordBtn.disabled = true;
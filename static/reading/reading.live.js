@@ -0,0 +1,77 @@
+// project/static/reading/reading.live.js
+import { highlightWords } from "./reading.feedback.js";
+
+const feedbackBox = document.getElementById("feedbackBox");
+
+let socket = null;
+let pending = [];
+let flagged = new Set();
+
+// ----------------------
+// OPEN / CLOSE SESSION
+// ----------------------
+export function startLiveFeedback(lessonId) {
+  stopLiveFeedback();
+  if (!lessonId || !window.WebSocket) return;
+
+  const scheme = window.location.protocol === "https:" ? "wss" : "ws";
+  const url = `${scheme}://${window.location.host}/ws/reading/feedback/?lesson_id=${encodeURIComponent(lessonId)}`;
+
+  pending = [];
+  flagged = new Set();
+  socket = new WebSocket(url);
+
+  socket.onopen = () => {
+    // Flush anything recognised before the socket was ready
+    pending.forEach((delta) => socket.send(JSON.stringify({ delta })));
+    pending = [];
+  };
+
+  socket.onmessage = (e) => {
+    let data;
+    try {
+      data = JSON.parse(e.data);
+    } catch {
+      return;
+    }
+    if (data.error) {
+      console.warn("Live feedback:", data.error);
+      return;
+    }
+
+    (data.mispronounced || []).forEach((m) => flagged.add(m.word));
+    if (flagged.size) highlightWords([...flagged]);
+
+    if (feedbackBox) {
+      feedbackBox.textContent = `Live score: ${data.score}% (${data.cursor} words read)`;
+    }
+  };
+
+  socket.onerror = (e) => {
+    console.debug("Live feedback unavailable:", e);
+  };
+
+  socket.onclose = () => {
+    socket = null;
+  };
+}
+
+export function stopLiveFeedback() {
+  if (socket) {
+    socket.close();
+    socket = null;
+  }
+}
+
+// ----------------------
+// SEND TRANSCRIPT DELTA
+// ----------------------
+export function sendLiveDelta(delta) {
+  if (!delta || !socket) return;
+
+  if (socket.readyState === WebSocket.OPEN) {
+    socket.send(JSON.stringify({ delta }));
+  } else if (socket.readyState === WebSocket.CONNECTING) {
+    pending.push(delta);
+  }
+}
@@ -1,5 +1,5 @@
 // project/static/reading/reading.main.js
-import { populateVoices, initTextReader, synth } from "./reading.text.js";
+import { populateVoices, initTextReader, renderHighlighted, setLessonText, synth } from "./reading.text.js";
 import { initListening } from "./reading.listen.js";
 import { initFeedback } from "./reading.feedback.js";
 
@@ -18,54 +18,54 @@ async function loadLesson(id) {
 
     if (titleEl) titleEl.textContent = lesson.title;
 
-    const raw = lesson.content || "";
-
-    // Render paragraphs
-    const paragraphs = raw
-      .split("\n")
-      .filter(p => p.trim() !== "")
-      .map(p => `<p>${p}</p>`)
-      .join("");
-
-    if (textEl) textEl.innerHTML = paragraphs;
-
-    // Provide shared state for reader + feedback modules
-    window.originalSentences = raw
-      .replace(/\n+/g, " ")
-      .split(/(?<=[.!?])\s+/)
-      .filter(s => s.trim() !== "");
-
-    window.displayedSentences = [...window.originalSentences];
-    window.lessonText = raw;
+    // Sentences and paragraphs come precomputed with the lesson
+    setLessonText(lesson.content || "", lesson.segments);
+
+    if (lesson.segments) {
+      renderHighlighted(-1);
+    } else if (textEl) {
+      textEl.innerHTML = window.lessonText
+        .split("\n")
+        .filter(p => p.trim() !== "")
+        .map(p => `<p>${p}</p>`)
+        .join("");
+    }
   } catch (err) {
     console.error("Error loading lesson:", err);
   }
 }
 
 // ---------------- LOAD LESSON LIST ----------------
+// The list API is cursor-paginated: follow "next" until every page is shown
 async function loadLessonList() {
   if (!listContainer) return;
 
   try {
-    const res = await fetch("/api/reading/lessons/");
-    if (!res.ok) throw new Error("Could not load lessons");
-
-    const lessons = await res.json();
+    let url = "/api/reading/lessons/";
+    let shown = 0;
+
+    while (url) {
+      const res = await fetch(url);
+      if (!res.ok) throw new Error("Could not load lessons");
+
+      const page = await res.json();
+      if (shown === 0) listContainer.innerHTML = "";
+
+      (page.results || []).forEach(lesson => {
+        const link = document.createElement("a");
+        link.href = `/reading/${lesson.id}/`;
+        link.textContent = lesson.title || `Lesson ${lesson.id}`;
+        listContainer.appendChild(link);
+        listContainer.appendChild(document.createElement("br"));
+        shown += 1;
+      });
+
+      url = page.next;
+    }
 
-    if (!Array.isArray(lessons) || lessons.length === 0) {
+    if (shown === 0) {
       listContainer.textContent = "No lessons available yet.";
-      return;
     }
-
-    listContainer.innerHTML = "";
-
-    lessons.forEach(lesson => {
-      const link = document.createElement("a");
-      link.href = `/reading/${lesson.id}/`;
-      link.textContent = lesson.title || `Lesson ${lesson.id}`;
-      listContainer.appendChild(link);
-      listContainer.appendChild(document.createElement("br"));
-    });
   } catch (err) {
     console.error(err);
     listContainer.textContent = "Could not load lessons.";
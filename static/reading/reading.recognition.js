@@ -1,4 +1,5 @@
 // project/static/reading/reading.recognition.js
+import { sendLiveDelta } from "./reading.live.js";
 
 export const SpeechRecognition =
   window.SpeechRecognition || window.webkitSpeechRecognition;
@@ -22,6 +23,7 @@ export function initRecognition() {
   recognition.onresult = (e) => {
     const transcript = e.results[e.results.length - 1][0].transcript;
     window.transcriptAcc = (window.transcriptAcc || "") + " " + transcript;
+    sendLiveDelta(transcript);
     console.debug("Recognition result:", transcript);
   };
 
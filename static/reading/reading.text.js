@@ -40,7 +40,65 @@ export function populateVoices() {
 
 synth.onvoiceschanged = populateVoices;
 
+// ---------------- LESSON TEXT ----------------
+// The detail API sends precomputed offsets into the content (see
+// reading/token_index.py): flat [start, end] pairs for words and
+// [start, end, first] triples for sentences and paragraphs, so nothing is
+// tokenised here.
+export function setLessonText(raw, segments) {
+  window.lessonText = raw;
+
+  if (!segments) {
+    // Older API: split in the browser
+    window.lessonLayout = null;
+    window.originalSentences = raw
+      .replace(/\n+/g, " ")
+      .split(/(?<=[.!?])\s+/)
+      .filter(s => s.trim() !== "");
+    window.displayedSentences = [...window.originalSentences];
+    return;
+  }
+
+  const triples = (flat) => {
+    const out = [];
+    for (let i = 0; i < flat.length; i += 3) {
+      out.push({ start: flat[i], end: flat[i + 1], first: flat[i + 2] });
+    }
+    return out;
+  };
+
+  const sentences = triples(segments.sentences || []);
+  const paragraphs = triples(segments.paragraphs || []);
+  paragraphs.forEach((p, i) => {
+    p.last = i + 1 < paragraphs.length ? paragraphs[i + 1].first : sentences.length;
+  });
+
+  window.lessonLayout = { text: raw, words: segments.words || [], sentences, paragraphs };
+  window.originalSentences = sentences.map(s => raw.slice(s.start, s.end));
+  window.displayedSentences = [...window.originalSentences];
+}
+
+// Word spans [start, end] of sentence i, from the precomputed layout
+export function sentenceWords(i) {
+  const layout = window.lessonLayout;
+  if (!layout) return [];
+  const first = layout.sentences[i].first;
+  const last = i + 1 < layout.sentences.length ? layout.sentences[i + 1].first : layout.words.length / 2;
+  const spans = [];
+  for (let w = first; w < last; w++) {
+    spans.push([layout.words[2 * w], layout.words[2 * w + 1]]);
+  }
+  return spans;
+}
+
 // ---------------- HIGHLIGHT ----------------
+function sentenceSpan(i, index) {
+  const s = window.displayedSentences[i];
+  return i === index
+    ? `<span class="highlight" data-sentence="${i}">${s}</span>`
+    : `<span data-sentence="${i}">${s}</span>`;
+}
+
 export function renderHighlighted(index) {
   if (!textEl) return;
 
@@ -49,13 +107,21 @@ export function renderHighlighted(index) {
     return;
   }
 
-  const html = window.displayedSentences
-    .map((s, i) =>
-      i === index
-        ? `<span class="highlight" data-sentence="${i}">${s}</span>`
-        : `<span data-sentence="${i}">${s}</span>`
-    )
-    .join(" ");
+  const layout = window.lessonLayout;
+  const html = layout
+    ? layout.paragraphs
+        .map(p => {
+          // Text between sentences (stray punctuation) is kept as is
+          let out = "";
+          let pos = p.start;
+          for (let i = p.first; i < p.last; i++) {
+            out += layout.text.slice(pos, layout.sentences[i].start) + sentenceSpan(i, index);
+            pos = layout.sentences[i].end;
+          }
+          return `<p>${out}${layout.text.slice(pos, p.end)}</p>`;
+        })
+        .join("")
+    : window.displayedSentences.map((s, i) => sentenceSpan(i, index)).join(" ");
 
   textEl.innerHTML = html;
 
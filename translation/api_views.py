@@ -1,6 +1,8 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
-from django.db.models import Prefetch
+from django.db.models import Count, Max, Prefetch, Q
+
+from backend.conditional import ConditionalGetMixin, latest
 
 from .models import (
     TranslationTextbook,
@@ -53,7 +55,7 @@ class TranslationTextbookListAPIView(PublicPermissionMixin, generics.ListAPIView
         )
 
 
-class TranslationTextbookDetailAPIView(PublicPermissionMixin, generics.RetrieveAPIView):
+class TranslationTextbookDetailAPIView(PublicPermissionMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """
     GET /api/translation/textbooks/<slug:slug>/
     Returns a single published & active textbook.
@@ -62,6 +64,18 @@ class TranslationTextbookDetailAPIView(PublicPermissionMixin, generics.RetrieveA
     serializer_class = TranslationTextbookSerializer
     lookup_field = "slug"
 
+    def get_validators(self, request, *args, **kwargs):
+        row = (
+            TranslationTextbook.objects
+            .filter(slug=kwargs["slug"], is_active=True, published=True)
+            .annotate(units_updated=Max("units__updated_at"), unit_count=Count("units"))
+            .values_list("pk", "updated_at", "units_updated", "unit_count")
+            .first()
+        )
+        if row is None:
+            return None
+        return row, latest(row[1], row[2])
+
     def get_queryset(self):
         return (
             TranslationTextbook.objects
@@ -79,7 +93,7 @@ class TranslationTextbookDetailAPIView(PublicPermissionMixin, generics.RetrieveA
 # UNIT API VIEWS
 # --------------------------------------------------
 
-class TranslationUnitDetailAPIView(PublicPermissionMixin, generics.RetrieveAPIView):
+class TranslationUnitDetailAPIView(PublicPermissionMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """
     GET /api/translation/units/<uuid:pk>/
     Returns a unit and its published & active lessons (lightweight).
@@ -88,6 +102,22 @@ class TranslationUnitDetailAPIView(PublicPermissionMixin, generics.RetrieveAPIVi
     serializer_class = TranslationUnitSerializer
     lookup_field = "pk"
 
+    def get_validators(self, request, *args, **kwargs):
+        visible = Q(lessons__is_active=True, lessons__published=True)
+        row = (
+            TranslationUnit.objects
+            .filter(pk=kwargs["pk"])
+            .annotate(
+                lessons_updated=Max("lessons__updated_at", filter=visible),
+                lesson_count=Count("lessons", filter=visible),
+            )
+            .values_list("updated_at", "lessons_updated", "lesson_count")
+            .first()
+        )
+        if row is None:
+            return None
+        return row, latest(row[0], row[1])
+
     def get_queryset(self):
         return (
             TranslationUnit.objects
@@ -109,7 +139,7 @@ class TranslationUnitDetailAPIView(PublicPermissionMixin, generics.RetrieveAPIVi
 # LESSON API VIEWS
 # --------------------------------------------------
 
-class TranslationLessonDetailAPIView(PublicPermissionMixin, generics.RetrieveAPIView):
+class TranslationLessonDetailAPIView(PublicPermissionMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """
     GET /api/translation/lessons/<uuid:pk>/
     Returns a full published & active lesson.
@@ -118,6 +148,17 @@ class TranslationLessonDetailAPIView(PublicPermissionMixin, generics.RetrieveAPI
     serializer_class = TranslationLessonSerializer
     lookup_field = "pk"
 
+    def get_validators(self, request, *args, **kwargs):
+        row = (
+            TranslationLesson.objects
+            .filter(pk=kwargs["pk"], is_active=True, published=True)
+            .values_list("updated_at", "version")
+            .first()
+        )
+        if row is None:
+            return None
+        return row, row[0]
+
     def get_queryset(self):
         return (
             TranslationLesson.objects